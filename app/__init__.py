@@ -9,5 +9,13 @@ __all__ = ["app", "settings", "get_db"]
 
 from app.config import settings
 from app.database import get_db
-from app.main import app
+
+
+def __getattr__(name):
+    # Import the FastAPI app lazily so that importing a submodule (e.g. from
+    # the scheduler or alembic) does not build the whole web stack.
+    if name == "app":
+        from app.main import app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
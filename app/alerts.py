@@ -1,25 +1,122 @@
+import atexit
+import functools
+import hashlib
 import smtplib
+import ssl
+import threading
+from dataclasses import dataclass, field
 from email.mime.text import MIMEText
 from email.utils import formataddr
-from twilio.rest import Client
+from typing import Optional
+from .alerts_pool import SMTPPool
 from .config import settings
+from .exceptions import NotificationError
 from .logging_config import get_logger
 from .security import encryption_service
 
 logger = get_logger(__name__)
 
-ENV_SMTP = {
-    "email_from": settings.from_email,
-    "smtp_host": settings.smtp_host,
-    "smtp_port": settings.smtp_port,
-    "smtp_user": settings.smtp_user,
-    "smtp_pass": settings.smtp_pass,
-}
-ENV_TWILIO = {
-    "twilio_account_sid": settings.twilio_account_sid,
-    "twilio_auth_token": settings.twilio_auth_token,
-    "twilio_from_number": settings.twilio_from_number,
-}
+@dataclass(frozen=True, slots=True)
+class SMTPConfig:
+    """Resolved SMTP settings for sending an email.
+    
+    The port is coerced to int and the From header formatted once here,
+    rather than on every send.
+    """
+    email_from: str
+    smtp_host: Optional[str]
+    smtp_port: int
+    smtp_user: Optional[str]
+    smtp_pass: Optional[str]
+    from_header: str = field(init=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, "smtp_port", int(self.smtp_port))
+        object.__setattr__(self, "from_header", formataddr(("Pricewatch", self.email_from)))
+    
+    @classmethod
+    def from_settings(cls, settings) -> "SMTPConfig":
+        """Build the default SMTP config from application settings."""
+        return cls(
+            email_from=settings.from_email,
+            smtp_host=settings.smtp_host,
+            smtp_port=settings.smtp_port,
+            smtp_user=settings.smtp_user,
+            smtp_pass=settings.smtp_pass,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class TwilioConfig:
+    """Resolved Twilio settings for sending an SMS."""
+    twilio_account_sid: Optional[str]
+    twilio_auth_token: Optional[str]
+    twilio_from_number: Optional[str]
+    
+    @classmethod
+    def from_settings(cls, settings) -> "TwilioConfig":
+        """Build the default Twilio config from application settings."""
+        return cls(
+            twilio_account_sid=settings.twilio_account_sid,
+            twilio_auth_token=settings.twilio_auth_token,
+            twilio_from_number=settings.twilio_from_number,
+        )
+
+
+ENV_SMTP = SMTPConfig.from_settings(settings)
+ENV_TWILIO = TwilioConfig.from_settings(settings)
+
+SMTPS_PORT = 465
+
+
+class _SessionReuseContext(ssl.SSLContext):
+    """Client TLS context that resumes the last session for each SMTP host.
+    
+    smtplib does not expose the session argument of wrap_socket, so the
+    context injects it, letting reconnects skip a full TLS handshake.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.sessions = {}
+    
+    def wrap_socket(self, sock, *args, server_hostname=None, session=None, **kwargs):
+        if session is None and server_hostname:
+            session = self.sessions.get(server_hostname)
+        return super().wrap_socket(
+            sock, *args, server_hostname=server_hostname, session=session, **kwargs
+        )
+
+
+def _create_ssl_context():
+    context = _SessionReuseContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.load_default_certs(ssl.Purpose.SERVER_AUTH)
+    context.minimum_version = ssl.TLSVersion.TLSv1_2
+    return context
+
+
+ssl_context = _create_ssl_context()
+
+SMTP_POOL_SIZE = settings.smtp_pool_size
+SMTP_MESSAGES_PER_CONNECTION = settings.smtp_messages_per_connection
+
+# SMTP connection pools keyed by (host, port, user, password digest)
+_smtp_pools = {}
+_smtp_pools_lock = threading.Lock()
+
+# Twilio clients keyed by (account_sid, auth_token); each holds a keep-alive HTTP session
+_twilio_clients = {}
+_twilio_clients_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=256)
+def _decrypt_cached(profile_id: int, ciphertext: str) -> str:
+    """Decrypt a profile credential, memoized per (profile, ciphertext).
+    
+    Keying on the ciphertext means a rotated credential misses the cache
+    instead of returning the stale plaintext.
+    """
+    return encryption_service.decrypt(ciphertext)
 
 def _smtp_config(profile):
     """Get SMTP configuration, decrypting profile credentials if needed."""
@@ -28,17 +125,17 @@ def _smtp_config(profile):
         smtp_pass = None
         if profile.smtp_pass:
             try:
-                smtp_pass = encryption_service.decrypt(profile.smtp_pass)
+                smtp_pass = _decrypt_cached(profile.id, profile.smtp_pass)
             except Exception as e:
-                logger.warning(f"Failed to decrypt SMTP password for profile {profile.id}: {e}")
+                logger.warning("Failed to decrypt SMTP password for profile %s: %s", profile.id, e)
         
-        return {
-            "email_from": profile.email_from or ENV_SMTP["email_from"],
-            "smtp_host": profile.smtp_host or ENV_SMTP["smtp_host"],
-            "smtp_port": profile.smtp_port or ENV_SMTP["smtp_port"] or 587,
-            "smtp_user": profile.smtp_user or ENV_SMTP["smtp_user"],
-            "smtp_pass": smtp_pass or ENV_SMTP["smtp_pass"]
-        }
+        return SMTPConfig(
+            email_from=profile.email_from or ENV_SMTP.email_from,
+            smtp_host=profile.smtp_host or ENV_SMTP.smtp_host,
+            smtp_port=profile.smtp_port or ENV_SMTP.smtp_port or 587,
+            smtp_user=profile.smtp_user or ENV_SMTP.smtp_user,
+            smtp_pass=smtp_pass or ENV_SMTP.smtp_pass,
+        )
     return ENV_SMTP
 
 def _twilio_config(profile):
@@ -48,55 +145,176 @@ def _twilio_config(profile):
         twilio_auth_token = None
         if profile.twilio_auth_token:
             try:
-                twilio_auth_token = encryption_service.decrypt(profile.twilio_auth_token)
+                twilio_auth_token = _decrypt_cached(profile.id, profile.twilio_auth_token)
             except Exception as e:
-                logger.warning(f"Failed to decrypt Twilio auth token for profile {profile.id}: {e}")
+                logger.warning(
+                    "Failed to decrypt Twilio auth token for profile %s: %s", profile.id, e
+                )
         
-        return {
-            "twilio_account_sid": profile.twilio_account_sid or ENV_TWILIO["twilio_account_sid"],
-            "twilio_auth_token": twilio_auth_token or ENV_TWILIO["twilio_auth_token"],
-            "twilio_from_number": profile.twilio_from_number or ENV_TWILIO["twilio_from_number"]
-        }
+        return TwilioConfig(
+            twilio_account_sid=profile.twilio_account_sid or ENV_TWILIO.twilio_account_sid,
+            twilio_auth_token=twilio_auth_token or ENV_TWILIO.twilio_auth_token,
+            twilio_from_number=profile.twilio_from_number or ENV_TWILIO.twilio_from_number,
+        )
     return ENV_TWILIO
 
+def _smtp_key(cfg):
+    """Pool key for cfg; includes a digest of the password so a rotated one gets a fresh pool."""
+    secret = hashlib.blake2b((cfg.smtp_pass or "").encode(), digest_size=16).digest()
+    return (cfg.smtp_host, cfg.smtp_port, cfg.smtp_user, secret)
+
+def _open_smtp(cfg):
+    """Open and authenticate a new SMTP connection.
+    
+    Port 465 uses implicit TLS (SMTPS), saving the STARTTLS round trip;
+    other ports upgrade with STARTTLS. TLS sessions are resumed per host.
+    """
+    host, port = cfg.smtp_host, cfg.smtp_port
+    if port == SMTPS_PORT:
+        server = smtplib.SMTP_SSL(host, port, context=ssl_context)
+    else:
+        server = smtplib.SMTP(host, port)
+    try:
+        if port != SMTPS_PORT:
+            server.starttls(context=ssl_context)
+        if cfg.smtp_user:
+            server.login(cfg.smtp_user, cfg.smtp_pass)
+        session = getattr(server.sock, "session", None)
+        if isinstance(session, ssl.SSLSession):
+            ssl_context.sessions[host] = session
+    except Exception:
+        server.close()
+        raise
+    return server
+
+def _get_pool(cfg):
+    """Return the connection pool for cfg's server and credentials, creating it on first use.
+    
+    Profiles sharing a server and user but not a password get separate
+    pools, as does a rotated password.
+    """
+    key = _smtp_key(cfg)
+    pool = _smtp_pools.get(key)
+    if pool is None:
+        with _smtp_pools_lock:
+            pool = _smtp_pools.get(key)
+            if pool is None:
+                pool = SMTPPool(
+                    lambda: _open_smtp(cfg),
+                    size=SMTP_POOL_SIZE,
+                    max_messages=SMTP_MESSAGES_PER_CONNECTION,
+                )
+                _smtp_pools[key] = pool
+    return pool
+
+@atexit.register
+def close_smtp_connections():
+    """Close all pooled SMTP connections."""
+    with _smtp_pools_lock:
+        for pool in _smtp_pools.values():
+            pool.close()
+        _smtp_pools.clear()
+
+def _build_message(cfg, to_email, subject, body):
+    msg = MIMEText(body, "plain")
+    msg["Subject"] = subject
+    msg["From"] = cfg.from_header
+    msg["To"] = to_email
+    return msg
+
 def send_email(to_email: str, subject: str, body: str, profile=None):
     """Send email notification."""
     try:
         cfg = _smtp_config(profile)
-        if not cfg["smtp_host"]:
+        if not cfg.smtp_host:
             logger.warning("SMTP not configured; skipping email.")
             return
         
-        msg = MIMEText(body, "plain")
-        msg["Subject"] = subject
-        msg["From"] = formataddr(("Pricewatch", cfg["email_from"]))
-        msg["To"] = to_email
+        msg = _build_message(cfg, to_email, subject, body)
         
-        with smtplib.SMTP(cfg["smtp_host"], int(cfg["smtp_port"])) as server:
-            server.starttls()
-            if cfg["smtp_user"]:
-                server.login(cfg["smtp_user"], cfg["smtp_pass"])
+        with _get_pool(cfg).borrow() as server:
             server.send_message(msg)
         
-        logger.info(f"Email sent to {to_email}")
+        logger.info("Email sent to %s", to_email)
         
     except Exception as e:
-        logger.error(f"Failed to send email to {to_email}: {e}")
+        logger.error("Failed to send email to %s: %s", to_email, e)
         raise
 
+def send_email_batch(messages, profile=None):
+    """Send several emails through the same SMTP configuration.
+    
+    Connections are reused across the batch via the pool. If the provider
+    is failing, the batch stops once failures reach max(10, len/3) instead
+    of paying a connect timeout for every remaining message.
+    
+    Args:
+        messages: List of (to_email, subject, body) tuples
+        profile: Optional notification profile for custom SMTP settings
+        
+    Returns:
+        int: Number of emails sent
+        
+    Raises:
+        NotificationError: If too many messages in the batch fail
+    """
+    cfg = _smtp_config(profile)
+    if not cfg.smtp_host:
+        logger.warning("SMTP not configured; skipping email batch.")
+        return 0
+    
+    pool = _get_pool(cfg)
+    max_failures = max(10, len(messages) // 3)
+    sent = failures = 0
+    for to_email, subject, body in messages:
+        try:
+            with pool.borrow() as server:
+                server.send_message(_build_message(cfg, to_email, subject, body))
+            sent += 1
+        except Exception as e:
+            failures += 1
+            logger.error("Failed to send email to %s: %s", to_email, e)
+            if failures >= max_failures:
+                raise NotificationError(
+                    f"Aborted email batch after {failures} failures ({sent} sent)",
+                    details={"sent": sent, "failed": failures, "total": len(messages)},
+                )
+    
+    logger.info("Email batch sent: %d/%d", sent, len(messages))
+    return sent
+
+def _get_twilio_client(cfg):
+    """Return a cached Twilio client for cfg's credentials.
+    
+    Reusing the client keeps its HTTP connection to the Twilio API alive
+    across messages instead of doing a new TLS handshake per SMS.
+    """
+    key = (cfg.twilio_account_sid, cfg.twilio_auth_token)
+    client = _twilio_clients.get(key)
+    if client is None:
+        # Imported here: the Twilio SDK is heavy and only needed when SMS is configured
+        from twilio.rest import Client
+        
+        with _twilio_clients_lock:
+            client = _twilio_clients.get(key)
+            if client is None:
+                client = Client(*key)
+                _twilio_clients[key] = client
+    return client
+
 def send_sms(to_number: str, body: str, profile=None):
     """Send SMS notification."""
     try:
         cfg = _twilio_config(profile)
-        if not cfg["twilio_account_sid"]:
+        if not cfg.twilio_account_sid:
             logger.warning("Twilio not configured; skipping SMS.")
             return
         
-        client = Client(cfg["twilio_account_sid"], cfg["twilio_auth_token"])
-        client.messages.create(to=to_number, from_=cfg["twilio_from_number"], body=body)
+        client = _get_twilio_client(cfg)
+        client.messages.create(to=to_number, from_=cfg.twilio_from_number, body=body)
         
-        logger.info(f"SMS sent to {to_number}")
+        logger.info("SMS sent to %s", to_number)
         
     except Exception as e:
-        logger.error(f"Failed to send SMS to {to_number}: {e}")
+        logger.error("Failed to send SMS to %s: %s", to_number, e)
         raise
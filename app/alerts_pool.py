@@ -0,0 +1,129 @@
+"""Bounded pool of reusable SMTP connections for alert delivery."""
+
+import queue
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+from app.logging_config import get_logger
+
+__all__ = [
+    "SMTPPool",
+]
+
+logger = get_logger(__name__)
+
+# Servers drop idle sessions after a few minutes; reconnect instead of probing stale ones
+IDLE_TIMEOUT = 60
+
+
+class _PooledConnection:
+    """An open SMTP connection plus the bookkeeping needed to recycle it."""
+
+    __slots__ = ("server", "sent", "last_used")
+
+    def __init__(self, server: smtplib.SMTP):
+        self.server = server
+        self.sent = 0
+        self.last_used = time.monotonic()
+
+
+def _close(server: smtplib.SMTP) -> None:
+    """Close an SMTP connection, ignoring errors from dead sockets."""
+    try:
+        server.quit()
+    except Exception:
+        try:
+            server.close()
+        except Exception:
+            pass
+
+
+class SMTPPool:
+    """Pool of authenticated SMTP connections to a single server/user.
+
+    At most ``size`` connections are open at once; callers beyond that
+    block in ``borrow()`` until a connection is released. Idle connections
+    are health-checked with NOOP before reuse and recycled once they have
+    sent ``max_messages`` messages.
+    """
+
+    __slots__ = ("_connect", "_max_messages", "_idle", "_slots", "_closed")
+
+    def __init__(self, connect: Callable[[], smtplib.SMTP], size: int = 5, max_messages: int = 100):
+        """Initialize the pool.
+
+        Args:
+            connect: Callable returning a new, authenticated SMTP connection
+            size: Maximum number of open connections
+            max_messages: Messages sent on a connection before it is replaced
+        """
+        self._connect = connect
+        self._max_messages = max_messages
+        self._idle: "queue.LifoQueue[_PooledConnection]" = queue.LifoQueue(maxsize=size)
+        self._slots = threading.BoundedSemaphore(size)
+        self._closed = False
+
+    def _is_usable(self, conn: _PooledConnection) -> bool:
+        if conn.sent >= self._max_messages:
+            return False
+        if time.monotonic() - conn.last_used >= IDLE_TIMEOUT:
+            return False
+        try:
+            return conn.server.noop()[0] == 250
+        except Exception:
+            return False
+
+    def _checkout(self) -> _PooledConnection:
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return _PooledConnection(self._connect())
+            if self._is_usable(conn):
+                return conn
+            logger.debug("Discarding stale SMTP connection")
+            _close(conn.server)
+
+    @contextmanager
+    def borrow(self):
+        """Borrow a live SMTP connection for the duration of the block.
+
+        The connection is returned to the pool on success and discarded
+        if the block raises, since its session state is then unknown.
+        """
+        self._slots.acquire()
+        try:
+            conn = self._checkout()
+            try:
+                yield conn.server
+            except Exception:
+                _close(conn.server)
+                raise
+            conn.sent += 1
+            conn.last_used = time.monotonic()
+            self.release(conn)
+        finally:
+            self._slots.release()
+
+    def release(self, conn: _PooledConnection) -> None:
+        """Return a connection to the idle queue, or close it if spent or the pool is closed."""
+        if self._closed or conn.sent >= self._max_messages:
+            _close(conn.server)
+            return
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            _close(conn.server)
+
+    def close(self) -> None:
+        """Close all idle connections; connections still borrowed are closed on release."""
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            _close(conn.server)
@@ -7,6 +7,30 @@ import os
 import logging
 import json
 
+try:
+    import orjson as _json  # Faster C parser when installed
+except ImportError:
+    _json = json
+
+
+class CommaSeparatedListSource(DotEnvSettingsSource):
+    """Dotenv source that also accepts comma-separated strings for list fields."""
+    
+    def prepare_field_value(
+        self, field_name: str, field, field_value: Any, value_is_complex: bool
+    ) -> Any:
+        """Override to handle comma-separated strings for list fields."""
+        # Check if this is a list field that might be comma-separated
+        if field_name in ["allowed_hosts", "cors_origins"] and isinstance(field_value, str):
+            # Try JSON first
+            try:
+                return _json.loads(field_value)
+            except ValueError:
+                # Fall back to comma-separated string
+                return [item.strip() for item in field_value.split(",") if item.strip()]
+        # For other fields, use default behavior
+        return super().prepare_field_value(field_name, field, field_value, value_is_complex)
+
 
 class Settings(BaseSettings):
     """Application configuration settings."""
@@ -18,10 +42,16 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = "sqlite:///pricewatch.db"
+    # Per worker process. Keep workers x (db_pool_size + db_max_overflow),
+    # plus any other clients, below the server's max_connections (100 by
+    # default on PostgreSQL): 5 gunicorn workers (2 CPUs) use at most 50.
     db_pool_size: int = 5
-    db_max_overflow: int = 10
+    db_max_overflow: int = 5
     db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800  # Seconds before a pooled connection is replaced
     db_query_timeout: int = 30  # Query timeout in seconds
+    # create_all at startup; disable when using `alembic upgrade head`
+    auto_create_tables: bool = True
     
     # Security
     secret_key: str = "your-secret-key-change-in-production"
@@ -32,6 +62,8 @@ class Settings(BaseSettings):
     # Rate Limiting
     rate_limit_per_minute: int = 60
     rate_limit_burst: int = 10
+    # Share rate-limit counters across workers, e.g. redis://localhost:6379/0
+    redis_url: Optional[str] = None
     
     # Scraping
     request_timeout: int = 30
@@ -39,6 +71,9 @@ class Settings(BaseSettings):
     use_js_fallback: bool = False
     use_async_client: bool = False  # Use async HTTP client for API endpoints
     schedule_minutes: int = 30
+    # Run the polling scheduler in this process; enable on one worker only
+    scheduler_leader: bool = True
+    scrape_concurrency: int = 8  # Parallel page fetches per polling sweep
     
     # SMTP (Default/Environment)
     smtp_host: Optional[str] = None
@@ -46,12 +81,17 @@ class Settings(BaseSettings):
     smtp_user: Optional[str] = None
     smtp_pass: Optional[str] = None
     from_email: str = "alerts@example.com"
+    smtp_pool_size: int = 5  # Max open connections per SMTP server/user
+    smtp_messages_per_connection: int = 100  # Recycle a connection after this many sends
     
     # Twilio (Default/Environment)
     twilio_account_sid: Optional[str] = None
     twilio_auth_token: Optional[str] = None
     twilio_from_number: Optional[str] = None
     
+    # Caching
+    api_cache_ttl: int = 30  # Seconds /api/trackers bodies are reused; 0 disables
+    
     # Logging
     log_level: str = "INFO"
     log_format: str = "json"
@@ -100,21 +140,6 @@ class Settings(BaseSettings):
         file_secret_settings,
     ):
         """Customize settings sources to handle comma-separated list fields."""
-        # Wrap the dotenv settings source to handle comma-separated strings
-        class CommaSeparatedListSource(DotEnvSettingsSource):
-            def prepare_field_value(self, field_name: str, field, field_value: Any, value_is_complex: bool) -> Any:
-                """Override to handle comma-separated strings for list fields."""
-                # Check if this is a list field that might be comma-separated
-                if field_name in ["allowed_hosts", "cors_origins"] and isinstance(field_value, str):
-                    # Try JSON first
-                    try:
-                        return json.loads(field_value)
-                    except (json.JSONDecodeError, ValueError):
-                        # Fall back to comma-separated string
-                        return [item.strip() for item in field_value.split(",") if item.strip()]
-                # For other fields, use default behavior
-                return super().prepare_field_value(field_name, field, field_value, value_is_complex)
-        
         return (
             init_settings,
             env_settings,
@@ -4,18 +4,22 @@ This module provides CSRF token generation, validation, and middleware
 for protecting form submissions against CSRF attacks.
 """
 
+import hmac
 import secrets
 import hashlib
 import time
 import logging
-from typing import Optional, Dict, Tuple
+from typing import Optional
 from fastapi import Request, HTTPException, status
+from app.config import settings
 
 logger = logging.getLogger("app.csrf")
 
 # CSRF token configuration
-CSRF_TOKEN_LENGTH = 32  # Length of the random token
+CSRF_NONCE_LENGTH = 16  # Random bytes in each token
+CSRF_DIGEST_SIZE = 16  # Bytes of the token signature
 CSRF_TOKEN_EXPIRY = 3600  # Token expiry time in seconds (1 hour)
+CSRF_CLOCK_SKEW = 60  # Seconds a token may appear to come from the future
 CSRF_HEADER_NAME = "X-CSRF-Token"
 CSRF_FORM_FIELD = "csrf_token"
 CSRF_COOKIE_NAME = "csrf_token"
@@ -24,14 +28,35 @@ CSRF_COOKIE_NAME = "csrf_token"
 class CSRFTokenManager:
     """Manages CSRF token generation and validation.
     
-    Uses a simple token-based approach where tokens are stored in cookies
-    and validated against form submissions or headers.
+    Tokens are stateless: each one is ``<nonce>.<issued>.<signature>``,
+    where the signature is a keyed BLAKE2b MAC of the nonce and issue
+    time under a key derived from ``settings.secret_key``. Any process
+    sharing the secret validates a token another process issued, so
+    tokens work across Gunicorn workers and restarts, and nothing is
+    stored per token.
+    
+    Because nothing is stored, a token cannot be revoked: it stays valid,
+    and can be replayed, until it expires. ``invalidate_token`` is gone
+    for that reason (the app never called it).
     """
     
-    def __init__(self):
-        self._tokens: Dict[str, Tuple[str, float]] = {}  # token -> (secret, timestamp)
-        self._cleanup_interval = 300  # 5 minutes
-        self._last_cleanup = time.time()
+    __slots__ = ("_key",)
+    
+    def __init__(self, secret: Optional[str] = None):
+        """Initialize the manager.
+        
+        Args:
+            secret: Signing secret; defaults to ``settings.secret_key``
+        """
+        secret = settings.secret_key if secret is None else secret
+        self._key = hashlib.blake2b(
+            secret.encode(), digest_size=32, person=b"pricewatch-csrf"
+        ).digest()
+    
+    def _sign(self, payload: str) -> str:
+        return hashlib.blake2b(
+            payload.encode(), digest_size=CSRF_DIGEST_SIZE, key=self._key
+        ).hexdigest()
     
     def generate_token(self, request: Request) -> str:
         """Generate a new CSRF token for the request.
@@ -42,17 +67,8 @@ class CSRFTokenManager:
         Returns:
             str: The generated CSRF token
         """
-        # Create a random token
-        token = secrets.token_urlsafe(CSRF_TOKEN_LENGTH)
-        secret = secrets.token_urlsafe(CSRF_TOKEN_LENGTH)
-        
-        # Store token with timestamp
-        self._tokens[token] = (secret, time.time())
-        
-        # Periodic cleanup
-        self._cleanup_expired_tokens()
-        
-        return token
+        payload = "%s.%d" % (secrets.token_urlsafe(CSRF_NONCE_LENGTH), int(time.time()))
+        return "%s.%s" % (payload, self._sign(payload))
     
     def validate_token(self, token: Optional[str], request: Request) -> bool:
         """Validate a CSRF token.
@@ -65,53 +81,27 @@ class CSRFTokenManager:
             bool: True if token is valid, False otherwise
         """
         if not token:
-            logger.warning(f"CSRF validation failed: no token provided from {request.client.host}")
+            logger.warning("CSRF validation failed: no token provided from %s", request.client.host)
             return False
         
-        # Check if token exists
-        if token not in self._tokens:
-            logger.warning(f"CSRF validation failed: unknown token from {request.client.host}")
+        # Check the signature
+        issued = None
+        if isinstance(token, str):
+            payload, _, signature = token.rpartition(".")
+            # Compared as bytes: compare_digest rejects non-ASCII str input
+            if payload and hmac.compare_digest(signature.encode(), self._sign(payload).encode()):
+                issued = int(payload.rpartition(".")[2])
+        if issued is None:
+            logger.warning("CSRF validation failed: invalid token from %s", request.client.host)
             return False
         
-        secret, timestamp = self._tokens[token]
-        
         # Check if token has expired
-        if time.time() - timestamp > CSRF_TOKEN_EXPIRY:
-            logger.warning(f"CSRF validation failed: expired token from {request.client.host}")
-            del self._tokens[token]
+        age = time.time() - issued
+        if age > CSRF_TOKEN_EXPIRY or age < -CSRF_CLOCK_SKEW:
+            logger.warning("CSRF validation failed: expired token from %s", request.client.host)
             return False
         
         return True
-    
-    def invalidate_token(self, token: str) -> None:
-        """Invalidate a CSRF token after use (one-time use tokens).
-        
-        Args:
-            token: The token to invalidate
-        """
-        if token in self._tokens:
-            del self._tokens[token]
-    
-    def _cleanup_expired_tokens(self) -> None:
-        """Remove expired tokens from storage."""
-        now = time.time()
-        
-        # Only cleanup periodically
-        if now - self._last_cleanup < self._cleanup_interval:
-            return
-        
-        self._last_cleanup = now
-        expired = []
-        
-        for token, (secret, timestamp) in self._tokens.items():
-            if now - timestamp > CSRF_TOKEN_EXPIRY:
-                expired.append(token)
-        
-        for token in expired:
-            del self._tokens[token]
-        
-        if expired:
-            logger.debug(f"Cleaned up {len(expired)} expired CSRF tokens")
 
 
 # Global CSRF token manager instance
@@ -168,8 +158,8 @@ async def validate_csrf_token(request: Request) -> None:
     # Validate token
     if not csrf_manager.validate_token(token, request):
         logger.warning(
-            f"CSRF validation failed for {request.method} {request.url.path} "
-            f"from {request.client.host}"
+            "CSRF validation failed for %s %s from %s",
+            request.method, request.url.path, request.client.host,
         )
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -202,6 +192,8 @@ CSRF_EXEMPT_PATHS = [
     "/openapi.json",
     "/redoc",
 ]
+# Tuple form lets str.startswith check every prefix in a single C call
+_CSRF_EXEMPT_PREFIXES = tuple(CSRF_EXEMPT_PATHS)
 
 
 def is_csrf_exempt(path: str) -> bool:
@@ -213,5 +205,5 @@ def is_csrf_exempt(path: str) -> bool:
     Returns:
         bool: True if path is exempt
     """
-    return any(path.startswith(exempt) for exempt in CSRF_EXEMPT_PATHS)
+    return path.startswith(_CSRF_EXEMPT_PREFIXES)
 
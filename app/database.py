@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.pool import StaticPool, QueuePool
 from .config import settings
@@ -9,16 +9,39 @@ logger = get_logger(__name__)
 # Determine if using SQLite
 is_sqlite = "sqlite" in settings.database_url
 
+# Applied once per new SQLite connection; pooled connections keep them.
+# WAL lets readers proceed during writes, NORMAL sync is safe under WAL,
+# and a 64MB page cache keeps hot pages in memory between requests.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Configure a freshly opened SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
 # Configure engine with appropriate pooling
 if is_sqlite:
-    # SQLite uses StaticPool for development
+    # SQLite uses StaticPool for development: one long-lived connection, so
+    # the pragmas and page cache are set up once. A local file can't go
+    # stale, so there is no pre-ping round-trip on checkout.
     engine = create_engine(
         settings.database_url,
-        connect_args={"check_same_thread": False},
+        connect_args={"check_same_thread": False, "timeout": 30},
         poolclass=StaticPool,
-        pool_pre_ping=True,
         echo=settings.debug,
     )
+    event.listen(engine, "connect", _set_sqlite_pragmas)
 else:
     # PostgreSQL/MySQL use QueuePool with configurable settings
     engine = create_engine(
@@ -28,6 +51,7 @@ else:
         max_overflow=settings.db_max_overflow,
         pool_timeout=settings.db_pool_timeout,
         pool_pre_ping=True,  # Verify connections before use
+        pool_recycle=settings.db_pool_recycle,  # Replace connections before server-side idle timeouts
         echo=settings.debug,  # Log SQL queries in debug mode
     )
 
@@ -40,8 +64,18 @@ def get_db():
     try:
         yield db
     except Exception as e:
-        logger.error(f"Database session error: {e}")
+        logger.error("Database session error: %s", e)
         db.rollback()
         raise
     finally:
         db.close()
+
+async def get_engine():
+    """Engine dependency for async handlers that open their own session.
+    
+    ``get_db`` is a sync generator, which FastAPI enters and exits in its
+    threadpool: two extra thread hops per request. Hot async read handlers
+    take the engine instead and scope a ``with Session(bind)`` block
+    inside the one threadpool call that runs their queries.
+    """
+    return engine
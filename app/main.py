@@ -1,44 +1,61 @@
-import os
+import asyncio
+import functools
 import time
-import uuid
+import secrets
 import hashlib
-from typing import Optional
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Iterator, Optional
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Depends, Request, Form, HTTPException, status
-from fastapi.responses import HTMLResponse, RedirectResponse, Response
+from fastapi import FastAPI, BackgroundTasks, Depends, Request, Form, HTTPException, Query, status
+from fastapi.routing import APIRoute
+from fastapi.responses import (
+    HTMLResponse, JSONResponse, ORJSONResponse, RedirectResponse, Response, StreamingResponse
+)
 from prometheus_client import CONTENT_TYPE_LATEST
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemLoader
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi_limiter import FastAPILimiter
 from fastapi_limiter.depends import RateLimiter
-from starlette.middleware.base import BaseHTTPMiddleware
+from redis import asyncio as aioredis
+from redis.exceptions import NoScriptError
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from urllib.parse import quote_plus
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, raiseload
+from pydantic_core import to_json
 
-from .context import set_request_id, get_request_id
+from .context import set_request_id
 
-from .database import Base, engine, get_db, SessionLocal
-from .models import Tracker, PriceHistory, NotificationProfile
+from .database import Base, engine, get_db, get_engine, SessionLocal
+from .models import Tracker, NotificationProfile, utc_now
 from .schemas import TrackerCreate, TrackerOut, ProfileCreate
 from .scheduler import start_scheduler
-from .services.tracker_service import TrackerService
+from .services.tracker_service import TrackerService, tracker_listing_version
 from .services.profile_service import ProfileService
-from .services.scheduler_service import SchedulerService
-from .exceptions import (
-    PricewatchException, ValidationError, SecurityError, 
-    ScrapingError, DatabaseError, RateLimitError
-)
-from .logging_config import get_logger, setup_logging
+from .exceptions import PricewatchException, ValidationError, SecurityError, RateLimitError
+from .logging_config import get_logger, stop_queue_listener
 from .config import settings
 from .security import rate_limiter
-from .monitoring import health_checker, get_prometheus_metrics, pricewatch_requests_total, pricewatch_request_duration_seconds
-from .csrf import get_csrf_token, validate_csrf_token, is_csrf_exempt, CSRF_FORM_FIELD
+from .monitoring import (
+    health_checker, get_prometheus_metrics,
+    pricewatch_requests_total, pricewatch_request_duration_seconds
+)
+from .csrf import get_csrf_token, is_csrf_exempt, CSRF_FORM_FIELD, CSRF_TOKEN_EXPIRY
 
-# Setup logging
-setup_logging()
+try:
+    import orjson
+except ImportError:  # Optional; fall back to pydantic-core
+    orjson = None
+
+# Logging is configured when app.logging_config is imported
 logger = get_logger(__name__)
 
 @asynccontextmanager
@@ -46,19 +63,49 @@ async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
     logger.info("Starting Pricewatch application")
-    Base.metadata.create_all(bind=engine)
-    start_scheduler(SessionLocal)
+    # Uvicorn's default loop="auto" silently falls back to asyncio when
+    # uvloop isn't installed, so say which loop is serving requests
+    loop_module = type(asyncio.get_running_loop()).__module__
+    if settings.environment == "production" and not loop_module.startswith("uvloop"):
+        logger.warning(
+            "Running on the %s event loop; install uvicorn[standard] for uvloop", loop_module
+        )
+    if settings.auto_create_tables:
+        Base.metadata.create_all(bind=engine)
+    _precompile_templates()
+    if settings.enable_metrics:
+        _warm_request_metrics(app.routes)
+    # Only one process polls; other workers would repeat every scrape
+    scheduler = start_scheduler(SessionLocal) if settings.scheduler_leader else None
+    if settings.redis_url:
+        await FastAPILimiter.init(
+            aioredis.from_url(settings.redis_url, encoding="utf-8", decode_responses=True),
+            identifier=_client_identifier,
+        )
     yield
     # Shutdown
     logger.info("Shutting down Pricewatch application")
+    if scheduler is not None:
+        scheduler.shutdown(wait=False)
+    if FastAPILimiter.redis is not None:
+        await FastAPILimiter.close()
+        FastAPILimiter.redis = None
+    stop_queue_listener()
+
+# orjson encodes JSON endpoints several times faster than the stdlib
+_JSONResponse = ORJSONResponse if orjson is not None else JSONResponse
 
 app = FastAPI(
     title="Pricewatch",
     description="A price tracking application with notifications",
     version="2.1.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=_JSONResponse,
 )
 
+# Compress HTML pages and JSON listings; small bodies aren't worth the CPU
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Security middleware
 app.add_middleware(
     TrustedHostMiddleware,
@@ -73,178 +120,214 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Request ID Middleware
-class RequestIDMiddleware(BaseHTTPMiddleware):
-    """Middleware to add unique request ID to each request.
+# Request ID, security headers, caching headers and metrics are applied by a
+# single plain ASGI middleware: the path is inspected once per request and
+# the response start message is edited in place on its way out.
+
+# Content Security Policy (report-only mode for initial rollout)
+_CSP = (
+    "default-src 'self'; "
+    "script-src 'self' 'unsafe-inline'; "
+    "style-src 'self' 'unsafe-inline'; "
+    "img-src 'self' data: https:; "
+    "font-src 'self'; "
+    "connect-src 'self'; "
+    "frame-ancestors 'none'; "
+    "base-uri 'self'; "
+    "form-action 'self'"
+)
+
+
+def _encode_headers(*pairs: tuple[str, str]) -> tuple[tuple[bytes, bytes], ...]:
+    # Tuples, since the same header lists are shared by every response
+    return tuple((name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in pairs)
+
+
+# Encoded once; every response gets the same values
+_SECURITY_HEADERS = _encode_headers(
+    # Prevent MIME type sniffing
+    ("X-Content-Type-Options", "nosniff"),
+    # Prevent clickjacking
+    ("X-Frame-Options", "DENY"),
+    # Enable XSS filter in browsers
+    ("X-XSS-Protection", "1; mode=block"),
+    # Control referrer information
+    ("Referrer-Policy", "strict-origin-when-cross-origin"),
+    # Restrict browser features
+    ("Permissions-Policy", "geolocation=(), microphone=(), camera=()"),
+    ("Content-Security-Policy-Report-Only", _CSP),
+)
+
+# Listings with an ETag are stored privately but revalidated on every use
+_CACHE_REVALIDATE = _encode_headers(("Cache-Control", "private, no-cache"))
+# Sensitive endpoints - no caching
+_CACHE_NONE = _encode_headers(
+    ("Cache-Control", "no-cache, no-store, must-revalidate"),
+    ("Pragma", "no-cache"),
+    ("Expires", "0"),
+)
+# Static files - long cache
+_CACHE_STATIC = _encode_headers(("Cache-Control", "public, max-age=31536000, immutable"))
+# Pages with an ETag - short cache, then cheap revalidation
+_CACHE_ETAG_PAGE = _encode_headers(("Cache-Control", "private, max-age=5, must-revalidate"))
+# Tracker pages - short cache but enable revalidation
+_CACHE_TRACKER = _encode_headers(("Cache-Control", "private, max-age=60, must-revalidate"))
+# Other pages - short cache
+_CACHE_DEFAULT = _encode_headers(("Cache-Control", "private, max-age=300"))
+
+_PRIVATE_LISTING_PREFIXES = ("/admin", "/api")
+_SENSITIVE_PREFIXES = ("/admin", "/health", "/metrics", "/api")
+
+
+def _cache_headers(path: str, method: str, has_etag: bool) -> tuple[tuple[bytes, bytes], ...]:
+    """Pick the caching headers for a response."""
+    if has_etag and path.startswith(_PRIVATE_LISTING_PREFIXES):
+        return _CACHE_REVALIDATE
+    if path.startswith(_SENSITIVE_PREFIXES):
+        return _CACHE_NONE
+    if path.startswith("/static"):
+        return _CACHE_STATIC
+    if has_etag:
+        return _CACHE_ETAG_PAGE
+    if path.startswith("/tracker/") and method == "GET":
+        return _CACHE_TRACKER
+    return _CACHE_DEFAULT
+
+
+def _metrics_endpoint(scope: Scope) -> str:
+    """Label a request by its route template, e.g. ``/tracker/{tracker_id}/edit``.
     
-    - Generates UUID for each request
-    - Stores in context variable for access throughout request lifecycle
-    - Adds X-Request-ID header to response
+    FastAPI stores the matched route in the scope while routing. Static
+    files and unmatched paths get fixed labels, so probing random URLs
+    can't create a new series per path.
     """
-    
-    async def dispatch(self, request: Request, call_next):
-        # Generate unique request ID
-        req_id = str(uuid.uuid4())
-        
-        # Store in shared context (accessible in logging)
-        set_request_id(req_id)
-        
-        # Store in request state for template access
-        request.state.request_id = req_id
-        
-        # Process request
-        response = await call_next(request)
-        
-        # Add request ID to response header
-        response.headers["X-Request-ID"] = req_id
-        
-        return response
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    if scope["path"].startswith("/static/"):
+        return "/static"
+    return "unmatched"
 
-app.add_middleware(RequestIDMiddleware)
 
+# Label children are looked up once per combination; route-template labels
+# keep the number of combinations small
+@functools.lru_cache(maxsize=2048)
+def _request_counter(method: str, endpoint: str, status: int):
+    return pricewatch_requests_total.labels(method=method, endpoint=endpoint, status=status)
 
-# Security Headers Middleware
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Middleware to add security headers to all responses."""
-    
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-        
-        # Prevent MIME type sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        
-        # Prevent clickjacking
-        response.headers["X-Frame-Options"] = "DENY"
-        
-        # Enable XSS filter in browsers
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        
-        # Control referrer information
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        
-        # Restrict browser features
-        response.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
-        
-        # Content Security Policy (report-only mode for initial rollout)
-        csp = (
-            "default-src 'self'; "
-            "script-src 'self' 'unsafe-inline'; "
-            "style-src 'self' 'unsafe-inline'; "
-            "img-src 'self' data: https:; "
-            "font-src 'self'; "
-            "connect-src 'self'; "
-            "frame-ancestors 'none'; "
-            "base-uri 'self'; "
-            "form-action 'self'"
-        )
-        response.headers["Content-Security-Policy-Report-Only"] = csp
-        
-        return response
 
-app.add_middleware(SecurityHeadersMiddleware)
+@functools.lru_cache(maxsize=1024)
+def _request_timer(method: str, endpoint: str):
+    return pricewatch_request_duration_seconds.labels(method=method, endpoint=endpoint)
+
 
+# Success statuses each method produces: pages and JSON revalidate with
+# ETags, form posts redirect. Error statuses are created lazily on first use.
+_WARM_STATUSES = {"GET": (200, 304), "POST": (303,)}
 
-# Caching Headers Middleware
-class CachingHeadersMiddleware(BaseHTTPMiddleware):
-    """Middleware to add appropriate caching headers to responses.
+
+def _warm_request_metrics(routes: list) -> None:
+    """Create the label children for every route's expected successes.
     
-    - Static assets: Cache-Control with long max-age
-    - Tracker detail pages: ETag support
-    - Sensitive endpoints: no-cache
+    Run at startup so the first request to each route finds its children
+    in the lookup caches; the series are also exported from the start
+    instead of appearing on first use.
     """
-    
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-        
-        path = request.url.path
-        
-        # Sensitive endpoints - no caching
-        if any(path.startswith(prefix) for prefix in ["/admin", "/health", "/metrics", "/api"]):
-            response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-            response.headers["Pragma"] = "no-cache"
-            response.headers["Expires"] = "0"
-        # Static files - long cache
-        elif path.startswith("/static"):
-            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
-        # Tracker detail pages - short cache with ETag support
-        elif path.startswith("/tracker/") and request.method == "GET":
-            # Allow short cache but enable revalidation
-            response.headers["Cache-Control"] = "private, max-age=60, must-revalidate"
-        # Other pages - short cache
-        else:
-            response.headers["Cache-Control"] = "private, max-age=300"
-        
-        return response
-
-app.add_middleware(CachingHeadersMiddleware)
+    for route in routes:
+        if not isinstance(route, APIRoute) or route.path == "/metrics":
+            continue
+        for method in route.methods:
+            _request_timer(method, route.path)
+            for status in _WARM_STATUSES.get(method, ()):
+                _request_counter(method, route.path, status)
 
 
-# Prometheus Metrics Middleware
-class PrometheusMetricsMiddleware(BaseHTTPMiddleware):
-    """Middleware to collect Prometheus metrics for HTTP requests."""
+class PricewatchMiddleware:
+    """Middleware applying the app's per-request bookkeeping.
     
-    async def dispatch(self, request: Request, call_next):
-        # Skip metrics endpoint to avoid recursion
-        if request.url.path == "/metrics":
-            return await call_next(request)
-        
-        # Record start time
-        start_time = time.time()
-        
-        # Process request
-        response = await call_next(request)
-        
-        # Calculate duration
-        duration = time.time() - start_time
-        
-        # Extract endpoint (simplified path)
-        endpoint = request.url.path
-        # Normalize endpoint (remove IDs for better aggregation)
-        if "/tracker/" in endpoint and request.method == "GET":
-            endpoint = "/tracker/{id}"
-        elif "/admin/profiles/" in endpoint:
-            endpoint = "/admin/profiles/{id}"
-        
-        # Record metrics
-        pricewatch_requests_total.labels(
-            method=request.method,
-            endpoint=endpoint,
-            status=response.status_code
-        ).inc()
-        
-        pricewatch_request_duration_seconds.labels(
-            method=request.method,
-            endpoint=endpoint
-        ).observe(duration)
+    - Generates a request ID, stores it in the logging context and request
+      state, and returns it in the X-Request-ID header
+    - Adds security headers to all responses
+    - Adds caching headers by path: long for static assets, revalidation
+      for responses with an ETag, none for sensitive endpoints
+    - Records Prometheus request count and latency when metrics are
+      enabled, except for /metrics
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        return response
+        path = scope["path"]
+        method = scope["method"]
+        req_id = secrets.token_hex(16)
+        
+        # Store in shared context (accessible in logging) and request state
+        set_request_id(req_id)
+        scope.setdefault("state", {})["request_id"] = req_id
+        
+        status_code = 500
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # The per-path caching policy replaces any Cache-Control
+                # the handler set
+                headers = [
+                    item for item in message.get("headers", ()) if item[0] != b"cache-control"
+                ]
+                has_etag = any(name == b"etag" for name, _ in headers)
+                headers.append((b"x-request-id", req_id.encode("latin-1")))
+                headers.extend(_SECURITY_HEADERS)
+                headers.extend(_cache_headers(path, method, has_etag))
+                message["headers"] = headers
+            await send(message)
+        
+        # Skip metrics endpoint to avoid recursion
+        if not settings.enable_metrics or path == "/metrics":
+            await self.app(scope, receive, send_wrapper)
+            return
+        
+        # Integer nanoseconds from the monotonic clock; converted once
+        start_ns = time.perf_counter_ns()
+        await self.app(scope, receive, send_wrapper)
+        duration = (time.perf_counter_ns() - start_ns) * 1e-9
+        
+        endpoint = _metrics_endpoint(scope)
+        _request_counter(method, endpoint, status_code).inc()
+        _request_timer(method, endpoint).observe(duration)
 
-app.add_middleware(PrometheusMetricsMiddleware)
+app.add_middleware(PricewatchMiddleware)
 
 
 # Exception handlers for consistent JSON error responses
-from fastapi.responses import JSONResponse
+
+_ERROR_STATUS_CODES = {
+    "VALIDATION_ERROR": 400,
+    "SECURITY_ERROR": 403,
+    "SCRAPING_ERROR": 502,
+    "DATABASE_ERROR": 500,
+    "RATE_LIMIT_ERROR": 429,
+    "NOTIFICATION_ERROR": 500,
+    "CONFIGURATION_ERROR": 500,
+}
 
 @app.exception_handler(PricewatchException)
 async def pricewatch_exception_handler(request: Request, exc: PricewatchException):
     """Handle all Pricewatch custom exceptions with structured JSON response."""
-    status_codes = {
-        "VALIDATION_ERROR": 400,
-        "SECURITY_ERROR": 403,
-        "SCRAPING_ERROR": 502,
-        "DATABASE_ERROR": 500,
-        "RATE_LIMIT_ERROR": 429,
-        "NOTIFICATION_ERROR": 500,
-        "CONFIGURATION_ERROR": 500,
-    }
-    status_code = status_codes.get(exc.code, 500)
+    status_code = _ERROR_STATUS_CODES.get(exc.code, 500)
     
     logger.warning(
-        f"{exc.code}: {exc.message}",
+        "%s: %s", exc.code, exc.message,
         extra={"details": exc.details, "path": str(request.url.path)}
     )
     
-    return JSONResponse(
+    return _JSONResponse(
         status_code=status_code,
         content=exc.to_dict()
     )
@@ -253,8 +336,8 @@ async def pricewatch_exception_handler(request: Request, exc: PricewatchExceptio
 @app.exception_handler(RateLimitError)
 async def rate_limit_exception_handler(request: Request, exc: RateLimitError):
     """Handle rate limit exceptions with 429 status."""
-    logger.warning(f"Rate limit exceeded for {request.client.host}")
-    return JSONResponse(
+    logger.warning("Rate limit exceeded for %s", request.client.host)
+    return _JSONResponse(
         status_code=429,
         content=exc.to_dict(),
         headers={"Retry-After": "60"}
@@ -278,43 +361,188 @@ async def verify_csrf(
     
     if not csrf_manager.validate_token(token, request):
         logger.warning(
-            f"CSRF validation failed for {request.method} {request.url.path} "
-            f"from {request.client.host}"
+            "CSRF validation failed for %s %s from %s",
+            request.method, request.url.path, request.client.host,
         )
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="CSRF validation failed. Please refresh the page and try again."
         )
 
+async def _client_identifier(request: Request) -> str:
+    """Rate-limit key: the client address (X-Forwarded-For is client-controlled)."""
+    return request.client.host if request.client else "unknown"
+
+class _ClientRateLimiter(RateLimiter):
+    """fastapi-limiter's Redis counter with one window per client.
+    
+    The stock limiter adds a route index to its key, found by comparing
+    each route's path template with the raw request path, so templated
+    routes such as /tracker/{tracker_id}/edit all land in one bucket and
+    the others get their own. Keying on the client alone matches the
+    in-process limiter.
+    """
+    
+    async def __call__(self, request: Request, response: Response) -> None:
+        key = f"{FastAPILimiter.prefix}:{await _client_identifier(request)}:writes"
+        try:
+            pexpire = await self._check(key)
+        except NoScriptError:
+            FastAPILimiter.lua_sha = await FastAPILimiter.redis.script_load(
+                FastAPILimiter.lua_script
+            )
+            pexpire = await self._check(key)
+        if pexpire != 0:
+            await FastAPILimiter.http_callback(request, response, pexpire)
+
+_redis_rate_limiter = _ClientRateLimiter(times=settings.rate_limit_per_minute, seconds=60)
+
+async def enforce_rate_limit(request: Request, response: Response) -> None:
+    """Dependency limiting write requests per client.
+    
+    Each client has one window shared by all write endpoints. Counts are
+    shared by all workers through Redis when REDIS_URL is set; otherwise
+    each process keeps its own window.
+    """
+    if FastAPILimiter.redis is not None:
+        await _redis_rate_limiter(request, response)
+        return
+    client = await _client_identifier(request)
+    if not rate_limiter.is_allowed(client, settings.rate_limit_per_minute):
+        raise HTTPException(status_code=429, detail="Rate limit exceeded")
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
-templates = Jinja2Templates(directory="app/templates")
+# Templates only change on deploy, so skip the per-render mtime check
+# outside debug mode and keep every compiled template in memory
+templates = Jinja2Templates(env=Environment(
+    loader=FileSystemLoader("app/templates"),
+    autoescape=True,
+    auto_reload=settings.debug,
+    cache_size=-1,
+    trim_blocks=True,
+    lstrip_blocks=True,
+))
 
 # Add CSRF token function to Jinja2 templates
 templates.env.globals["csrf_token"] = get_csrf_token
 templates.env.globals["csrf_field_name"] = CSRF_FORM_FIELD
 
+def _render(name: str, context: dict[str, Any]) -> HTMLResponse:
+    """Render a template into an HTMLResponse.
+    
+    Calls the compiled template directly instead of going through
+    ``TemplateResponse``, which re-applies context defaults and wraps the
+    response for test-client introspection on every call. ``context`` must
+    include the request, as templates use it for CSRF tokens.
+    """
+    return HTMLResponse(templates.env.get_template(name).render(context))
+
+def _precompile_templates() -> None:
+    """Compile every template up front so the first requests don't pay for it."""
+    for name in templates.env.list_templates(extensions=["html"]):
+        templates.env.get_template(name)
+
+def _etag(*parts: Any) -> str:
+    """Build a weak ETag from the values a response was rendered from.
+    
+    The tag is weak because GZipMiddleware may compress the body without
+    changing it. BLAKE2b is faster than MD5 in hashlib; bytes parts such as
+    a cached JSON body are hashed as-is rather than through ``str()``.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+        digest.update(b"\x1f")
+    return 'W/"%s"' % digest.hexdigest()
+
+def _page_etag(*parts: Any) -> str:
+    """ETag for an HTML page.
+    
+    Pages embed a CSRF token, so the tag also rolls over every half token
+    lifetime. A page can only be revived by a 304 within the bucket it was
+    rendered in, so its token is then at most half a lifetime old and has
+    at least half left for the form to be submitted.
+    """
+    return _etag(int(time.time() // (CSRF_TOKEN_EXPIRY // 2)), *parts)
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Return True if the request's If-None-Match covers ``etag``."""
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    # Weak comparison: W/"x" and "x" match each other
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+# Trackers shown per page on the home page
+INDEX_PAGE_SIZE = 50
+
 @app.get("/", response_class=HTMLResponse)
-def index(request: Request, db: Session = Depends(get_db)):
+async def index(request: Request, page: int = Query(1, ge=1), bind: Engine = Depends(get_engine)):
     """Home page with trackers and profiles."""
     try:
-        tracker_service = TrackerService(db)
-        profile_service = ProfileService(db)
-        
-        trackers, _ = tracker_service.get_all_trackers()
-        profiles = profile_service.get_all_profiles()
-        
-        return templates.TemplateResponse(
+        # All queries run in one worker-thread hop; rendering stays on the loop.
+        # One query validates the client's cached copy and, when stale, also
+        # supplies the page total; the listing is a second query and the
+        # profile options come from their cache when the profile stamp matches.
+        def load() -> tuple[str, Optional[tuple[list, int, list]]]:
+            with Session(bind=bind) as db:
+                tracker_service = TrackerService(db)
+                stamp = tracker_service.get_dashboard_stamp()
+                etag = _page_etag("index", page, *stamp)
+                if _etag_matches(request, etag):
+                    return etag, None
+                trackers, total = tracker_service.get_all_trackers(
+                    page=page, per_page=INDEX_PAGE_SIZE, listing_only=True, total=stamp[0]
+                )
+                # The options must match the profile stamp the ETag was built from
+                profiles = ProfileService(db).get_profile_options(stamp=stamp[2:])
+                return etag, (trackers, total, profiles)
+        
+        etag, page_data = await run_in_threadpool(load)
+        if page_data is None:
+            return _not_modified(etag)
+        trackers, total, profiles = page_data
+        
+        response = _render(
             "index.html", 
-            {"request": request, "trackers": trackers, "profiles": profiles}
+            {
+                "request": request,
+                "trackers": trackers,
+                "profiles": profiles,
+                "page": page,
+                "has_next": page * INDEX_PAGE_SIZE < total,
+                "total": total,
+            }
         )
+        response.headers["ETag"] = etag
+        return response
     except Exception as e:
-        logger.error(f"Failed to load index page: {e}")
+        logger.error("Failed to load index page: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
+def _fetch_initial_price(tracker_id: int, bind) -> None:
+    """Background task: fetch a new tracker's first price in its own session.
+    
+    The request session is closed by the time background tasks run, so a
+    fresh one is opened on the same engine.
+    """
+    db = Session(bind=bind)
+    try:
+        TrackerService(db).fetch_initial_price(tracker_id)
+    except Exception as e:
+        logger.warning("Initial price fetch failed for tracker %s: %s", tracker_id, e)
+    finally:
+        db.close()
+
 @app.post("/trackers", response_class=HTMLResponse)
 async def create_tracker(
     request: Request,
+    background_tasks: BackgroundTasks,
     url: str = Form(...),
     alert_method: str = Form(...),
     contact: str = Form(...),
@@ -324,121 +552,196 @@ async def create_tracker(
     csrf_token: str = Form(None),
     db: Session = Depends(get_db),
     _csrf: None = Depends(verify_csrf),
+    _rate_limit: None = Depends(enforce_rate_limit),
 ):
     """Create a new tracker."""
     try:
-        # Rate limiting
-        client_ip = request.client.host
-        if not rate_limiter.is_allowed(client_ip, settings.rate_limit_per_minute):
-            raise HTTPException(status_code=429, detail="Rate limit exceeded")
-        
         # Create tracker data
-        tracker_data = TrackerCreate(
-            url=url,
-            alert_method=alert_method,
-            contact=contact,
-            selector=selector or None,
-            name=name or None,
-            profile_id=profile_id or None,
-        )
-        
-        # Use service layer
-        tracker_service = TrackerService(db)
-        tracker = tracker_service.create_tracker(tracker_data)
-        
-        logger.info(f"Created tracker {tracker.id} for {tracker.url}")
-        return RedirectResponse(url=f"/tracker/{tracker.id}", status_code=status.HTTP_303_SEE_OTHER)
+        tracker_data = TrackerCreate.model_validate({
+            "url": url,
+            "alert_method": alert_method,
+            "contact": contact,
+            "selector": selector,
+            "name": name,
+            "profile_id": profile_id,
+        })
+        
+        # Use service layer; database work runs off the event loop
+        def create() -> tuple[int, str]:
+            tracker = TrackerService(db).create_tracker(tracker_data, fetch_price=False)
+            return tracker.id, tracker.url
+        
+        tracker_id, tracker_url = await run_in_threadpool(create)
+        
+        # Fetch the first price after responding so the redirect isn't held
+        # up by the product site
+        background_tasks.add_task(_fetch_initial_price, tracker_id, db.get_bind())
+        
+        logger.info("Created tracker %s for %s", tracker_id, tracker_url)
+        return RedirectResponse(url=f"/tracker/{tracker_id}", status_code=status.HTTP_303_SEE_OTHER)
         
     except ValidationError as e:
-        logger.warning(f"Validation error creating tracker: {e}")
+        logger.warning("Validation error creating tracker: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except SecurityError as e:
-        logger.warning(f"Security error creating tracker: {e}")
+        logger.warning("Security error creating tracker: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Failed to create tracker: {e}")
+        logger.error("Failed to create tracker: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
+def _get_or_404(db: Session, model: type, pk: int, name: str, **options: Any) -> Any:
+    """Load a row by primary key or raise a 404.
+    
+    ``Session.get`` returns rows already in the identity map without
+    issuing a SELECT; extra keyword arguments are passed through to it.
+    """
+    obj = db.get(model, pk, **options)
+    if obj is None:
+        raise HTTPException(status_code=404, detail=f"{name} not found")
+    return obj
+
+# Price history rows shown per page on the tracker detail page
+HISTORY_PAGE_SIZE = 100
+
+# Window of the hourly overview when no ?days= filter is given
+HISTORY_OVERVIEW_DAYS = 30
+
 @app.get("/tracker/{tracker_id}", response_class=HTMLResponse)
-def tracker_detail(tracker_id: int, request: Request, db: Session = Depends(get_db)):
-    """Get tracker details with price history."""
+async def tracker_detail(
+    tracker_id: int,
+    request: Request,
+    before: Optional[datetime] = None,
+    before_id: Optional[int] = None,
+    days: Optional[int] = Query(None, ge=1, le=3650),
+    bind: Engine = Depends(get_engine),
+):
+    """Get tracker details with a page of price history and an hourly overview."""
     try:
-        tracker_service = TrackerService(db)
-        tracker = tracker_service.get_tracker(tracker_id)
-        
-        if not tracker:
-            raise HTTPException(status_code=404, detail="Tracker not found")
-        
-        history = db.query(PriceHistory).filter(
-            PriceHistory.tracker_id == tracker_id
-        ).order_by(PriceHistory.checked_at.desc()).all()
-        
-        # Generate ETag based on tracker and latest price check
-        etag_data = f"{tracker_id}-{tracker.created_at.isoformat() if tracker.created_at else ''}"
-        if history:
-            etag_data += f"-{history[0].checked_at.isoformat()}"
-        # MD5 is acceptable for ETag generation (not security-sensitive)
-        etag = hashlib.md5(etag_data.encode()).hexdigest()  # nosec B324
-        
-        # Check if client has matching ETag
-        if_none_match = request.headers.get("If-None-Match")
-        if if_none_match == etag:
-            return Response(status_code=304)  # Not Modified
-        
-        response = templates.TemplateResponse(
+        since = utc_now() - timedelta(days=days) if days else None
+        overview_since = since or utc_now() - timedelta(days=HISTORY_OVERVIEW_DAYS)
+        
+        def load() -> tuple[str, Optional[tuple[Tracker, list, bool, list]]]:
+            with Session(bind=bind) as db:
+                service = TrackerService(db)
+                stamp = service.get_detail_stamp(tracker_id)
+                if stamp is None:
+                    raise HTTPException(status_code=404, detail="Tracker not found")
+                # Every price change also updates the tracker row, so its
+                # updated_at covers the history; the overview window slides hourly.
+                # ?queued adds the refresh-polling script, so it is a separate variant.
+                etag = _page_etag(
+                    tracker_id, *stamp,
+                    before and before.isoformat(), before_id, days, f"{overview_since:%Y%m%d%H}",
+                    bool(request.query_params.get("queued")),
+                )
+                if _etag_matches(request, etag):
+                    return etag, None
+                # The profile is joined in; in debug mode any other relationship
+                # the page touches raises instead of issuing a hidden SELECT
+                tracker = service.get_tracker(
+                    tracker_id, load_options=[raiseload("*")] if settings.debug else ()
+                )
+                if tracker is None:
+                    raise HTTPException(status_code=404, detail="Tracker not found")
+                history, has_more = service.get_price_history(
+                    tracker_id, before=before, limit=HISTORY_PAGE_SIZE,
+                    before_id=before_id, since=since,
+                )
+                overview = service.get_price_overview(tracker_id, since=overview_since)
+                return etag, (tracker, history, has_more, overview)
+        
+        etag, page_data = await run_in_threadpool(load)
+        if page_data is None:
+            return _not_modified(etag)
+        tracker, history, has_more, overview = page_data
+        
+        response = _render(
             "tracker.html", 
-            {"request": request, "tracker": tracker, "history": history}
+            {
+                "request": request,
+                "tracker": tracker,
+                "history": history,
+                "has_more": has_more,
+                "before": before,
+                "days": days,
+                "overview": overview,
+            }
         )
         response.headers["ETag"] = etag
         return response
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to get tracker {tracker_id}: {e}")
+        logger.error("Failed to get tracker %s: %s", tracker_id, e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
+def _refresh_price(tracker_id: int, bind) -> None:
+    """Background task: scrape a tracker's price in its own session."""
+    db = Session(bind=bind)
+    try:
+        price, currency = TrackerService(db).refresh_tracker_price(tracker_id)
+        logger.info("Refreshed tracker %s: $%s", tracker_id, price)
+    except Exception as e:
+        logger.warning("Price refresh failed for tracker %s: %s", tracker_id, e)
+    finally:
+        db.close()
+
 @app.get("/tracker/{tracker_id}/refresh", response_class=HTMLResponse)
 @app.post("/tracker/{tracker_id}/refresh", response_class=HTMLResponse)
 async def tracker_refresh(
     request: Request,
     tracker_id: int,
+    background_tasks: BackgroundTasks,
     csrf_token: str = Form(None),
     db: Session = Depends(get_db),
     _csrf: None = Depends(verify_csrf),
 ):
-    """Refresh tracker price."""
+    """Queue a tracker price refresh.
+    
+    The scrape can take several seconds, so it runs after the redirect is
+    sent; the tracker page polls the status endpoint until it completes.
+    """
     try:
-        tracker_service = TrackerService(db)
-        tracker = tracker_service.get_tracker(tracker_id)
+        await run_in_threadpool(_get_or_404, db, Tracker, tracker_id, "Tracker")
+        background_tasks.add_task(_refresh_price, tracker_id, db.get_bind())
         
-        if not tracker:
-            raise HTTPException(status_code=404, detail="Tracker not found")
-        
-        price, currency = tracker_service.refresh_tracker_price(tracker_id)
-        
-        logger.info(f"Refreshed tracker {tracker_id}: ${price}")
-        return RedirectResponse(url=f"/tracker/{tracker_id}?ok=1", status_code=status.HTTP_303_SEE_OTHER)
-        
-    except ValidationError as e:
-        logger.warning(f"Validation error refreshing tracker {tracker_id}: {e}")
-        return RedirectResponse(
-            url=f"/tracker/{tracker_id}?error={quote_plus(str(e))}", 
-            status_code=status.HTTP_303_SEE_OTHER
-        )
-    except ScrapingError as e:
-        logger.warning(f"Scraping error refreshing tracker {tracker_id}: {e}")
         return RedirectResponse(
-            url=f"/tracker/{tracker_id}?error={quote_plus(str(e))}", 
-            status_code=status.HTTP_303_SEE_OTHER
+            url=f"/tracker/{tracker_id}?queued=1", status_code=status.HTTP_303_SEE_OTHER
         )
+        
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Failed to refresh tracker {tracker_id}: {e}")
+        logger.error("Failed to queue refresh for tracker %s: %s", tracker_id, e)
         return RedirectResponse(
             url=f"/tracker/{tracker_id}?error={quote_plus('Internal server error')}", 
             status_code=status.HTTP_303_SEE_OTHER
         )
 
 
+@app.get("/tracker/{tracker_id}/status")
+async def tracker_status(tracker_id: int, bind: Engine = Depends(get_engine)):
+    """Return a tracker's latest price and when it was last refreshed."""
+    def load() -> Optional[Any]:
+        with Session(bind=bind) as db:
+            return db.execute(
+                select(Tracker.last_price, Tracker.currency, Tracker.last_refresh_at)
+                .where(Tracker.id == tracker_id)
+            ).first()
+    
+    row = await run_in_threadpool(load)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Tracker not found")
+    
+    return _JSONResponse({
+        "id": tracker_id,
+        "last_price": row.last_price,
+        "currency": row.currency,
+        "last_refresh_at": row.last_refresh_at.isoformat() if row.last_refresh_at else None,
+    })
+
+
 @app.post("/tracker/{tracker_id}/selector", response_class=HTMLResponse)
 async def tracker_set_selector(
     request: Request,
@@ -450,52 +753,50 @@ async def tracker_set_selector(
 ):
     """Update tracker selector."""
     try:
-        tracker_service = TrackerService(db)
-        tracker = tracker_service.get_tracker(tracker_id)
-        
-        if not tracker:
+        found = await run_in_threadpool(
+            TrackerService(db).set_selector, tracker_id, selector or None
+        )
+        if not found:
             raise HTTPException(status_code=404, detail="Tracker not found")
         
-        tracker.selector = selector or None
-        db.add(tracker)
-        db.commit()
-        
-        logger.info(f"Updated selector for tracker {tracker_id}")
-        return RedirectResponse(url=f"/tracker/{tracker_id}/refresh", status_code=status.HTTP_303_SEE_OTHER)
+        logger.info("Updated selector for tracker %s", tracker_id)
+        return RedirectResponse(
+            url=f"/tracker/{tracker_id}/refresh", status_code=status.HTTP_303_SEE_OTHER
+        )
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to update selector for tracker {tracker_id}: {e}")
+        logger.error("Failed to update selector for tracker %s: %s", tracker_id, e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @app.get("/tracker/{tracker_id}/edit", response_class=HTMLResponse)
-def tracker_edit(tracker_id: int, request: Request, db: Session = Depends(get_db)):
+async def tracker_edit(tracker_id: int, request: Request, bind: Engine = Depends(get_engine)):
     """Edit tracker form."""
     try:
-        tracker_service = TrackerService(db)
-        profile_service = ProfileService(db)
-        
-        tracker = tracker_service.get_tracker(tracker_id)
-        if not tracker:
-            raise HTTPException(status_code=404, detail="Tracker not found")
+        def load() -> tuple[Tracker, list]:
+            with Session(bind=bind) as db:
+                tracker = _get_or_404(db, Tracker, tracker_id, "Tracker")
+                # Only ids and names are shown, so the shared dropdown cache serves them
+                return tracker, ProfileService(db).get_profile_options()
         
-        profiles = profile_service.get_all_profiles()
+        tracker, profiles = await run_in_threadpool(load)
         
-        return templates.TemplateResponse(
+        return _render(
             "tracker_edit.html", 
             {"request": request, "tracker": tracker, "profiles": profiles}
         )
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to load edit form for tracker {tracker_id}: {e}")
+        logger.error("Failed to load edit form for tracker %s: %s", tracker_id, e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @app.post("/tracker/{tracker_id}/edit", response_class=HTMLResponse)
 async def tracker_update(
     tracker_id: int,
     request: Request,
+    background_tasks: BackgroundTasks,
     url: str = Form(...),
     name: str = Form(""),
     selector: str = Form(""),
@@ -507,57 +808,48 @@ async def tracker_update(
     csrf_token: str = Form(None),
     db: Session = Depends(get_db),
     _csrf: None = Depends(verify_csrf),
+    _rate_limit: None = Depends(enforce_rate_limit),
 ):
     """Update tracker."""
     try:
-        # Rate limiting
-        client_ip = request.client.host
-        if not rate_limiter.is_allowed(client_ip, settings.rate_limit_per_minute):
-            raise HTTPException(status_code=429, detail="Rate limit exceeded")
-        
         # Create tracker data
-        tracker_data = TrackerCreate(
-            url=url,
-            alert_method=alert_method,
-            contact=contact,
-            selector=selector or None,
-            name=name or None,
-            profile_id=profile_id or None,
-        )
-        
-        # Use service layer
-        tracker_service = TrackerService(db)
-        tracker = tracker_service.update_tracker(tracker_id, tracker_data)
+        tracker_data = TrackerCreate.model_validate({
+            "url": url,
+            "alert_method": alert_method,
+            "contact": contact,
+            "selector": selector,
+            "name": name,
+            "profile_id": profile_id,
+        })
+        
+        # Use service layer; database work runs off the event loop
+        def update() -> bool:
+            tracker = TrackerService(db).update_tracker(
+                tracker_id, tracker_data, is_active=bool(is_active)
+            )
+            return tracker is not None
         
-        if not tracker:
+        if not await run_in_threadpool(update):
             raise HTTPException(status_code=404, detail="Tracker not found")
         
-        # Update active status
-        tracker.is_active = bool(is_active)
-        db.add(tracker)
-        db.commit()
-        
-        # Poll now if requested
+        logger.info("Updated tracker %s", tracker_id)
         if poll_now:
-            try:
-                price, currency = tracker_service.refresh_tracker_price(tracker_id)
-                logger.info(f"Polled tracker {tracker_id} after update: ${price}")
-            except Exception as e:
-                logger.warning(f"Poll-after-save failed for tracker {tracker_id}: {e}")
-        
-        logger.info(f"Updated tracker {tracker_id}")
+            background_tasks.add_task(_refresh_price, tracker_id, db.get_bind())
+            return RedirectResponse(
+                url=f"/tracker/{tracker_id}?queued=1", status_code=status.HTTP_303_SEE_OTHER
+            )
         return RedirectResponse(url=f"/tracker/{tracker_id}", status_code=status.HTTP_303_SEE_OTHER)
         
     except ValidationError as e:
-        logger.warning(f"Validation error updating tracker {tracker_id}: {e}")
+        logger.warning("Validation error updating tracker %s: %s", tracker_id, e)
         raise HTTPException(status_code=400, detail=str(e))
     except SecurityError as e:
-        logger.warning(f"Security error updating tracker {tracker_id}: {e}")
+        logger.warning("Security error updating tracker %s: %s", tracker_id, e)
         raise HTTPException(status_code=400, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to update tracker {tracker_id}: {e}")
+        logger.error("Failed to update tracker %s: %s", tracker_id, e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @app.post("/tracker/{tracker_id}/delete", response_class=HTMLResponse)
@@ -571,167 +863,155 @@ async def tracker_delete(
     """Delete tracker."""
     try:
         tracker_service = TrackerService(db)
-        success = tracker_service.delete_tracker(tracker_id)
+        success = await run_in_threadpool(tracker_service.delete_tracker, tracker_id)
         
         if not success:
             raise HTTPException(status_code=404, detail="Tracker not found")
         
-        logger.info(f"Deleted tracker {tracker_id}")
+        logger.info("Deleted tracker %s", tracker_id)
         return RedirectResponse(url="/", status_code=status.HTTP_303_SEE_OTHER)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to delete tracker {tracker_id}: {e}")
+        logger.error("Failed to delete tracker %s: %s", tracker_id, e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @app.get("/admin/profiles", response_class=HTMLResponse)
-def profiles_list(request: Request, db: Session = Depends(get_db)):
+async def profiles_list(request: Request, bind: Engine = Depends(get_engine)):
     """List all notification profiles."""
     try:
-        profile_service = ProfileService(db)
-        profiles = profile_service.get_all_profiles()
-        
-        return templates.TemplateResponse(
+        def load() -> tuple[str, Optional[list]]:
+            with Session(bind=bind) as db:
+                profile_service = ProfileService(db)
+                etag = _page_etag("profiles", *profile_service.get_change_stamp())
+                if _etag_matches(request, etag):
+                    return etag, None
+                return etag, profile_service.get_all_profiles()
+        
+        etag, profiles = await run_in_threadpool(load)
+        if profiles is None:
+            return _not_modified(etag)
+        
+        response = _render(
             "admin/profiles.html", 
             {"request": request, "profiles": profiles}
         )
+        response.headers["ETag"] = etag
+        return response
     except Exception as e:
-        logger.error(f"Failed to load profiles: {e}")
+        logger.error("Failed to load profiles: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @app.get("/admin/profiles/new", response_class=HTMLResponse)
-def profiles_new(request: Request):
+async def profiles_new(request: Request):
     """New profile form."""
-    return templates.TemplateResponse(
+    return _render(
         "admin/profile_form.html", 
         {"request": request, "profile": None}
     )
 
+# Bound once so each submission calls the compiled schema validator directly
+_validate_profile = ProfileCreate.__pydantic_validator__.validate_python
+
+@dataclass(slots=True)
+class _ProfileForm:
+    """Notification profile form fields, shared by the create and edit handlers."""
+    name: str = Form(...)
+    email_from: str = Form("")
+    smtp_host: str = Form("")
+    smtp_port: int = Form(587)
+    smtp_user: str = Form("")
+    smtp_pass: str = Form("")
+    twilio_account_sid: str = Form("")
+    twilio_auth_token: str = Form("")
+    twilio_from_number: str = Form("")
+    
+    def to_profile_data(self) -> ProfileCreate:
+        """Validate the form in one pass, reading attributes without an intermediate dict."""
+        return _validate_profile(self, from_attributes=True)
+
 @app.post("/admin/profiles/new", response_class=HTMLResponse)
 async def profiles_create(
     request: Request,
-    name: str = Form(...),
-    email_from: str = Form(""),
-    smtp_host: str = Form(""),
-    smtp_port: int = Form(587),
-    smtp_user: str = Form(""),
-    smtp_pass: str = Form(""),
-    twilio_account_sid: str = Form(""),
-    twilio_auth_token: str = Form(""),
-    twilio_from_number: str = Form(""),
+    form: _ProfileForm = Depends(),
     csrf_token: str = Form(None),
     db: Session = Depends(get_db),
     _csrf: None = Depends(verify_csrf),
+    _rate_limit: None = Depends(enforce_rate_limit),
 ):
     """Create new notification profile."""
     try:
-        # Rate limiting
-        client_ip = request.client.host
-        if not rate_limiter.is_allowed(client_ip, settings.rate_limit_per_minute):
-            raise HTTPException(status_code=429, detail="Rate limit exceeded")
-        
-        # Create profile data
-        profile_data = ProfileCreate(
-            name=name,
-            email_from=email_from or None,
-            smtp_host=smtp_host or None,
-            smtp_port=int(smtp_port) if smtp_port else None,
-            smtp_user=smtp_user or None,
-            smtp_pass=smtp_pass or None,
-            twilio_account_sid=twilio_account_sid or None,
-            twilio_auth_token=twilio_auth_token or None,
-            twilio_from_number=twilio_from_number or None,
-        )
+        profile_data = form.to_profile_data()
         
-        # Use service layer
-        profile_service = ProfileService(db)
-        profile = profile_service.create_profile(profile_data)
+        # Use service layer; database work runs off the event loop
+        def create() -> tuple[int, str]:
+            profile = ProfileService(db).create_profile(profile_data)
+            return profile.id, profile.name
+        
+        created_id, created_name = await run_in_threadpool(create)
         
-        logger.info(f"Created profile {profile.id}: {profile.name}")
+        logger.info("Created profile %s: %s", created_id, created_name)
         return RedirectResponse(url="/admin/profiles", status_code=status.HTTP_303_SEE_OTHER)
         
     except ValidationError as e:
-        logger.warning(f"Validation error creating profile: {e}")
+        logger.warning("Validation error creating profile: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Failed to create profile: {e}")
+        logger.error("Failed to create profile: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @app.get("/admin/profiles/{profile_id}/edit", response_class=HTMLResponse)
-def profiles_edit(profile_id: int, request: Request, db: Session = Depends(get_db)):
+async def profiles_edit(profile_id: int, request: Request, bind: Engine = Depends(get_engine)):
     """Edit profile form."""
     try:
-        profile_service = ProfileService(db)
-        profile = profile_service.get_profile(profile_id)
+        def load() -> NotificationProfile:
+            with Session(bind=bind) as db:
+                return _get_or_404(db, NotificationProfile, profile_id, "Profile")
         
-        if not profile:
-            raise HTTPException(status_code=404, detail="Profile not found")
+        profile = await run_in_threadpool(load)
         
-        return templates.TemplateResponse(
+        return _render(
             "admin/profile_form.html", 
             {"request": request, "profile": profile}
         )
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to load edit form for profile {profile_id}: {e}")
+        logger.error("Failed to load edit form for profile %s: %s", profile_id, e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @app.post("/admin/profiles/{profile_id}/edit", response_class=HTMLResponse)
 async def profiles_update(
     profile_id: int,
     request: Request,
-    name: str = Form(...),
-    email_from: str = Form(""),
-    smtp_host: str = Form(""),
-    smtp_port: int = Form(587),
-    smtp_user: str = Form(""),
-    smtp_pass: str = Form(""),
-    twilio_account_sid: str = Form(""),
-    twilio_auth_token: str = Form(""),
-    twilio_from_number: str = Form(""),
+    form: _ProfileForm = Depends(),
     csrf_token: str = Form(None),
     db: Session = Depends(get_db),
     _csrf: None = Depends(verify_csrf),
+    _rate_limit: None = Depends(enforce_rate_limit),
 ):
     """Update notification profile."""
     try:
-        # Rate limiting
-        client_ip = request.client.host
-        if not rate_limiter.is_allowed(client_ip, settings.rate_limit_per_minute):
-            raise HTTPException(status_code=429, detail="Rate limit exceeded")
-        
-        # Create profile data
-        profile_data = ProfileCreate(
-            name=name,
-            email_from=email_from or None,
-            smtp_host=smtp_host or None,
-            smtp_port=int(smtp_port) if smtp_port else None,
-            smtp_user=smtp_user or None,
-            smtp_pass=smtp_pass or None,
-            twilio_account_sid=twilio_account_sid or None,
-            twilio_auth_token=twilio_auth_token or None,
-            twilio_from_number=twilio_from_number or None,
-        )
+        profile_data = form.to_profile_data()
         
         # Use service layer
         profile_service = ProfileService(db)
-        profile = profile_service.update_profile(profile_id, profile_data)
+        profile = await run_in_threadpool(profile_service.update_profile, profile_id, profile_data)
         
         if not profile:
             raise HTTPException(status_code=404, detail="Profile not found")
         
-        logger.info(f"Updated profile {profile_id}")
+        logger.info("Updated profile %s", profile_id)
         return RedirectResponse(url="/admin/profiles", status_code=status.HTTP_303_SEE_OTHER)
         
     except ValidationError as e:
-        logger.warning(f"Validation error updating profile {profile_id}: {e}")
+        logger.warning("Validation error updating profile %s: %s", profile_id, e)
         raise HTTPException(status_code=400, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to update profile {profile_id}: {e}")
+        logger.error("Failed to update profile %s: %s", profile_id, e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @app.post("/admin/profiles/{profile_id}/delete", response_class=HTMLResponse)
@@ -745,72 +1025,134 @@ async def profiles_delete(
     """Delete notification profile."""
     try:
         profile_service = ProfileService(db)
-        success = profile_service.delete_profile(profile_id)
+        success = await run_in_threadpool(profile_service.delete_profile, profile_id)
         
         if not success:
             raise HTTPException(status_code=404, detail="Profile not found")
         
-        logger.info(f"Deleted profile {profile_id}")
+        logger.info("Deleted profile %s", profile_id)
         return RedirectResponse(url="/admin/profiles", status_code=status.HTTP_303_SEE_OTHER)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to delete profile {profile_id}: {e}")
+        logger.error("Failed to delete profile %s: %s", profile_id, e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@app.get("/api/trackers", response_model=list[TrackerOut])
-def api_list_trackers(db: Session = Depends(get_db)):
-    """API endpoint to list all trackers."""
+def _json_bytes(obj: Any) -> bytes:
+    """Serialize an object to compact JSON bytes.
+    
+    Uses orjson when installed, otherwise pydantic-core's Rust encoder.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return to_json(obj)
+
+# Encoded /api/trackers body as (listing version, expiry, body, ETag). Writes in
+# this process invalidate it at once; other workers' writes show up within
+# API_CACHE_TTL seconds.
+_api_trackers_cache: dict = {"entry": None}
+
+def _iter_trackers_json(bind, version: int) -> Iterator[bytes]:
+    """Stream all trackers as a JSON array, one row at a time.
+    
+    Runs after the request session is closed, so it opens its own session
+    on the same engine. The complete body is cached for later requests if
+    no tracker changed while it was streamed.
+    """
+    db = Session(bind=bind)
+    chunks = []
     try:
-        tracker_service = TrackerService(db)
-        trackers, _ = tracker_service.get_all_trackers()
-        return [TrackerOut.model_validate(tracker) for tracker in trackers]
+        for chunk in _iter_tracker_chunks(db):
+            chunks.append(chunk)
+            yield chunk
     except Exception as e:
-        logger.error(f"Failed to list trackers via API: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
+        logger.error("Failed to stream trackers via API: %s", e)
+        raise
+    finally:
+        db.close()
+    
+    if settings.api_cache_ttl > 0 and tracker_listing_version() == version:
+        body = b"".join(chunks)
+        _api_trackers_cache["entry"] = (
+            version, time.monotonic() + settings.api_cache_ttl, body, _etag(body)
+        )
+
+def _iter_tracker_chunks(db: Session) -> Iterator[bytes]:
+    yield b"["
+    separator = b""
+    for row in TrackerService(db).iter_tracker_rows():
+        yield separator + _json_bytes(row)
+        separator = b","
+    yield b"]"
+
+# Responses are built from plain rows, so the schema is documented but not
+# declared as response_model; FastAPI never re-validates or re-encodes them
+@app.get("/api/trackers", responses={200: {"model": list[TrackerOut]}})
+async def api_list_trackers(request: Request, bind: Engine = Depends(get_engine)):
+    """API endpoint to list all trackers.
+    
+    Serves the cached body while it is current, answering 304 if the
+    client already holds it; otherwise Starlette iterates the sync row
+    generator in its threadpool.
+    """
+    version = tracker_listing_version()
+    entry = _api_trackers_cache["entry"]
+    if entry is not None and entry[0] == version and time.monotonic() < entry[1]:
+        if _etag_matches(request, entry[3]):
+            return _not_modified(entry[3])
+        return Response(content=entry[2], media_type="application/json", headers={"ETag": entry[3]})
+    return StreamingResponse(_iter_trackers_json(bind, version), media_type="application/json")
+
+# The basic health payload never changes, so encode it once
+_HEALTH_BODY = _json_bytes({
+    "status": "healthy",
+    "version": "2.1.0",
+    "environment": settings.environment
+})
 
 @app.get("/health")
-def health():
+async def health():
     """Basic health check endpoint."""
-    return {
-        "status": "healthy",
-        "version": "2.1.0",
-        "environment": settings.environment
-    }
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 @app.get("/health/detailed")
-def detailed_health():
-    """Detailed health check endpoint."""
+async def detailed_health():
+    """Detailed health check endpoint.
+    
+    Results are shared for a few seconds between probes; an unhealthy
+    result is answered with 503 so orchestrators can act on the status.
+    """
     try:
-        health_data = health_checker.comprehensive_health_check()
-        return health_data
+        health_data = await run_in_threadpool(health_checker.cached_health_check)
     except Exception as e:
-        logger.error(f"Detailed health check failed: {e}")
-        return {
+        logger.error("Detailed health check failed: %s", e)
+        health_data = {
             "overall_status": "unhealthy",
             "error": str(e),
             "timestamp": time.time()
         }
+    status_code = 200 if health_data["overall_status"] == "healthy" else 503
+    return _JSONResponse(health_data, status_code=status_code)
 
 @app.get("/metrics")
-def metrics():
+async def metrics():
     """Prometheus metrics endpoint."""
     try:
         if settings.enable_metrics:
-            metrics_data = get_prometheus_metrics()
+            metrics_data = await run_in_threadpool(get_prometheus_metrics)
             return Response(
                 content=metrics_data,
                 media_type=CONTENT_TYPE_LATEST
             )
         else:
             # Fallback to JSON metrics if Prometheus is disabled
-            health_data = health_checker.comprehensive_health_check()
-            return {
+            health_data = await run_in_threadpool(health_checker.cached_health_check)
+            return _JSONResponse({
                 "application": health_data["checks"]["application"],
                 "system": health_data["checks"]["system_resources"],
                 "uptime": health_data["checks"]["uptime"]
-            }
+            })
     except Exception as e:
-        logger.error(f"Metrics collection failed: {e}")
-        return {"error": str(e)}
+        logger.error("Metrics collection failed: %s", e)
+        return _JSONResponse({"error": str(e)})
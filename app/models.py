@@ -25,6 +25,7 @@ class NotificationProfile(Base):
     twilio_auth_token = Column(Text, nullable=True)  # Encrypted
     twilio_from_number = Column(String(20), nullable=True)
     created_at = Column(DateTime, default=utc_now, index=True)
+    updated_at = Column(DateTime, default=utc_now, onupdate=utc_now, index=True)
     trackers = relationship("Tracker", back_populates="profile")
 
 class Tracker(Base):
@@ -39,6 +40,8 @@ class Tracker(Base):
     is_active = Column(Boolean, default=True, index=True)
     created_at = Column(DateTime, default=utc_now, index=True)
     last_price = Column(Float, nullable=True, index=True)
+    last_refresh_at = Column(DateTime, nullable=True)  # Last successful scrape
+    updated_at = Column(DateTime, default=utc_now, onupdate=utc_now, index=True)
     profile_id = Column(Integer, ForeignKey("notification_profiles.id"), nullable=True, index=True)
     profile = relationship("NotificationProfile", back_populates="trackers")
     
@@ -58,6 +61,11 @@ class PriceHistory(Base):
     
     # Composite indexes for common queries
     __table_args__ = (
-        Index('idx_price_history_tracker_checked', 'tracker_id', 'checked_at'),
+        # Matches the detail page's ORDER BY checked_at DESC, id DESC, so a
+        # history page is read straight off the index with no sort step
+        Index(
+            'idx_price_history_tracker_checked_desc',
+            'tracker_id', checked_at.desc(), id.desc(),
+        ),
         Index('idx_price_history_checked_price', 'checked_at', 'price'),
     )
@@ -1,8 +1,9 @@
 """Monitoring and health check functionality."""
 
+import threading
 import time
 import psutil
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
@@ -39,11 +40,18 @@ pricewatch_scrape_errors_total = Counter(
 )
 
 
+# Seconds a comprehensive health check result is reused, so liveness,
+# readiness and metrics probes arriving together share one round of checks
+HEALTH_CHECK_TTL = 3.0
+
+
 class HealthChecker:
     """Health check functionality."""
     
     def __init__(self):
         self.start_time = time.time()
+        self._cache_lock = threading.Lock()
+        self._cached: Optional[Tuple[float, Dict[str, Any]]] = None
     
     def check_database(self) -> Dict[str, Any]:
         """Check database connectivity and performance."""
@@ -73,7 +81,7 @@ class HealthChecker:
             }
             
         except Exception as e:
-            logger.error(f"Database health check failed: {e}")
+            logger.error("Database health check failed: %s", e)
             return {
                 "status": "unhealthy",
                 "error": str(e),
@@ -83,7 +91,9 @@ class HealthChecker:
     def check_system_resources(self) -> Dict[str, Any]:
         """Check system resource usage."""
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # Non-blocking: usage since the previous call, instead of
+            # sleeping a second on every probe
+            cpu_percent = psutil.cpu_percent(interval=None)
             memory = psutil.virtual_memory()
             disk = psutil.disk_usage('/')
             
@@ -103,7 +113,7 @@ class HealthChecker:
             }
             
         except Exception as e:
-            logger.error(f"System resources check failed: {e}")
+            logger.error("System resources check failed: %s", e)
             return {
                 "status": "unhealthy",
                 "error": str(e)
@@ -148,7 +158,7 @@ class HealthChecker:
             }
             
         except Exception as e:
-            logger.error(f"Application health check failed: {e}")
+            logger.error("Application health check failed: %s", e)
             return {
                 "status": "unhealthy",
                 "error": str(e)
@@ -189,11 +199,28 @@ class HealthChecker:
             "version": "2.1.0",
             "checks": checks
         }
+    
+    def cached_health_check(self) -> Dict[str, Any]:
+        """Return a comprehensive health check at most HEALTH_CHECK_TTL seconds old.
+        
+        Callers arriving while a check runs wait for its result instead of
+        starting their own. Each caller gets its own shallow copy, so
+        top-level changes do not leak into the cached result.
+        """
+        with self._cache_lock:
+            if self._cached is not None and time.monotonic() < self._cached[0]:
+                return dict(self._cached[1])
+            result = self.comprehensive_health_check()
+            self._cached = (time.monotonic() + HEALTH_CHECK_TTL, result)
+            return dict(result)
 
 
 # Global health checker instance
 health_checker = HealthChecker()
 
+# Start the CPU counter so the first non-blocking read covers time since import
+psutil.cpu_percent(interval=None)
+
 
 def get_prometheus_metrics() -> bytes:
     """Generate Prometheus metrics in text format.
@@ -223,6 +250,6 @@ def get_prometheus_metrics() -> bytes:
         
         db.close()
     except Exception as e:
-        logger.warning(f"Failed to update tracker metrics: {e}")
+        logger.warning("Failed to update tracker metrics: %s", e)
     
     return generate_latest()
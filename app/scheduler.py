@@ -7,8 +7,12 @@ from .logging_config import get_logger
 
 logger = get_logger(__name__)
 
-def start_scheduler(db_factory):
-    """Start the background scheduler."""
+def start_scheduler(db_factory) -> BackgroundScheduler:
+    """Start the background scheduler.
+    
+    Returns:
+        The running scheduler, so the caller can shut it down
+    """
     scheduler = BackgroundScheduler(daemon=True)
     scheduler.add_job(
         lambda: _job(db_factory), 
@@ -17,7 +21,8 @@ def start_scheduler(db_factory):
         id="pricewatch"
     )
     scheduler.start()
-    logger.info(f"Started scheduler with {settings.schedule_minutes} minute intervals")
+    logger.info("Started scheduler with %s minute intervals", settings.schedule_minutes)
+    return scheduler
 
 def _job(db_factory):
     """Background job to poll all trackers."""
@@ -26,6 +31,6 @@ def _job(db_factory):
         scheduler_service = SchedulerService(db)
         scheduler_service.poll_all_trackers()
     except Exception as e:
-        logger.error(f"Scheduler job failed: {e}")
+        logger.error("Scheduler job failed: %s", e)
     finally:
         db.close()
@@ -1,5 +1,7 @@
 from typing import Optional, Literal
-from pydantic import BaseModel, HttpUrl, EmailStr, Field, model_validator, TypeAdapter
+from pydantic import (
+    BaseModel, ConfigDict, HttpUrl, EmailStr, Field, field_validator, model_validator, TypeAdapter
+)
 
 
 # Field length constants (matching database schema)
@@ -15,9 +17,19 @@ class FieldLimits:
     PHONE_MAX = 20
 
 
+# Building a TypeAdapter compiles a validator, so do it once at import
+_EMAIL_ADAPTER = TypeAdapter(EmailStr)
+_HTTP_URL_ADAPTER = TypeAdapter(HttpUrl)
+
+
+def _empty_to_none(value):
+    """Treat blank form values ("" or 0) as unset optional fields."""
+    return value or None
+
+
 class TrackerCreate(BaseModel):
     """Schema for creating a new price tracker."""
-    url: HttpUrl = Field(..., description="Product URL to track")
+    url: str = Field(..., description="Product URL to track")
     selector: Optional[str] = Field(
         None, 
         max_length=FieldLimits.SELECTOR_MAX,
@@ -36,10 +48,21 @@ class TrackerCreate(BaseModel):
     )
     profile_id: Optional[int] = Field(None, description="Notification profile ID")
 
+    @field_validator("url")
+    @classmethod
+    def validate_http_url(cls, value: str) -> str:
+        """Validate as an HTTP(S) URL and keep the normalized string form."""
+        return str(_HTTP_URL_ADAPTER.validate_python(value))
+
+    @field_validator("selector", "name", "profile_id", mode="before")
+    @classmethod
+    def blank_optionals_to_none(cls, value):
+        return _empty_to_none(value)
+
     @model_validator(mode="after")
     def validate_contact_matches_method(self):
         if self.alert_method == "email":
-            TypeAdapter(EmailStr).validate_python(self.contact)
+            _EMAIL_ADAPTER.validate_python(self.contact)
         elif self.alert_method == "sms":
             digits = [ch for ch in self.contact if ch.isdigit()]
             if len(digits) < 10:
@@ -48,15 +71,16 @@ class TrackerCreate(BaseModel):
     
     @model_validator(mode="after")
     def validate_url_length(self):
-        """Validate URL length (HttpUrl doesn't have max_length)."""
-        url_str = str(self.url)
-        if len(url_str) > FieldLimits.URL_MAX:
+        """Validate the normalized URL length (max_length would check the raw input)."""
+        if len(self.url) > FieldLimits.URL_MAX:
             raise ValueError(f"URL must be at most {FieldLimits.URL_MAX} characters")
         return self
 
 
 class TrackerOut(BaseModel):
     """Schema for tracker output/response."""
+    model_config = ConfigDict(from_attributes=True)
+    
     id: int
     url: str
     name: Optional[str] = None
@@ -68,9 +92,6 @@ class TrackerOut(BaseModel):
     last_price: Optional[float] = None
     profile_id: Optional[int] = None
 
-    class Config:
-        from_attributes = True
-
 
 class ProfileCreate(BaseModel):
     """Schema for creating a notification profile."""
@@ -121,3 +142,12 @@ class ProfileCreate(BaseModel):
         max_length=FieldLimits.PHONE_MAX,
         description="Twilio phone number"
     )
+
+    @field_validator(
+        "email_from", "smtp_host", "smtp_port", "smtp_user", "smtp_pass",
+        "twilio_account_sid", "twilio_auth_token", "twilio_from_number",
+        mode="before",
+    )
+    @classmethod
+    def blank_optionals_to_none(cls, value):
+        return _empty_to_none(value)
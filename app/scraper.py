@@ -14,6 +14,9 @@ from bs4 import BeautifulSoup, Tag
 from contextlib import suppress
 
 from app.config import settings
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
 
 # Type alias for price result: (price, currency, title)
 PriceResult = Tuple[Optional[float], str, Optional[str]]
@@ -401,6 +404,6 @@ def get_price(url: str, selector: Optional[str] = None) -> PriceResult:
             if r:
                 return r[0], r[1], title
         except Exception as e:
-            print(f"[WARN] JS fallback failed: {e}")
+            logger.warning("JS fallback failed for %s: %s", url, e)
     
     return None, "USD", title
@@ -8,6 +8,7 @@ import logging
 import time
 import ipaddress
 import socket
+from collections import deque
 from typing import Optional
 from urllib.parse import urlparse
 from cryptography.fernet import Fernet
@@ -114,17 +115,17 @@ class InputValidator:
             
             # Must have scheme and netloc
             if not parsed.scheme or not parsed.netloc:
-                logger.warning(f"URL validation failed: missing scheme or netloc - {url[:100]}")
+                logger.warning("URL validation failed: missing scheme or netloc - %s", url[:100])
                 return False
             
             # Check for allowed schemes only
             if parsed.scheme.lower() not in InputValidator.ALLOWED_SCHEMES:
-                logger.warning(f"URL validation failed: disallowed scheme '{parsed.scheme}'")
+                logger.warning("URL validation failed: disallowed scheme '%s'", parsed.scheme)
                 return False
             
             hostname = parsed.hostname
             if not hostname:
-                logger.warning(f"URL validation failed: no hostname - {url[:100]}")
+                logger.warning("URL validation failed: no hostname - %s", url[:100])
                 return False
             
             # Determine if private IPs should be allowed
@@ -135,8 +136,8 @@ class InputValidator:
             if hostname.lower() in InputValidator.LOCALHOST_HOSTNAMES:
                 if not allow_private:
                     logger.warning(
-                        f"SSRF protection: blocked localhost hostname '{hostname}' "
-                        f"in {settings.environment} mode"
+                        "SSRF protection: blocked localhost hostname '%s' in %s mode",
+                        hostname, settings.environment,
                     )
                     return False
             
@@ -146,15 +147,15 @@ class InputValidator:
                 if is_private_ip(hostname):
                     if not allow_private:
                         logger.warning(
-                            f"SSRF protection: blocked private IP '{hostname}' "
-                            f"in {settings.environment} mode"
+                            "SSRF protection: blocked private IP '%s' in %s mode",
+                            hostname, settings.environment,
                         )
                         return False
                 # In non-development, block direct IP access entirely
                 elif settings.environment != "development":
                     logger.warning(
-                        f"SSRF protection: blocked direct IP access '{hostname}' "
-                        f"in {settings.environment} mode"
+                        "SSRF protection: blocked direct IP access '%s' in %s mode",
+                        hostname, settings.environment,
                     )
                     return False
             else:
@@ -167,8 +168,9 @@ class InputValidator:
                             ip = result[4][0]
                             if is_private_ip(ip):
                                 logger.warning(
-                                    f"SSRF protection: hostname '{hostname}' resolves to "
-                                    f"private IP '{ip}' in {settings.environment} mode"
+                                    "SSRF protection: hostname '%s' resolves to "
+                                    "private IP '%s' in %s mode",
+                                    hostname, ip, settings.environment,
                                 )
                                 return False
                     except socket.gaierror:
@@ -178,7 +180,7 @@ class InputValidator:
             return True
             
         except Exception as e:
-            logger.warning(f"URL validation failed with exception: {e}")
+            logger.warning("URL validation failed with exception: %s", e)
             return False
     
     @staticmethod
@@ -323,7 +325,7 @@ class RateLimiter:
     DEFAULT_WINDOW = 60  # Default window in seconds
     
     def __init__(self):
-        self._requests: dict[str, list[float]] = {}
+        self._requests: dict[str, deque[float]] = {}
         self._last_cleanup = time.time()
         self._first_seen: dict[str, float] = {}  # Track when each identifier was first seen
     
@@ -347,21 +349,21 @@ class RateLimiter:
         if identifier not in self._requests:
             # Check if we need to evict old entries
             self._maybe_evict()
-            self._requests[identifier] = []
+            self._requests[identifier] = deque()
             self._first_seen[identifier] = now
         
-        # Clean old requests for this identifier
-        self._requests[identifier] = [
-            req_time for req_time in self._requests[identifier]
-            if now - req_time < window
-        ]
+        # Drop expired requests; timestamps are in arrival order, so only
+        # the oldest end needs checking
+        requests = self._requests[identifier]
+        while requests and now - requests[0] >= window:
+            requests.popleft()
         
         # Check limit
-        if len(self._requests[identifier]) >= limit:
+        if len(requests) >= limit:
             return False
         
         # Add current request
-        self._requests[identifier].append(now)
+        requests.append(now)
         return True
     
     def _maybe_cleanup(self, window: int) -> None:
@@ -382,12 +384,11 @@ class RateLimiter:
         # Find identifiers with no recent requests
         for identifier, requests in self._requests.items():
             # Remove old requests
-            active_requests = [t for t in requests if now - t < window]
+            while requests and now - requests[0] >= window:
+                requests.popleft()
             
-            if not active_requests:
+            if not requests:
                 expired_identifiers.append(identifier)
-            else:
-                self._requests[identifier] = active_requests
         
         # Remove expired identifiers
         for identifier in expired_identifiers:
@@ -396,7 +397,7 @@ class RateLimiter:
                 del self._first_seen[identifier]
         
         if expired_identifiers:
-            logger.debug(f"Rate limiter cleanup: removed {len(expired_identifiers)} stale entries")
+            logger.debug("Rate limiter cleanup: removed %s stale entries", len(expired_identifiers))
     
     def _maybe_evict(self) -> None:
         """Evict oldest entries if we've reached the maximum limit."""
@@ -418,8 +419,8 @@ class RateLimiter:
                 del self._first_seen[identifier]
         
         logger.warning(
-            f"Rate limiter eviction: removed {num_to_remove} oldest entries "
-            f"(max {self.MAX_ENTRIES} reached)"
+            "Rate limiter eviction: removed %s oldest entries (max %s reached)",
+            num_to_remove, self.MAX_ENTRIES,
         )
     
     def get_stats(self) -> dict:
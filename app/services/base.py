@@ -1,7 +1,9 @@
 """Base service class with common database operations."""
 
 from typing import TypeVar, Generic, Optional, Type
+from sqlalchemy import inspect
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 from app.database import Base
 from app.logging_config import get_logger
 from app.exceptions import DatabaseError
@@ -16,11 +18,20 @@ class BaseService(Generic[T]):
     Provides standardized database session handling, commit/rollback helpers,
     and logging configuration that all services can inherit.
     
+    Services are created per request, so construction only stores the
+    session; each class looks up its logger once, when it is defined.
+    
     Attributes:
         db: SQLAlchemy database session
-        logger: Logger instance for the service
+        logger: Logger instance for the service's module
     """
     
+    logger = get_logger(__name__)
+    
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.logger = get_logger(cls.__module__)
+    
     def __init__(self, db: Session):
         """Initialize the service with a database session.
         
@@ -28,7 +39,6 @@ class BaseService(Generic[T]):
             db: SQLAlchemy database session
         """
         self.db = db
-        self.logger = get_logger(self.__class__.__module__)
     
     def _commit(self) -> None:
         """Commit the current transaction.
@@ -40,15 +50,36 @@ class BaseService(Generic[T]):
             self.db.commit()
         except Exception as e:
             self._rollback()
-            self.logger.error(f"Database commit failed: {e}")
+            self.logger.error("Database commit failed: %s", e)
             raise DatabaseError(f"Database commit failed: {e}")
     
+    def _commit_keeping(self, instance: T) -> None:
+        """Commit without expiring ``instance``'s column values.
+        
+        Commit expires every instance in the session, so reading a row that
+        was just inserted would SELECT it straight back. The flushed values
+        are what the database holds, so they are restored after the commit.
+        Relationships still load lazily on first access.
+        
+        Args:
+            instance: Flushed model instance to keep loaded
+        """
+        state = inspect(instance)
+        values = {
+            attr.key: state.dict[attr.key]
+            for attr in state.mapper.column_attrs
+            if attr.key in state.dict
+        }
+        self.db.commit()
+        for key, value in values.items():
+            set_committed_value(instance, key, value)
+    
     def _rollback(self) -> None:
         """Rollback the current transaction."""
         try:
             self.db.rollback()
         except Exception as e:
-            self.logger.error(f"Database rollback failed: {e}")
+            self.logger.error("Database rollback failed: %s", e)
     
     def _add(self, instance: T) -> None:
         """Add an instance to the session.
@@ -98,6 +129,6 @@ class BaseService(Generic[T]):
             raise
         except Exception as e:
             self._rollback()
-            self.logger.error(f"Failed to save instance: {e}")
+            self.logger.error("Failed to save instance: %s", e)
             raise DatabaseError(f"Failed to save: {e}")
 
@@ -1,8 +1,13 @@
 """Notification service for sending alerts via email and SMS."""
 
-from typing import Optional
+from typing import Iterable, Optional, Tuple
+from app.exceptions import NotificationError
 from app.models import Tracker, NotificationProfile
-from app.alerts import send_email as _send_email, send_sms as _send_sms
+from app.alerts import (
+    send_email as _send_email,
+    send_sms as _send_sms,
+    send_email_batch as _send_email_batch,
+)
 from app.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -32,13 +37,7 @@ class NotificationService:
             True if notification was sent successfully, False otherwise
         """
         try:
-            sign = "decreased" if delta < 0 else "increased"
-            subject = f"Price {sign}: {tracker.name or tracker.url}"
-            body = (
-                f"The price has {sign} by ${abs(delta):.2f}\n"
-                f"Current price: ${price:.2f}\n"
-                f"URL: {tracker.url}\n"
-            )
+            subject, body = self._format_alert(tracker, price, delta)
             
             if tracker.alert_method == "email":
                 self.send_email(
@@ -54,13 +53,62 @@ class NotificationService:
                     profile=tracker.profile
                 )
             
-            logger.info(f"Sent {tracker.alert_method} notification for tracker {tracker.id}")
+            logger.info("Sent %s notification for tracker %s", tracker.alert_method, tracker.id)
             return True
             
         except Exception as e:
-            logger.error(f"Failed to send notification for tracker {tracker.id}: {e}")
+            logger.error("Failed to send notification for tracker %s: %s", tracker.id, e)
             return False
     
+    def send_price_alerts(
+        self,
+        alerts: Iterable[Tuple[Tracker, float, float]]
+    ) -> int:
+        """Send notifications for a batch of price changes.
+        
+        Email alerts sharing a notification profile are sent as one batch
+        so a sweep reuses connections and stops early if the SMTP provider
+        is down. SMS alerts are sent individually.
+        
+        Args:
+            alerts: Iterable of (tracker, price, delta) tuples
+            
+        Returns:
+            Number of notifications sent successfully
+        """
+        sent = 0
+        email_batches = {}
+        for tracker, price, delta in alerts:
+            if tracker.alert_method == "email":
+                subject, body = self._format_alert(tracker, price, delta)
+                profile = tracker.profile
+                key = profile.id if profile else None
+                email_batches.setdefault(key, (profile, []))[1].append(
+                    (tracker.contact, subject, body)
+                )
+            elif self.send_price_alert(tracker, price, delta):
+                sent += 1
+        
+        for profile, messages in email_batches.values():
+            try:
+                sent += _send_email_batch(messages, profile=profile)
+            except NotificationError as e:
+                logger.error("Email alert batch aborted: %s", e.message)
+        
+        return sent
+    
+    @staticmethod
+    def _format_alert(tracker: Tracker, price: float, delta: float) -> tuple[str, str]:
+        """Build the subject and body for a price change alert."""
+        sign = "decreased" if delta < 0 else "increased"
+        subject = f"Price {sign}: {tracker.name or tracker.url}"
+        body = (
+            f"The price has {sign} by ${abs(delta):.2f}\n"
+            f"Current price: ${price:.2f}\n"
+            f"URL: {tracker.url}\n"
+        )
+        return subject, body
+    
     def send_email(
         self,
         to_email: str,
@@ -1,7 +1,9 @@
 """Notification profile business logic service."""
 
-from typing import Optional, List
-from sqlalchemy.orm import Session
+import threading
+from datetime import datetime
+from typing import NamedTuple, Optional, List, Tuple
+from sqlalchemy import func, select
 from app.models import NotificationProfile
 from app.schemas import ProfileCreate
 from app.services.base import BaseService
@@ -9,12 +11,28 @@ from app.exceptions import ValidationError, DatabaseError
 from app.security import input_validator, encryption_service
 
 
+class ProfileOption(NamedTuple):
+    """A profile as shown in a <select>: just its id and name."""
+    id: int
+    name: str
+
+
+# Profile dropdown options shared across requests, keyed by the change
+# stamp they were loaded under so every worker sees every other's writes
+_options_lock = threading.Lock()
+_options_cache = {"stamp": None, "data": None}
+
+
+def invalidate_profile_options() -> None:
+    """Drop the cached profile options after a profile is created, edited or deleted."""
+    with _options_lock:
+        _options_cache["stamp"] = None
+        _options_cache["data"] = None
+
+
 class ProfileService(BaseService[NotificationProfile]):
     """Service for notification profile business logic."""
     
-    def __init__(self, db: Session):
-        super().__init__(db)
-    
     def create_profile(self, profile_data: ProfileCreate) -> NotificationProfile:
         """Create a new notification profile."""
         try:
@@ -41,21 +59,55 @@ class ProfileService(BaseService[NotificationProfile]):
             
             self.db.add(profile)
             self.db.commit()
+            invalidate_profile_options()
             self.db.refresh(profile)
             
-            self.logger.info(f"Created profile {profile.id}: {profile.name}")
+            self.logger.info("Created profile %s: %s", profile.id, profile.name)
             return profile
             
         except Exception as e:
             self._rollback()
-            self.logger.error(f"Failed to create profile: {e}")
+            self.logger.error("Failed to create profile: %s", e)
             raise DatabaseError(f"Failed to create profile: {e}")
     
     def get_profile(self, profile_id: int) -> Optional[NotificationProfile]:
         """Get a profile by ID."""
-        return self.db.query(NotificationProfile).filter(
-            NotificationProfile.id == profile_id
-        ).first()
+        return self.db.get(NotificationProfile, profile_id)
+    
+    def get_profile_options(
+        self, stamp: Optional[Tuple[int, Optional[datetime]]] = None
+    ) -> List[ProfileOption]:
+        """Get (id, name) pairs for profile dropdowns.
+        
+        The options are cached per process and reused while the profiles'
+        change stamp is unchanged, so a write from any worker is seen on the
+        next call.
+        
+        Args:
+            stamp: The current ``get_change_stamp()``, if the caller already
+                has it; otherwise it is queried here
+        """
+        if stamp is None:
+            stamp = self.get_change_stamp()
+        with _options_lock:
+            if _options_cache["data"] is not None and _options_cache["stamp"] == stamp:
+                return _options_cache["data"]
+        
+        rows = self.db.query(NotificationProfile.id, NotificationProfile.name).order_by(
+            NotificationProfile.created_at.desc()
+        ).all()
+        options = [ProfileOption(row.id, row.name) for row in rows]
+        
+        with _options_lock:
+            _options_cache["stamp"] = stamp
+            _options_cache["data"] = options
+        return options
+    
+    def get_change_stamp(self) -> Tuple[int, Optional[datetime]]:
+        """Return (profile count, latest ``updated_at``) for cache validation."""
+        return tuple(self.db.execute(
+            select(func.count(NotificationProfile.id), func.max(NotificationProfile.updated_at))
+        ).one())
     
     def get_all_profiles(self) -> List[NotificationProfile]:
         """Get all profiles."""
@@ -94,14 +146,15 @@ class ProfileService(BaseService[NotificationProfile]):
             
             self.db.add(profile)
             self.db.commit()
+            invalidate_profile_options()
             self.db.refresh(profile)
             
-            self.logger.info(f"Updated profile {profile.id}")
+            self.logger.info("Updated profile %s", profile.id)
             return profile
             
         except Exception as e:
             self._rollback()
-            self.logger.error(f"Failed to update profile {profile_id}: {e}")
+            self.logger.error("Failed to update profile %s: %s", profile_id, e)
             raise DatabaseError(f"Failed to update profile: {e}")
     
     def delete_profile(self, profile_id: int) -> bool:
@@ -113,13 +166,14 @@ class ProfileService(BaseService[NotificationProfile]):
         try:
             self.db.delete(profile)
             self.db.commit()
+            invalidate_profile_options()
             
-            self.logger.info(f"Deleted profile {profile_id}")
+            self.logger.info("Deleted profile %s", profile_id)
             return True
             
         except Exception as e:
             self._rollback()
-            self.logger.error(f"Failed to delete profile {profile_id}: {e}")
+            self.logger.error("Failed to delete profile %s: %s", profile_id, e)
             raise DatabaseError(f"Failed to delete profile: {e}")
     
     def get_decrypted_profile(self, profile_id: int) -> Optional[NotificationProfile]:
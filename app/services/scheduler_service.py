@@ -1,82 +1,145 @@
 """Scheduler service for background tasks."""
 
-from typing import List
-from sqlalchemy.orm import Session
-from app.models import Tracker, PriceHistory
-from app.scraper import get_price
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
+from sqlalchemy import insert
+from sqlalchemy.orm import selectinload
+from app.models import Tracker, PriceHistory, utc_now
+from app.scraper import PriceResult, get_price
 from app.services.base import BaseService
 from app.services.notification_service import notification_service
-from app.exceptions import ScrapingError
 from app.config import settings
 
 
 class SchedulerService(BaseService[Tracker]):
     """Service for scheduled background tasks."""
     
-    def __init__(self, db: Session):
-        super().__init__(db)
-    
     def poll_all_trackers(self) -> None:
-        """Poll all active trackers for price updates."""
+        """Poll all active trackers for price updates.
+
+        Pages are scraped concurrently on a bounded thread pool; the
+        results are then applied on this thread and committed once.
+        """
         try:
-            trackers = self.db.query(Tracker).filter(Tracker.is_active == True).all()
-            self.logger.info(f"Polling {len(trackers)} active trackers")
+            # Profiles are loaded up front: alerts need them after the commit
+            trackers = (
+                self.db.query(Tracker)
+                .options(selectinload(Tracker.profile))
+                .filter(Tracker.is_active == True)
+                .all()
+            )
+            self.logger.info("Polling %s active trackers", len(trackers))
             
-            for tracker in trackers:
+            alerts = []
+            history_rows: List[Dict[str, Any]] = []
+            for tracker, result in zip(trackers, self._fetch_prices(trackers)):
+                if isinstance(result, Exception):
+                    self.logger.error("Failed to poll tracker %s: %s", tracker.id, result)
+                    continue
+                staged = len(history_rows)
                 try:
-                    self._poll_tracker(tracker)
+                    alert = self._record_price(tracker, *result, history_rows=history_rows)
                 except Exception as e:
-                    self.logger.error(f"Failed to poll tracker {tracker.id}: {e}")
+                    self.logger.error("Failed to record price for tracker %s: %s", tracker.id, e)
+                    # Drop this tracker's staged changes; the rest of the sweep still commits
+                    del history_rows[staged:]
+                    self.db.expire(tracker)
                     continue
+                if alert:
+                    alerts.append(alert)
+            
+            # Keep the sweep's trackers and profiles loaded through the commit
+            # so building the alerts does not reload each one with a SELECT
+            expire_on_commit = self.db.expire_on_commit
+            self.db.expire_on_commit = False
+            try:
+                # One executemany for the whole sweep's history rows
+                if history_rows:
+                    self.db.execute(insert(PriceHistory), history_rows)
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+            finally:
+                self.db.expire_on_commit = expire_on_commit
+            
+            # Send all alerts for the sweep together so SMTP connections are shared
+            if alerts:
+                notification_service.send_price_alerts(alerts)
             
             self.logger.info("Completed polling all trackers")
             
         except Exception as e:
-            self.logger.error(f"Failed to poll trackers: {e}")
+            self.logger.error("Failed to poll trackers: %s", e)
             raise
     
-    def _poll_tracker(self, tracker: Tracker) -> None:
-        """Poll a single tracker for price updates."""
-        try:
-            price, currency, title = get_price(tracker.url, tracker.selector)
-            
-            if price is None:
-                self.logger.warning(f"No price found for tracker {tracker.id} ({tracker.url})")
-                return
-            
-            # Calculate delta
-            delta = None
-            if tracker.last_price is not None:
-                delta = round(price - tracker.last_price, 2)
-            
-            # Update if price changed
-            if tracker.last_price is None or abs(price - tracker.last_price) > 1e-6:
-                # Record price history
-                price_history = PriceHistory(
-                    tracker_id=tracker.id,
-                    price=price,
-                    delta=delta
-                )
-                self.db.add(price_history)
-                
-                # Update tracker
-                tracker.last_price = price
-                tracker.currency = tracker.currency or (currency or "USD")
-                if title and not tracker.name:
-                    tracker.name = title[:200]
-                
-                self.db.add(tracker)
-                self.db.commit()
-                
-                # Send notification if price changed significantly
-                if delta is not None and abs(delta) > 1e-6:
-                    notification_service.send_price_alert(tracker, price, delta)
-                
-                self.logger.info(f"Updated price for tracker {tracker.id}: ${price} (delta: ${delta})")
-            else:
-                self.logger.debug(f"No price change for tracker {tracker.id}")
-                
-        except Exception as e:
-            self.logger.error(f"Failed to poll tracker {tracker.id}: {e}")
-            raise ScrapingError(f"Failed to poll tracker: {e}")
+    def _fetch_prices(self, trackers: List[Tracker]) -> List[Union[PriceResult, Exception]]:
+        """Scrape every tracker's page in parallel.
+        
+        Returns:
+            One entry per tracker, in order: the ``get_price`` result or the
+            exception it raised
+        """
+        # Read attributes here; the session must not be touched from worker threads
+        targets = [(tracker.url, tracker.selector) for tracker in trackers]
+        if not targets:
+            return []
+        
+        def fetch(target: Tuple[str, Optional[str]]) -> Union[PriceResult, Exception]:
+            try:
+                return get_price(*target)
+            except Exception as e:
+                return e
+        
+        workers = max(1, min(settings.scrape_concurrency, len(targets)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pricewatch-scrape") as pool:
+            return list(pool.map(fetch, targets))
     
+    def _record_price(
+        self,
+        tracker: Tracker,
+        price: Optional[float],
+        currency: Optional[str],
+        title: Optional[str],
+        history_rows: List[Dict[str, Any]],
+    ) -> Optional[Tuple[Tracker, float, float]]:
+        """Stage a scraped price for a tracker without committing.
+        
+        Any price stamps ``last_refresh_at``; a changed price also updates
+        the tracker and appends a row for the sweep's bulk history insert
+        to ``history_rows``.
+        
+        Returns:
+            (tracker, price, delta) if a price alert should be sent, else None
+        """
+        if price is None:
+            self.logger.warning("No price found for tracker %s (%s)", tracker.id, tracker.url)
+            return None
+        
+        # Any successful scrape counts as a refresh, even if the price is unchanged
+        tracker.last_refresh_at = utc_now()
+        
+        # Calculate delta
+        delta = None
+        if tracker.last_price is not None:
+            delta = round(price - tracker.last_price, 2)
+        
+        if tracker.last_price is not None and abs(price - tracker.last_price) <= 1e-6:
+            self.logger.debug("No price change for tracker %s", tracker.id)
+            return None
+        
+        # Record price history
+        history_rows.append({"tracker_id": tracker.id, "price": price, "delta": delta})
+        
+        # Update tracker
+        tracker.last_price = price
+        tracker.currency = tracker.currency or (currency or "USD")
+        if title and not tracker.name:
+            tracker.name = title[:200]
+        
+        self.logger.info("Updated price for tracker %s: $%s (delta: $%s)", tracker.id, price, delta)
+        
+        # Queue notification if price changed significantly
+        if delta is not None and abs(delta) > 1e-6:
+            return tracker, price, delta
+        return None
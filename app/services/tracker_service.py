@@ -1,9 +1,12 @@
 """Tracker business logic service."""
 
-from typing import Optional, List, Tuple
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
-from app.models import Tracker, PriceHistory, NotificationProfile
+import itertools
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, List, Sequence, Tuple
+from sqlalchemy.orm import Session, joinedload, load_only, raiseload
+from sqlalchemy import and_, event, func, insert, or_, select, update
+from app.models import Tracker, PriceHistory, NotificationProfile, utc_now
 from app.schemas import TrackerCreate, TrackerOut
 from app.scraper import get_price
 from app.services.base import BaseService
@@ -16,17 +19,59 @@ from app.monitoring import pricewatch_scrape_errors_total
 from urllib.parse import urlparse
 
 
+# Bumped after every commit that wrote a tracker, so cached listings
+# built from an older version are known to be stale
+_listing_lock = threading.Lock()
+_listing_version = 0
+
+
+def tracker_listing_version() -> int:
+    """Return the current tracker listing version for this process."""
+    return _listing_version
+
+
+@event.listens_for(Session, "after_flush")
+def _note_tracker_writes(session: Session, flush_context) -> None:
+    changed = itertools.chain(session.new, session.dirty, session.deleted)
+    if any(isinstance(obj, Tracker) for obj in changed):
+        session.info["trackers_changed"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _note_tracker_statements(orm_execute_state) -> None:
+    # UPDATE/DELETE statements bypass the unit of work, so after_flush never sees them
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and \
+            orm_execute_state.bind_mapper is Tracker.__mapper__:
+        orm_execute_state.session.info["trackers_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_listing_version(session: Session) -> None:
+    global _listing_version
+    if session.info.pop("trackers_changed", False):
+        with _listing_lock:
+            _listing_version += 1
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_tracker_writes(session: Session) -> None:
+    session.info.pop("trackers_changed", None)
+
+
 class TrackerService(BaseService[Tracker]):
     """Service for tracker business logic."""
     
-    def __init__(self, db: Session):
-        super().__init__(db)
-    
-    def create_tracker(self, tracker_data: TrackerCreate) -> Tracker:
-        """Create a new tracker."""
+    def create_tracker(self, tracker_data: TrackerCreate, fetch_price: bool = True) -> Tracker:
+        """Create a new tracker.
+        
+        Args:
+            tracker_data: Validated tracker fields
+            fetch_price: Fetch the initial price inline; pass False when the
+                caller schedules ``fetch_initial_price`` separately
+        """
         try:
             # Validate inputs
-            if not input_validator.validate_url(str(tracker_data.url)):
+            if not input_validator.validate_url(tracker_data.url):
                 raise ValidationError("Invalid URL format")
             
             if tracker_data.alert_method == "email":
@@ -38,7 +83,7 @@ class TrackerService(BaseService[Tracker]):
             
             # Create tracker
             tracker = Tracker(
-                url=str(tracker_data.url),
+                url=tracker_data.url,
                 alert_method=tracker_data.alert_method,
                 contact=tracker_data.contact,
                 selector=tracker_data.selector,
@@ -47,84 +92,150 @@ class TrackerService(BaseService[Tracker]):
             
             # Set profile if provided
             if tracker_data.profile_id:
-                profile = self.db.query(NotificationProfile).filter(
-                    NotificationProfile.id == tracker_data.profile_id
-                ).first()
+                profile = self.db.get(NotificationProfile, tracker_data.profile_id)
                 if not profile:
                     raise ValidationError("Profile not found")
                 tracker.profile = profile
             
-            # Try to get initial price
-            try:
-                price, currency, title = get_price(tracker.url, tracker.selector)
-                tracker.currency = currency or "USD"
-                tracker.last_price = price
-                if title and not tracker.name:
-                    tracker.name = title[:200]
-            except Exception as e:
-                self.logger.warning(f"Initial price fetch failed for {tracker.url}: {e}")
+            if fetch_price:
+                self._apply_initial_price(tracker)
             
             self.db.add(tracker)
-            self.db.commit()
-            self.db.refresh(tracker)
+            # Flush to assign tracker.id so the tracker and its first
+            # history row are written in a single transaction
+            self.db.flush()
             
             # Record initial price if available
             if tracker.last_price is not None:
-                price_history = PriceHistory(
-                    tracker_id=tracker.id,
-                    price=tracker.last_price,
-                    delta=None
-                )
-                self.db.add(price_history)
-                self.db.commit()
+                self._insert_history(tracker.id, tracker.last_price)
+            # Callers read the new id and fields right away; keep them
+            # loaded instead of selecting the row back after commit
+            self._commit_keeping(tracker)
             
-            self.logger.info(f"Created tracker {tracker.id} for {tracker.url}")
+            self.logger.info("Created tracker %s for %s", tracker.id, tracker.url)
             return tracker
             
         except Exception as e:
             self._rollback()
-            self.logger.error(f"Failed to create tracker: {e}")
+            self.logger.error("Failed to create tracker: %s", e)
             raise DatabaseError(f"Failed to create tracker: {e}")
     
-    def get_tracker(self, tracker_id: int) -> Optional[Tracker]:
-        """Get a tracker by ID with profile relationship loaded."""
-        query = self.db.query(Tracker).options(
-            joinedload(Tracker.profile)
-        ).filter(Tracker.id == tracker_id)
+    def _insert_history(self, tracker_id: int, price: float, delta: Optional[float] = None) -> None:
+        """Write a price history row with a Core INSERT.
+        
+        History rows are never read back in the same session, so this skips
+        the ORM unit of work; the row commits with the session's transaction.
+        """
+        self.db.execute(
+            insert(PriceHistory), [{"tracker_id": tracker_id, "price": price, "delta": delta}]
+        )
+    
+    def _apply_initial_price(self, tracker: Tracker) -> None:
+        """Populate price, currency and a missing name from the product page."""
+        try:
+            price, currency, title = get_price(tracker.url, tracker.selector)
+            tracker.currency = currency or "USD"
+            tracker.last_price = price
+            if title and not tracker.name:
+                tracker.name = title[:200]
+        except Exception as e:
+            self.logger.warning("Initial price fetch failed for %s: %s", tracker.url, e)
+    
+    def fetch_initial_price(self, tracker_id: int) -> Optional[float]:
+        """Fetch and record the first price for a tracker created without one.
         
+        Does nothing if the tracker is gone or already has a price (e.g. the
+        scheduler polled it first).
+        
+        Returns:
+            The recorded price, or None if no price was recorded
+        """
+        tracker = self.get_tracker(tracker_id)
+        if not tracker or tracker.last_price is not None:
+            return None
+        
+        self._apply_initial_price(tracker)
+        price = tracker.last_price
+        if price is None:
+            return None
+        
+        try:
+            self._insert_history(tracker_id, price)
+            tracker.last_refresh_at = utc_now()
+            self.db.commit()
+        except Exception as e:
+            self._rollback()
+            self.logger.error("Failed to record initial price for tracker %s: %s", tracker_id, e)
+            raise DatabaseError(f"Failed to record initial price: {e}")
+        
+        self.logger.info("Recorded initial price for tracker %s: $%s", tracker_id, price)
+        return price
+    
+    def get_tracker(self, tracker_id: int, load_options: Sequence[Any] = ()) -> Optional[Tracker]:
+        """Get a tracker by ID with profile relationship loaded.
+        
+        Uses a primary-key ``get`` so a tracker already in the session's
+        identity map is returned without another SELECT.
+        
+        Args:
+            tracker_id: Tracker ID
+            load_options: Extra loader options, e.g. ``raiseload("*")``
+        """
+        execution_options = {}
         # Apply query timeout if configured
         if settings.db_query_timeout and not ("sqlite" in settings.database_url):
-            query = query.execution_options(timeout=settings.db_query_timeout)
+            execution_options["timeout"] = settings.db_query_timeout
         
-        tracker = query.first()
+        tracker = self.db.get(
+            Tracker,
+            tracker_id,
+            options=[joinedload(Tracker.profile), *load_options],
+            execution_options=execution_options,
+        )
         
         # Log query count in debug mode
         if settings.debug:
             query_count = len(self.db.identity_map)
-            get_logger(__name__).debug(f"Query returned {query_count} objects in identity map")
+            get_logger(__name__).debug("Query returned %s objects in identity map", query_count)
         
         return tracker
     
-    def get_all_trackers(self, page: int = 1, per_page: int = 100) -> Tuple[List[Tracker], int]:
+    def get_all_trackers(
+        self, page: int = 1, per_page: int = 100, listing_only: bool = False,
+        total: Optional[int] = None,
+    ) -> Tuple[List[Tracker], int]:
         """Get all trackers with pagination and profile relationship loaded.
         
         Args:
             page: Page number (1-indexed)
             per_page: Number of items per page
+            listing_only: Only load the columns shown in tracker listings
+            total: Tracker count the caller already has; skips the COUNT query
             
         Returns:
             Tuple of (trackers list, total count)
         """
         # Count total trackers
-        total_query = self.db.query(func.count(Tracker.id))
-        if settings.db_query_timeout and not ("sqlite" in settings.database_url):
-            total_query = total_query.execution_options(timeout=settings.db_query_timeout)
-        total = total_query.scalar()
+        if total is None:
+            total_query = self.db.query(func.count(Tracker.id))
+            if settings.db_query_timeout and not ("sqlite" in settings.database_url):
+                total_query = total_query.execution_options(timeout=settings.db_query_timeout)
+            total = total_query.scalar()
         
         # Get paginated trackers with profile relationship
         query = self.db.query(Tracker).options(
             joinedload(Tracker.profile)
         ).order_by(Tracker.created_at.desc())
+        if listing_only:
+            query = query.options(load_only(
+                Tracker.id, Tracker.name, Tracker.url, Tracker.last_price,
+                Tracker.profile_id, Tracker.created_at,
+                raiseload=settings.debug,
+            ))
+        if settings.debug:
+            # Fail loudly if a listing starts touching a relationship that
+            # isn't eagerly loaded, instead of silently issuing N+1 queries
+            query = query.options(raiseload("*"))
         
         # Apply query timeout if configured
         if settings.db_query_timeout and not ("sqlite" in settings.database_url):
@@ -138,22 +249,153 @@ class TrackerService(BaseService[Tracker]):
         if settings.debug:
             query_count = len(self.db.identity_map)
             get_logger(__name__).debug(
-                f"get_all_trackers: page={page}, per_page={per_page}, "
-                f"total={total}, returned={len(trackers)}, "
-                f"identity_map_size={query_count}"
+                "get_all_trackers: page=%s, per_page=%s, total=%s, returned=%s, "
+                "identity_map_size=%s",
+                page, per_page, total, len(trackers), query_count,
             )
         
         return trackers, total
     
-    def update_tracker(self, tracker_id: int, tracker_data: TrackerCreate) -> Optional[Tracker]:
-        """Update a tracker."""
+    def get_detail_stamp(
+        self, tracker_id: int
+    ) -> Optional[Tuple[Optional[datetime], Optional[datetime]]]:
+        """Return (tracker ``updated_at``, profile ``updated_at``) for cache validation.
+        
+        Only the two timestamps are selected, so a detail page answered with
+        304 builds no ORM objects.
+        
+        Returns:
+            The stamp, or None if the tracker does not exist
+        """
+        row = self.db.execute(
+            select(Tracker.updated_at, NotificationProfile.updated_at)
+            .outerjoin(NotificationProfile, Tracker.profile_id == NotificationProfile.id)
+            .where(Tracker.id == tracker_id)
+        ).first()
+        return tuple(row) if row is not None else None
+    
+    def get_dashboard_stamp(self) -> Tuple[int, Optional[datetime], int, Optional[datetime]]:
+        """Return the tracker and profile change stamps from a single query.
+        
+        The dashboard depends on both tables, so both stamps are fetched as
+        scalar subqueries in one round trip. The tracker count doubles as the
+        listing total.
+        
+        Returns:
+            Tuple of (tracker count, latest tracker ``updated_at``,
+            profile count, latest profile ``updated_at``)
+        """
+        return tuple(self.db.execute(select(
+            select(func.count(Tracker.id)).scalar_subquery(),
+            select(func.max(Tracker.updated_at)).scalar_subquery(),
+            select(func.count(NotificationProfile.id)).scalar_subquery(),
+            select(func.max(NotificationProfile.updated_at)).scalar_subquery(),
+        )).one())
+    
+    def iter_tracker_rows(self, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Yield every tracker as a plain dict of ``TrackerOut`` fields, newest first.
+        
+        Only the output columns are selected and rows are fetched in batches
+        of ``batch_size``, so no ORM objects are built and memory stays flat
+        regardless of the number of trackers.
+        """
+        columns = [getattr(Tracker, field) for field in TrackerOut.model_fields]
+        stmt = select(*columns).order_by(Tracker.created_at.desc())
+        result = self.db.execute(stmt, execution_options={"yield_per": batch_size})
+        for row in result:
+            yield row._asdict()
+    
+    def get_price_history(
+        self,
+        tracker_id: int,
+        before: Optional[datetime] = None,
+        limit: int = 100,
+        before_id: Optional[int] = None,
+        since: Optional[datetime] = None,
+    ) -> Tuple[List[PriceHistory], bool]:
+        """Get one page of a tracker's price history, newest first.
+        
+        Args:
+            tracker_id: Tracker ID
+            before: Only return entries checked strictly before this time
+            limit: Maximum number of entries to return
+            before_id: ID of the last entry already shown; entries checked at
+                exactly ``before`` with a lower ID are included, so rows sharing
+                a timestamp are not skipped across a page boundary
+            since: Only return entries checked at or after this time
+            
+        Returns:
+            Tuple of (history entries, whether older entries exist)
+        """
+        query = self.db.query(PriceHistory).filter(PriceHistory.tracker_id == tracker_id)
+        if since is not None:
+            query = query.filter(PriceHistory.checked_at >= since)
+        if before is not None and before_id is not None:
+            query = query.filter(or_(
+                PriceHistory.checked_at < before,
+                and_(PriceHistory.checked_at == before, PriceHistory.id < before_id),
+            ))
+        elif before is not None:
+            query = query.filter(PriceHistory.checked_at < before)
+        
+        # Fetch one extra row to learn whether another page exists
+        history = query.order_by(
+            PriceHistory.checked_at.desc(), PriceHistory.id.desc()
+        ).limit(limit + 1).all()
+        return history[:limit], len(history) > limit
+    
+    def get_price_overview(
+        self, tracker_id: int, since: Optional[datetime] = None
+    ) -> List[Tuple[datetime, float, float, float]]:
+        """Get a tracker's price history downsampled to hourly buckets.
+        
+        The aggregation runs in the database, so a long history returns one
+        row per hour instead of every raw price check.
+        
+        Args:
+            tracker_id: Tracker ID
+            since: Only include entries checked at or after this time
+            
+        Returns:
+            List of (hour, average, low, high) tuples, oldest first
+        """
+        if self.db.get_bind().dialect.name == "postgresql":
+            bucket = func.date_trunc("hour", PriceHistory.checked_at)
+        else:
+            bucket = func.strftime("%Y-%m-%d %H:00:00", PriceHistory.checked_at)
+        
+        stmt = select(
+            bucket.label("hour"),
+            func.avg(PriceHistory.price),
+            func.min(PriceHistory.price),
+            func.max(PriceHistory.price),
+        ).where(PriceHistory.tracker_id == tracker_id)
+        if since is not None:
+            stmt = stmt.where(PriceHistory.checked_at >= since)
+        stmt = stmt.group_by(bucket).order_by(bucket)
+        
+        return [
+            (hour if isinstance(hour, datetime) else datetime.fromisoformat(hour), avg, low, high)
+            for hour, avg, low, high in self.db.execute(stmt)
+        ]
+    
+    def update_tracker(
+        self, tracker_id: int, tracker_data: TrackerCreate, is_active: Optional[bool] = None
+    ) -> Optional[Tracker]:
+        """Update a tracker.
+        
+        Args:
+            tracker_id: Tracker ID
+            tracker_data: Validated tracker fields
+            is_active: New active flag, saved in the same commit; None leaves it unchanged
+        """
         tracker = self.get_tracker(tracker_id)
         if not tracker:
             return None
         
         try:
             # Validate inputs
-            if not input_validator.validate_url(str(tracker_data.url)):
+            if not input_validator.validate_url(tracker_data.url):
                 raise ValidationError("Invalid URL format")
             
             if tracker_data.alert_method == "email":
@@ -164,7 +406,7 @@ class TrackerService(BaseService[Tracker]):
                     raise ValidationError("Invalid phone number format")
             
             # Update tracker fields
-            tracker.url = str(tracker_data.url)
+            tracker.url = tracker_data.url
             tracker.name = tracker_data.name
             tracker.selector = tracker_data.selector
             tracker.alert_method = tracker_data.alert_method
@@ -172,27 +414,46 @@ class TrackerService(BaseService[Tracker]):
             
             # Update profile
             if tracker_data.profile_id:
-                profile = self.db.query(NotificationProfile).filter(
-                    NotificationProfile.id == tracker_data.profile_id
-                ).first()
+                profile = self.db.get(NotificationProfile, tracker_data.profile_id)
                 if not profile:
                     raise ValidationError("Profile not found")
                 tracker.profile = profile
             else:
                 tracker.profile = None
             
-            self.db.add(tracker)
+            if is_active is not None:
+                tracker.is_active = is_active
+            
             self.db.commit()
-            self.db.refresh(tracker)
             
-            self.logger.info(f"Updated tracker {tracker.id}")
+            self.logger.info("Updated tracker %s", tracker_id)
             return tracker
             
         except Exception as e:
             self._rollback()
-            self.logger.error(f"Failed to update tracker {tracker_id}: {e}")
+            self.logger.error("Failed to update tracker %s: %s", tracker_id, e)
             raise DatabaseError(f"Failed to update tracker: {e}")
     
+    def set_selector(self, tracker_id: int, selector: Optional[str]) -> bool:
+        """Set a tracker's CSS selector with a single-column UPDATE.
+        
+        The tracker is not loaded first; a copy already in the session is
+        kept in sync.
+        
+        Returns:
+            True if the tracker exists, False otherwise
+        """
+        try:
+            result = self.db.execute(
+                update(Tracker).where(Tracker.id == tracker_id).values(selector=selector)
+            )
+            self.db.commit()
+        except Exception as e:
+            self._rollback()
+            self.logger.error("Failed to set selector for tracker %s: %s", tracker_id, e)
+            raise DatabaseError(f"Failed to set selector: {e}")
+        return result.rowcount > 0
+    
     def delete_tracker(self, tracker_id: int) -> bool:
         """Delete a tracker and its price history."""
         tracker = self.get_tracker(tracker_id)
@@ -209,60 +470,65 @@ class TrackerService(BaseService[Tracker]):
             self.db.delete(tracker)
             self.db.commit()
             
-            self.logger.info(f"Deleted tracker {tracker_id}")
+            self.logger.info("Deleted tracker %s", tracker_id)
             return True
             
         except Exception as e:
             self._rollback()
-            self.logger.error(f"Failed to delete tracker {tracker_id}: {e}")
+            self.logger.error("Failed to delete tracker %s: %s", tracker_id, e)
             raise DatabaseError(f"Failed to delete tracker: {e}")
     
     def refresh_tracker_price(self, tracker_id: int) -> Tuple[Optional[float], Optional[str]]:
-        """Refresh price for a tracker."""
+        """Refresh price for a tracker.
+        
+        The page is scraped with no transaction open, so other writers are
+        not held up by the HTTP round trip; changes are then saved in one commit.
+        """
         tracker = self.get_tracker(tracker_id)
         if not tracker:
             raise ValidationError("Tracker not found")
+        url, selector = tracker.url, tracker.selector
+        # End the read transaction before the slow scrape; the tracker
+        # reloads afterwards, so the delta uses its latest price
+        self.db.commit()
         
         try:
-            price, currency, _ = get_price(tracker.url, tracker.selector)
+            price, currency, _ = get_price(url, selector)
             
             if price is None:
                 raise ScrapingError("Could not parse price from page")
             
+            # Only the refresh time changes if the price hasn't
+            if tracker.last_price is not None and abs(price - tracker.last_price) <= 1e-6:
+                tracker.last_refresh_at = utc_now()
+                self.db.commit()
+                return price, currency
+            
             # Calculate delta
             delta = None
             if tracker.last_price is not None:
                 delta = round(price - tracker.last_price, 2)
             
-            # Update tracker if price changed
-            if tracker.last_price is None or abs(price - tracker.last_price) > 1e-6:
-                # Record price history
-                price_history = PriceHistory(
-                    tracker_id=tracker.id,
-                    price=price,
-                    delta=delta
-                )
-                self.db.add(price_history)
-                
-                # Update tracker
-                tracker.last_price = price
-                tracker.currency = tracker.currency or (currency or "USD")
-                self.db.add(tracker)
-                self.db.commit()
-                
-                # Send notification if price changed significantly
-                if delta is not None and abs(delta) > 1e-6:
-                    notification_service.send_price_alert(tracker, price, delta)
-                
-                self.logger.info(f"Updated price for tracker {tracker_id}: ${price}")
+            # Record price history and update tracker
+            self._insert_history(tracker.id, price, delta)
+            tracker.last_price = price
+            tracker.currency = tracker.currency or (currency or "USD")
+            tracker.last_refresh_at = utc_now()
+            self.db.commit()
+            
+            # Send notification if price changed significantly
+            if delta is not None and abs(delta) > 1e-6:
+                notification_service.send_price_alert(tracker, price, delta)
             
+            self.logger.info("Updated price for tracker %s: $%s", tracker_id, price)
             return price, currency
             
         except Exception as e:
-            self.logger.error(f"Failed to refresh price for tracker {tracker_id}: {e}")
+            self._rollback()
+            self.logger.error("Failed to refresh price for tracker %s: %s", tracker_id, e)
             # Record scrape error metric
             try:
-                domain = urlparse(tracker.url).netloc or "unknown"
+                domain = urlparse(url).netloc or "unknown"
                 pricewatch_scrape_errors_total.labels(url_domain=domain).inc()
             except Exception:
                 pass  # Don't fail on metric recording
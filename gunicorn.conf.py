@@ -0,0 +1,46 @@
+"""Gunicorn configuration for production deployments.
+
+Runs the ASGI app on uvicorn workers, which use uvloop and httptools when
+installed (both come with ``uvicorn[standard]``). Every value can be
+overridden from the command line or the environment.
+
+Usage:
+    gunicorn app.main:app -c gunicorn.conf.py
+"""
+
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+# Workers share CSRF validation through SECRET_KEY-signed tokens. The
+# profile dropdown cache is revalidated against the database on each use;
+# the /api/trackers body cache is per process, so one worker sees another's
+# writes there only after API_CACHE_TTL.
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "uvicorn_worker.UvicornWorker"
+worker_connections = 1000
+keepalive = 5
+
+# Heartbeat files live in memory; the production container root is read-only
+worker_tmp_dir = "/dev/shm"
+
+# Per-request access logging is a measurable share of request time;
+# request counts and latency are exported on /metrics instead
+accesslog = None
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "warning")
+
+# Age of the worker that runs the polling scheduler (see SCHEDULER_LEADER)
+_leader_age = None
+
+
+def pre_fork(server, worker):
+    """Elect the new worker as scheduler leader if no live worker holds the role."""
+    global _leader_age
+    live_ages = {w.age for w in server.WORKERS.values()}
+    if _leader_age not in live_ages:
+        _leader_age = worker.age
+
+
+def post_fork(server, worker):
+    """Run the scheduler in the elected worker only, so trackers are polled once."""
+    os.environ["SCHEDULER_LEADER"] = "true" if worker.age == _leader_age else "false"
@@ -0,0 +1,33 @@
+"""Add updated_at columns
+
+Revision ID: 8f2b6d0c4e91
+Revises: 3c9e1f7a2d4b
+Create Date: 2026-10-15 23:58:37.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f2b6d0c4e91'
+down_revision: Union[str, Sequence[str], None] = '3c9e1f7a2d4b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ('notification_profiles', 'trackers'):
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(), nullable=True))
+        op.execute(f'UPDATE {table} SET updated_at = created_at')
+        op.create_index(op.f(f'ix_{table}_updated_at'), table, ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ('trackers', 'notification_profiles'):
+        op.drop_index(op.f(f'ix_{table}_updated_at'), table_name=table)
+        op.drop_column(table, 'updated_at')
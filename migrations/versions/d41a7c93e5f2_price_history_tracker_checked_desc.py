@@ -0,0 +1,38 @@
+"""Index price history in detail-page order
+
+Revision ID: d41a7c93e5f2
+Revises: 8f2b6d0c4e91
+Create Date: 2026-10-16 00:05:31.207114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41a7c93e5f2'
+down_revision: Union[str, Sequence[str], None] = '8f2b6d0c4e91'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'idx_price_history_tracker_checked_desc',
+        'price_history',
+        ['tracker_id', sa.text('checked_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+    # Superseded: the new index has the same leading columns
+    op.drop_index('idx_price_history_tracker_checked', table_name='price_history')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        'idx_price_history_tracker_checked', 'price_history', ['tracker_id', 'checked_at'], unique=False
+    )
+    op.drop_index('idx_price_history_tracker_checked_desc', table_name='price_history')
@@ -13,7 +13,7 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.main import app
-from app.database import Base, get_db
+from app.database import Base, get_db, get_engine
 from app.models import Tracker, NotificationProfile, PriceHistory
 from app.security import encryption_service
 
@@ -79,6 +79,7 @@ def client():
     
     Base.metadata.create_all(bind=engine)
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_engine] = lambda: engine
     app.dependency_overrides[verify_csrf] = bypass_csrf
     # TestClient needs to use a host that's in allowed_hosts
     with TestClient(app, base_url="http://localhost") as test_client:
@@ -281,6 +282,8 @@ def mock_smtp_server():
     sent_emails = []
     
     class MockSMTP:
+        sock = None
+        
         def __init__(self, host, port):
             self.host = host
             self.port = port
@@ -291,7 +294,16 @@ def mock_smtp_server():
         def __exit__(self, *args):
             pass
         
-        def starttls(self):
+        def starttls(self, context=None):
+            pass
+        
+        def noop(self):
+            return (250, b"OK")
+        
+        def quit(self):
+            pass
+        
+        def close(self):
             pass
         
         def login(self, user, password):
@@ -335,7 +347,7 @@ def mock_twilio_client():
             })
             return MagicMock(sid="SM123456")
     
-    with patch("app.alerts.Client", MockTwilioClient):
+    with patch("twilio.rest.Client", MockTwilioClient):
         yield sent_sms
 
 
@@ -371,6 +383,40 @@ def reset_rate_limiter():
     rate_limiter._requests = original_requests
 
 
+@pytest.fixture(autouse=True)
+def reset_alert_caches():
+    """Drop pooled connections, cached clients and decrypted credentials between tests."""
+    from app import alerts
+    alerts.close_smtp_connections()
+    alerts._twilio_clients.clear()
+    alerts._decrypt_cached.cache_clear()
+    yield
+    alerts.close_smtp_connections()
+    alerts._twilio_clients.clear()
+    alerts._decrypt_cached.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_listing_caches():
+    """Drop cached profile dropdown options and API listings between tests."""
+    from app.main import _api_trackers_cache
+    from app.services.profile_service import invalidate_profile_options
+    invalidate_profile_options()
+    _api_trackers_cache["entry"] = None
+    yield
+    invalidate_profile_options()
+    _api_trackers_cache["entry"] = None
+
+
+@pytest.fixture(autouse=True)
+def reset_health_cache():
+    """Drop the cached health check result between tests."""
+    from app.monitoring import health_checker
+    health_checker._cached = None
+    yield
+    health_checker._cached = None
+
+
 @pytest.fixture
 def clean_database(db_session):
     """Ensure database is clean before test.
@@ -14,6 +14,50 @@ class TestTrackerEndpoints:
         assert response.status_code == 303  # Redirect
         assert "/tracker/" in response.headers["location"]
     
+    def test_create_tracker_rate_limited(self, client, sample_tracker_data):
+        """Test write endpoints return 429 once the per-client limit is used up."""
+        from unittest.mock import patch
+        
+        with patch("app.main.rate_limiter.is_allowed", return_value=False):
+            response = client.post("/trackers", data=sample_tracker_data, follow_redirects=False)
+        
+        assert response.status_code == 429
+    
+    def test_rate_limit_uses_redis_when_configured(self, client, sample_tracker_data):
+        """Test the shared Redis limiter replaces the in-process one once initialized."""
+        from unittest.mock import AsyncMock, patch
+        from fastapi_limiter import FastAPILimiter
+        
+        with patch.object(FastAPILimiter, "redis", object()), \
+                patch("app.main._redis_rate_limiter", new_callable=AsyncMock) as mock_redis_limiter, \
+                patch("app.main.rate_limiter.is_allowed") as mock_local:
+            response = client.post("/trackers", data=sample_tracker_data, follow_redirects=False)
+        
+        assert response.status_code == 303
+        mock_redis_limiter.assert_awaited_once()
+        mock_local.assert_not_called()
+    
+    def test_redis_rate_limit_shares_one_window_per_client(
+        self, client, sample_tracker, sample_tracker_data
+    ):
+        """Test every write endpoint counts against the same Redis key for a client."""
+        from unittest.mock import AsyncMock, MagicMock, patch
+        from fastapi_limiter import FastAPILimiter
+        
+        redis = MagicMock()
+        redis.evalsha = AsyncMock(return_value=0)
+        with patch.object(FastAPILimiter, "redis", redis), \
+                patch.object(FastAPILimiter, "prefix", "pricewatch"):
+            client.post("/trackers", data=sample_tracker_data, follow_redirects=False)
+            client.post(
+                f"/tracker/{sample_tracker.id}/edit",
+                data={**sample_tracker_data, "csrf_token": "test_token"},
+                follow_redirects=False,
+            )
+        
+        keys = [call.args[2] for call in redis.evalsha.await_args_list]
+        assert keys == ["pricewatch:testclient:writes"] * 2
+    
     def test_create_tracker_invalid_data(self, client):
         """Test tracker creation with invalid data."""
         invalid_data = {
@@ -33,6 +77,59 @@ class TestTrackerEndpoints:
         assert response.status_code == 200
         assert "Test Product" in response.text
     
+    def test_get_tracker_detail_paginates_history(self, client, db_session, sample_tracker):
+        """Test tracker detail shows one page of history with a load-older link."""
+        from datetime import datetime, timedelta
+        from html import unescape
+        from urllib.parse import unquote
+        from app.main import HISTORY_PAGE_SIZE
+        from app.models import PriceHistory
+        
+        start = datetime(2024, 1, 1)
+        for i in range(HISTORY_PAGE_SIZE + 1):
+            db_session.add(PriceHistory(
+                tracker_id=sample_tracker.id,
+                price=100.0 + i,
+                checked_at=start + timedelta(minutes=i),
+            ))
+        db_session.commit()
+        
+        response = client.get(f"/tracker/{sample_tracker.id}")
+        assert response.status_code == 200
+        assert "$200.00" in response.text
+        assert "$100.00" not in response.text
+        
+        marker = f'href="/tracker/{sample_tracker.id}?before='
+        assert marker in response.text
+        cursor = unescape(response.text.split(marker, 1)[1].split('"', 1)[0])
+        
+        response = client.get(f"/tracker/{sample_tracker.id}?before={unquote(cursor)}")
+        assert response.status_code == 200
+        assert "$100.00" in response.text
+        assert "$200.00" not in response.text
+        assert marker not in response.text
+    
+    def test_get_tracker_detail_days_window(self, client, db_session, sample_tracker):
+        """Test ?days= limits the history and the overview to recent checks."""
+        from datetime import timedelta
+        from app.models import PriceHistory, utc_now
+        
+        now = utc_now().replace(tzinfo=None)
+        db_session.add_all([
+            PriceHistory(tracker_id=sample_tracker.id, price=42.0, checked_at=now - timedelta(days=60)),
+            PriceHistory(tracker_id=sample_tracker.id, price=10.0, checked_at=now - timedelta(hours=1)),
+            PriceHistory(tracker_id=sample_tracker.id, price=20.0, checked_at=now - timedelta(hours=1)),
+        ])
+        db_session.commit()
+        
+        response = client.get(f"/tracker/{sample_tracker.id}?days=7")
+        assert response.status_code == 200
+        assert "$42.00" not in response.text
+        assert "$15.00" in response.text  # hourly average
+        
+        assert "$42.00" in client.get(f"/tracker/{sample_tracker.id}").text
+        assert client.get(f"/tracker/{sample_tracker.id}?days=0").status_code == 422
+    
     def test_get_tracker_not_found(self, client):
         """Test getting non-existent tracker."""
         response = client.get("/tracker/999")
@@ -63,6 +160,28 @@ class TestProfileEndpoints:
         assert response.status_code == 303  # Redirect
         assert response.headers["location"] == "/admin/profiles"
     
+    def test_create_profile_blank_optional_fields(self, client, db_session):
+        """Test blank optional form fields are stored as NULL."""
+        from app.models import NotificationProfile
+        
+        response = client.post(
+            "/admin/profiles/new",
+            data={"name": "Blank Fields", "email_from": "", "smtp_port": "0"},
+            follow_redirects=False,
+        )
+        
+        assert response.status_code == 303
+        profile = db_session.query(NotificationProfile).filter_by(name="Blank Fields").one()
+        assert profile.email_from is None
+        assert profile.smtp_port is None
+        assert profile.smtp_pass is None
+    
+    def test_create_profile_requires_name(self, client):
+        """Test the profile form still rejects a missing name."""
+        response = client.post("/admin/profiles/new", data={"email_from": ""})
+        
+        assert response.status_code == 422
+    
     def test_get_profiles_list(self, client, sample_profile):
         """Test getting profiles list."""
         response = client.get("/admin/profiles")
@@ -118,6 +237,29 @@ class TestAPIEndpoints:
         assert data["status"] == "healthy"
         assert "version" in data
     
+    def test_json_endpoints_use_orjson_response(self, client):
+        """Test the app encodes JSON with orjson when it is installed."""
+        pytest.importorskip("orjson")
+        from fastapi.responses import ORJSONResponse
+        from app.main import app
+        
+        assert app.router.default_response_class is ORJSONResponse
+        
+        response = client.get("/health/detailed")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+    
+    def test_detailed_health_unhealthy_returns_503(self, client):
+        """Test an unhealthy detailed check is reported with a 503 status."""
+        from unittest.mock import patch
+        from app.monitoring import HealthChecker
+        
+        with patch.object(HealthChecker, "check_database", return_value={"status": "unhealthy"}):
+            response = client.get("/health/detailed")
+        
+        assert response.status_code == 503
+        assert response.json()["overall_status"] == "unhealthy"
+    
     def test_api_trackers(self, client, sample_tracker):
         """Test API trackers endpoint."""
         response = client.get("/api/trackers")
@@ -127,6 +269,486 @@ class TestAPIEndpoints:
         assert len(data) == 1
         assert data[0]["url"] == sample_tracker.url
     
+    def test_api_trackers_streams_tracker_out_rows(self, client, sample_tracker):
+        """Test the streamed rows match the TrackerOut schema."""
+        from app.schemas import TrackerOut
+        
+        response = client.get("/api/trackers")
+        
+        assert response.headers["content-type"] == "application/json"
+        row = response.json()[0]
+        assert set(row) == set(TrackerOut.model_fields)
+        assert TrackerOut.model_validate(row).id == sample_tracker.id
+    
+    def test_templates_precompiled_at_startup(self, client):
+        """Test startup compiles every template and disables reload checks."""
+        from app.main import templates
+        
+        names = templates.env.list_templates(extensions=["html"])
+        cached = {key[1] for key in templates.env.cache}
+        
+        assert set(names) <= cached
+        assert templates.env.auto_reload is False
+    
+    def test_pages_render_without_template_response(self, client, sample_tracker, sample_profile):
+        """Test pages render compiled templates directly, not via TemplateResponse."""
+        from unittest.mock import patch
+        from fastapi.templating import Jinja2Templates
+        
+        with patch.object(Jinja2Templates, "TemplateResponse") as mock_template_response:
+            for url in ("/", f"/tracker/{sample_tracker.id}", f"/tracker/{sample_tracker.id}/edit",
+                        "/admin/profiles", "/admin/profiles/new", f"/admin/profiles/{sample_profile.id}/edit"):
+                response = client.get(url)
+                assert response.status_code == 200, url
+                assert response.headers["content-type"].startswith("text/html")
+        
+        mock_template_response.assert_not_called()
+    
+    def test_templates_autoescape(self, client, db_session):
+        """Test user-supplied values are HTML-escaped in rendered pages."""
+        from app.models import Tracker
+        
+        db_session.add(Tracker(
+            url="https://example.com/x",
+            name="<script>alert(1)</script>",
+            alert_method="email",
+            contact="test@example.com",
+        ))
+        db_session.commit()
+        
+        response = client.get("/")
+        
+        assert "<script>alert(1)</script>" not in response.text
+        assert "&lt;script&gt;" in response.text
+    
+    def test_startup_skips_create_all_when_disabled(self):
+        """Test AUTO_CREATE_TABLES=false leaves schema creation to migrations."""
+        from unittest.mock import patch
+        from app.config import settings
+        from app.main import app
+        
+        with patch.object(settings, "auto_create_tables", False), \
+                patch("app.main.Base.metadata.create_all") as mock_create_all, \
+                patch("app.main.start_scheduler"):
+            with TestClient(app, base_url="http://localhost"):
+                pass
+        
+        mock_create_all.assert_not_called()
+    
+    def test_startup_warns_without_uvloop_in_production(self):
+        """Test production startup reports a fallback to the asyncio event loop."""
+        from unittest.mock import patch
+        from app.config import settings
+        from app.main import app
+        
+        with patch.object(settings, "environment", "production"), \
+                patch("app.main.start_scheduler"), \
+                patch("app.main.logger") as mock_logger:
+            with TestClient(app, base_url="http://localhost"):
+                pass
+        
+        mock_logger.warning.assert_called_once()
+        assert mock_logger.warning.call_args.args[1].startswith("asyncio")
+    
+    def test_startup_warms_request_metric_children(self):
+        """Test route label children are created before the first request."""
+        from unittest.mock import patch
+        from app.config import settings
+        from fastapi.routing import APIRoute
+        from app.main import app, _request_counter
+        
+        _request_counter.cache_clear()
+        with patch.object(settings, "enable_metrics", True), \
+                patch("app.main.start_scheduler"):
+            with TestClient(app, base_url="http://localhost"):
+                warmed = _request_counter.cache_info().currsize
+                hits = _request_counter.cache_info().hits
+                _request_counter("GET", "/tracker/{tracker_id}", 200)
+                _request_counter("POST", "/trackers", 303)
+                assert _request_counter.cache_info().hits == hits + 2
+                _request_counter("POST", "/trackers", 200)
+                assert _request_counter.cache_info().hits == hits + 2
+        
+        routes = [
+            route for route in app.routes
+            if isinstance(route, APIRoute) and route.path != "/metrics"
+        ]
+        gets = sum("GET" in route.methods for route in routes)
+        posts = sum("POST" in route.methods for route in routes)
+        assert warmed == 2 * gets + posts
+    
+    def test_scheduler_runs_only_on_leader(self):
+        """Test non-leader workers skip the scheduler and the leader stops it on shutdown."""
+        from unittest.mock import patch
+        from app.config import settings
+        from app.main import app
+        
+        with patch.object(settings, "scheduler_leader", False), \
+                patch("app.main.start_scheduler") as mock_start:
+            with TestClient(app, base_url="http://localhost"):
+                pass
+        mock_start.assert_not_called()
+        
+        with patch.object(settings, "scheduler_leader", True), \
+                patch("app.main.start_scheduler") as mock_start:
+            with TestClient(app, base_url="http://localhost"):
+                pass
+        mock_start.return_value.shutdown.assert_called_once_with(wait=False)
+    
+    def test_api_trackers_without_orjson(self, client, sample_tracker, monkeypatch):
+        """Test the pydantic-core fallback encoder produces the same rows."""
+        import app.main
+        
+        expected = client.get("/api/trackers").json()
+        monkeypatch.setattr(app.main, "orjson", None)
+        app.main._api_trackers_cache["entry"] = None
+        
+        assert client.get("/api/trackers").json() == expected
+    
+    def test_api_trackers_cached_until_tracker_changes(self, client, db_session, sample_tracker):
+        """Test the encoded listing is reused until a tracker is written."""
+        from unittest.mock import patch
+        from app.services.tracker_service import TrackerService
+        
+        first = client.get("/api/trackers")
+        with patch.object(TrackerService, "iter_tracker_rows") as mock_rows:
+            cached = client.get("/api/trackers")
+        mock_rows.assert_not_called()
+        assert cached.content == first.content
+        
+        sample_tracker.name = "Renamed"
+        db_session.commit()
+        
+        assert client.get("/api/trackers").json()[0]["name"] == "Renamed"
+    
+    def test_api_trackers_cache_invalidated_by_write_endpoints(self, client, sample_tracker):
+        """Test every tracker write endpoint invalidates the cached listing."""
+        from unittest.mock import patch
+        
+        tracker_id = sample_tracker.id
+        form = {
+            "url": "https://example.com/edited",
+            "alert_method": "email",
+            "contact": "edited@example.com",
+            "csrf_token": "test_token",
+        }
+        
+        def listing() -> list:
+            return client.get("/api/trackers").json()
+        
+        listing()
+        with patch('app.services.tracker_service.get_price', return_value=(12.34, "USD", "Product")):
+            client.post("/trackers", data={**form, "url": "https://example.com/new"})
+            assert len(listing()) == 2
+            
+            client.post(f"/tracker/{tracker_id}/edit", data=form)
+            assert {"https://example.com/edited"} <= {row["url"] for row in listing()}
+            
+            client.post(f"/tracker/{tracker_id}/selector", data={"selector": ".sale", "csrf_token": "test_token"})
+            assert {row["last_price"] for row in listing() if row["id"] == tracker_id} == {12.34}
+        
+        client.post(f"/tracker/{tracker_id}/delete", data={"csrf_token": "test_token"})
+        assert tracker_id not in {row["id"] for row in listing()}
+    
+    def test_api_trackers_not_modified(self, client, sample_tracker):
+        """Test a cached listing answers a matching If-None-Match with 304."""
+        client.get("/api/trackers")
+        cached = client.get("/api/trackers")
+        etag = cached.headers["ETag"]
+        assert cached.headers["Cache-Control"] == "private, no-cache"
+        
+        response = client.get("/api/trackers", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+    
+    def test_pages_not_modified_until_data_changes(self, client, db_session, sample_tracker, sample_profile):
+        """Test HTML pages answer 304 for their current ETag and re-render after writes."""
+        for url in ("/", f"/tracker/{sample_tracker.id}", "/admin/profiles"):
+            first = client.get(url)
+            etag = first.headers["ETag"]
+            not_modified = client.get(url, headers={"If-None-Match": etag})
+            assert not_modified.status_code == 304
+            assert not_modified.content == b""
+            assert not_modified.headers["ETag"] == etag
+            assert not_modified.headers["Cache-Control"] == first.headers["Cache-Control"]
+            assert etag.startswith('W/"')
+            assert client.get(url, headers={"If-None-Match": f'"other", {etag}'}).status_code == 304
+            assert client.get(url, headers={"If-None-Match": etag.removeprefix("W/")}).status_code == 304
+        
+        index_etag = client.get("/").headers["ETag"]
+        profiles_etag = client.get("/admin/profiles").headers["ETag"]
+        sample_profile.name = "Renamed"
+        db_session.commit()
+        
+        assert client.get("/", headers={"If-None-Match": index_etag}).status_code == 200
+        assert client.get("/admin/profiles", headers={"If-None-Match": profiles_etag}).status_code == 200
+    
+    def test_middleware_headers_and_metrics(self, client, sample_tracker, monkeypatch):
+        """Test every response carries the request ID, security and cache headers and is counted."""
+        from app.config import settings
+        from app.monitoring import pricewatch_requests_total
+        
+        monkeypatch.setattr(settings, "enable_metrics", True)
+        counter = pricewatch_requests_total.labels(method="GET", endpoint="/tracker/{tracker_id}", status=200)
+        before = counter._value.get()
+        
+        response = client.get(f"/tracker/{sample_tracker.id}")
+        assert response.status_code == 200
+        assert len(response.headers["X-Request-ID"]) == 32
+        assert response.headers["X-Frame-Options"] == "DENY"
+        assert "frame-ancestors 'none'" in response.headers["Content-Security-Policy-Report-Only"]
+        assert response.headers["Cache-Control"] == "private, max-age=5, must-revalidate"
+        assert counter._value.get() == before + 1
+        
+        health = client.get("/health")
+        assert health.headers["Cache-Control"] == "no-cache, no-store, must-revalidate"
+        assert health.headers["X-Request-ID"] != response.headers["X-Request-ID"]
+        
+        monkeypatch.setattr(settings, "enable_metrics", False)
+        assert client.get(f"/tracker/{sample_tracker.id}").headers["X-Frame-Options"] == "DENY"
+        assert counter._value.get() == before + 1
+    
+    def test_metrics_labelled_by_route_template(self, client, sample_tracker, monkeypatch):
+        """Test request metrics use route templates and a fixed label for unknown paths."""
+        from app.config import settings
+        from app.monitoring import pricewatch_requests_total
+        
+        monkeypatch.setattr(settings, "enable_metrics", True)
+        
+        def count(endpoint: str, status: int) -> float:
+            return pricewatch_requests_total.labels(method="GET", endpoint=endpoint, status=status)._value.get()
+        
+        edit, missing = count("/tracker/{tracker_id}/edit", 200), count("unmatched", 404)
+        
+        assert client.get(f"/tracker/{sample_tracker.id}/edit").status_code == 200
+        assert client.get("/no-such-page-123").status_code == 404
+        
+        assert count("/tracker/{tracker_id}/edit", 200) == edit + 1
+        assert count("unmatched", 404) == missing + 1
+        assert count("/no-such-page-123", 404) == 0
+    
+    def test_large_responses_are_gzipped(self, client, sample_tracker):
+        """Test pages are compressed for clients that accept gzip, small bodies are not."""
+        page = client.get("/", headers={"Accept-Encoding": "gzip"})
+        assert page.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in page.headers["Vary"]
+        assert "<html" in page.text
+        
+        assert "Content-Encoding" not in client.get("/", headers={"Accept-Encoding": "identity"}).headers
+        assert "Content-Encoding" not in client.get("/health", headers={"Accept-Encoding": "gzip"}).headers
+    
+    def test_tracker_detail_not_modified_skips_history_query(self, client, db_session, sample_tracker):
+        """Test a 304 is decided before the tracker or its history is loaded."""
+        from unittest.mock import patch
+        from app.services.tracker_service import TrackerService
+        
+        etag = client.get(f"/tracker/{sample_tracker.id}").headers["ETag"]
+        
+        with patch.object(TrackerService, "get_price_history") as mock_history, \
+                patch.object(TrackerService, "get_tracker") as mock_tracker:
+            response = client.get(f"/tracker/{sample_tracker.id}", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        mock_history.assert_not_called()
+        mock_tracker.assert_not_called()
+        
+        sample_tracker.last_price = 1.23
+        db_session.commit()
+        
+        response = client.get(f"/tracker/{sample_tracker.id}", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+    
+    def test_api_trackers_skips_response_model_validation(self, client, sample_tracker):
+        """Test the listing bypasses FastAPI's response_model serialize/validate pass."""
+        from unittest.mock import patch
+        import fastapi.routing
+        
+        with patch.object(fastapi.routing, "serialize_response", wraps=fastapi.routing.serialize_response) as mock_serialize:
+            response = client.get("/api/trackers")
+        
+        assert response.status_code == 200
+        assert response.json()[0]["id"] == sample_tracker.id
+        mock_serialize.assert_not_called()
+    
+    def test_api_trackers_empty(self, client, db_session):
+        """Test the API returns an empty JSON array with no trackers."""
+        response = client.get("/api/trackers")
+        
+        assert response.status_code == 200
+        assert response.json() == []
+    
+    def test_index_paginates_trackers(self, client, db_session):
+        """Test the home page shows one page of trackers with navigation."""
+        from app.main import INDEX_PAGE_SIZE
+        from app.models import Tracker
+        
+        for i in range(INDEX_PAGE_SIZE + 1):
+            db_session.add(Tracker(
+                url=f"https://example.com/p{i}",
+                alert_method="email",
+                contact="test@example.com",
+            ))
+        db_session.commit()
+        
+        response = client.get("/")
+        assert response.status_code == 200
+        assert 'href="/?page=2"' in response.text
+        
+        response = client.get("/?page=2")
+        assert response.status_code == 200
+        assert response.text.count('href="/tracker/') // 2 == 1
+        assert 'href="/?page=1"' in response.text
+    
+    def test_index_query_count_independent_of_tracker_count(self, client, db_session, sample_profile):
+        """Test the home page does not lazy-load each tracker's profile."""
+        from sqlalchemy import event
+        from app.models import Tracker
+        from app.services.profile_service import invalidate_profile_options
+        
+        def count_index_queries() -> int:
+            invalidate_profile_options()
+            statements = []
+            
+            def record(conn, cursor, statement, parameters, context, executemany):
+                statements.append(statement)
+            
+            engine = db_session.get_bind()
+            event.listen(engine, "before_cursor_execute", record)
+            try:
+                assert client.get("/").status_code == 200
+            finally:
+                event.remove(engine, "before_cursor_execute", record)
+            return len(statements)
+        
+        def add_trackers(count: int) -> None:
+            for i in range(count):
+                db_session.add(Tracker(
+                    url=f"https://example.com/n{count}-{i}",
+                    alert_method="email",
+                    contact="test@example.com",
+                    profile_id=sample_profile.id,
+                ))
+            db_session.commit()
+        
+        add_trackers(2)
+        few = count_index_queries()
+        add_trackers(20)
+        
+        assert count_index_queries() == few
+    
+    def test_index_runs_stamp_and_listing_queries_only(self, client, db_session, sample_tracker, sample_profile):
+        """Test the home page is one stamp query plus the listing, and a 304 only the stamp."""
+        from sqlalchemy import event
+        
+        etag = client.get("/").headers["ETag"]
+        statements = []
+        
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("SELECT"):
+                statements.append(statement)
+        
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            response = client.get("/")
+            assert response.status_code == 200
+            assert len(statements) == 2
+            assert "Existing Trackers (1)" in response.text
+            
+            statements.clear()
+            assert client.get("/", headers={"If-None-Match": etag}).status_code == 304
+            assert len(statements) == 1
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+    
+    def test_page_etag_rolls_over_every_half_token_lifetime(self):
+        """Test a page revalidated by 304 never carries a token older than half its lifetime."""
+        from unittest.mock import patch
+        from app.csrf import CSRF_TOKEN_EXPIRY
+        from app.main import _page_etag
+        
+        with patch("app.main.time.time", return_value=0.0):
+            first = _page_etag("index")
+        with patch("app.main.time.time", return_value=CSRF_TOKEN_EXPIRY / 2):
+            assert _page_etag("index") != first
+    
+    def test_tracker_detail_etag_varies_with_queued(self, client, sample_tracker):
+        """Test the queued-refresh variant of the page is not revalidated by the plain one."""
+        etag = client.get(f"/tracker/{sample_tracker.id}").headers["ETag"]
+        
+        response = client.get(
+            f"/tracker/{sample_tracker.id}?queued=1", headers={"If-None-Match": etag}
+        )
+        
+        assert response.status_code == 200
+        assert 'id="refresh-status"' in response.text
+    
+    def test_index_profile_options_match_etag_stamp(self, client, db_session, sample_profile):
+        """Test a profile change from another worker is rendered under the new ETag."""
+        from unittest.mock import patch
+        
+        old_etag = client.get("/").headers["ETag"]
+        
+        # Another worker's write: the row changes, this process's cache is not told
+        with patch("app.services.profile_service.invalidate_profile_options"):
+            sample_profile.name = "Renamed Elsewhere"
+            db_session.commit()
+        
+        response = client.get("/", headers={"If-None-Match": old_etag})
+        
+        assert response.status_code == 200
+        assert "Renamed Elsewhere" in response.text
+    
+    def test_tracker_detail_has_no_lazy_loads(self, client, db_session, sample_tracker, sample_profile):
+        """Test the detail page renders with lazy relationship loads forbidden."""
+        from unittest.mock import patch
+        from app.config import settings
+        
+        sample_tracker.profile_id = sample_profile.id
+        db_session.commit()
+        tracker_id, profile_name = sample_tracker.id, sample_profile.name
+        # Start from an empty identity map so the page loads the tracker itself
+        db_session.expunge_all()
+        
+        with patch.object(settings, "debug", True):
+            response = client.get(f"/tracker/{tracker_id}")
+        
+        assert response.status_code == 200
+        assert profile_name in response.text
+    
+    def test_tracker_edit_uses_cached_profile_options(self, client, db_session, sample_tracker, sample_profile):
+        """Test the edit form revalidates the shared options cache instead of reloading it."""
+        from sqlalchemy import event
+        
+        sample_tracker.profile_id = sample_profile.id
+        db_session.commit()
+        client.get(f"/tracker/{sample_tracker.id}/edit")
+        
+        statements = []
+        
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            response = client.get(f"/tracker/{sample_tracker.id}/edit")
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        
+        assert response.status_code == 200
+        assert f'<option value="{sample_profile.id}" selected>' in response.text
+        selects = [statement for statement in statements if statement.startswith("SELECT")]
+        # Only the change stamp touches the profiles table; the rows are not re-read
+        assert selects
+        assert not any("notification_profiles.name" in statement for statement in selects)
+    
+    def test_index_rejects_invalid_page(self, client):
+        """Test the home page rejects non-positive page numbers."""
+        response = client.get("/?page=0")
+        
+        assert response.status_code == 422
+    
     def test_tracker_edit_form(self, client, sample_tracker):
         """Test getting tracker edit form."""
         response = client.get(f"/tracker/{sample_tracker.id}/edit")
@@ -183,6 +805,7 @@ class TestAPIEndpoints:
             )
             
             assert response.status_code == 303
+            assert response.headers["location"].endswith("?queued=1")
             mock_get_price.assert_called()
     
     def test_tracker_set_selector(self, client, sample_tracker):
@@ -195,6 +818,16 @@ class TestAPIEndpoints:
         
         assert response.status_code == 303
     
+    def test_tracker_set_selector_not_found(self, client):
+        """Test setting the selector of an unknown tracker returns 404."""
+        response = client.post(
+            "/tracker/99999/selector",
+            data={"selector": ".new-price", "csrf_token": "test_token"},
+            follow_redirects=False
+        )
+        
+        assert response.status_code == 404
+    
     def test_tracker_refresh(self, client, sample_tracker):
         """Test refreshing tracker price."""
         from unittest.mock import patch
@@ -209,4 +842,109 @@ class TestAPIEndpoints:
             )
             
             assert response.status_code == 303
-            assert f"/tracker/{sample_tracker.id}" in response.headers["location"]
+            assert response.headers["location"] == f"/tracker/{sample_tracker.id}?queued=1"
+    
+    def test_tracker_refresh_runs_after_response(self, client, sample_tracker):
+        """Test the scrape is queued as a background task and reported by the status endpoint."""
+        from unittest.mock import patch
+        
+        assert client.get(f"/tracker/{sample_tracker.id}/status").json()["last_refresh_at"] is None
+        
+        with patch('app.main.BackgroundTasks.add_task') as mock_add_task:
+            response = client.post(
+                f"/tracker/{sample_tracker.id}/refresh",
+                data={"csrf_token": "test_token"},
+                follow_redirects=False
+            )
+        
+        assert response.status_code == 303
+        mock_add_task.assert_called_once()
+        assert mock_add_task.call_args.args[1] == sample_tracker.id
+        
+        # TestClient runs background tasks before returning the response
+        with patch('app.services.tracker_service.get_price', return_value=(79.99, "USD", "Updated")):
+            client.post(f"/tracker/{sample_tracker.id}/refresh", data={"csrf_token": "test_token"})
+        
+        status = client.get(f"/tracker/{sample_tracker.id}/status").json()
+        assert status["last_price"] == 79.99
+        assert status["last_refresh_at"] is not None
+    
+    def test_tracker_status_not_found(self, client):
+        """Test the status endpoint returns 404 for unknown trackers."""
+        assert client.get("/tracker/99999/status").status_code == 404
+    
+    def test_json_endpoints_skip_response_serialization(self, client, sample_tracker):
+        """Test JSON endpoints return finished responses instead of re-encoded values."""
+        from unittest.mock import patch
+        
+        with patch("fastapi.routing.serialize_response") as mock_serialize:
+            status_response = client.get(f"/tracker/{sample_tracker.id}/status")
+            assert client.get("/api/trackers").status_code == 200
+            assert client.get("/health/detailed").status_code in (200, 503)
+        
+        mock_serialize.assert_not_called()
+        assert status_response.json()["id"] == sample_tracker.id
+        assert "TrackerOut" in client.get("/openapi.json").text
+    
+    def test_tracker_refresh_scrapes_off_event_loop(self, client, sample_tracker):
+        """Test the blocking scrape runs in a worker thread, not on the event loop."""
+        import asyncio
+        from unittest.mock import patch
+        
+        def fake_get_price(url, selector):
+            with pytest.raises(RuntimeError):
+                asyncio.get_running_loop()
+            return (79.99, "USD", "Updated")
+        
+        with patch('app.services.tracker_service.get_price', side_effect=fake_get_price) as mock_get_price:
+            response = client.post(
+                f"/tracker/{sample_tracker.id}/refresh",
+                data={"csrf_token": "test_token"},
+                follow_redirects=False
+            )
+        
+        assert response.status_code == 303
+        assert "error" not in response.headers["location"]
+        mock_get_price.assert_called_once()
+    
+    def test_hot_read_endpoints_skip_get_db(self, client, sample_tracker, sample_profile):
+        """Test read endpoints scope their own session instead of using get_db."""
+        from app.database import get_db
+        from app.main import app
+        
+        def unused_get_db():
+            raise AssertionError("get_db should not be resolved")
+            yield
+        
+        app.dependency_overrides[get_db] = unused_get_db
+        for url in ("/", f"/tracker/{sample_tracker.id}", f"/tracker/{sample_tracker.id}/status",
+                    "/admin/profiles", "/api/trackers", f"/tracker/{sample_tracker.id}/edit",
+                    f"/admin/profiles/{sample_profile.id}/edit"):
+            assert client.get(url).status_code == 200, url
+    
+    def test_read_pages_query_off_event_loop(self, client, sample_tracker, sample_profile):
+        """Test the async read pages run their queries in a worker thread."""
+        import asyncio
+        from unittest.mock import patch
+        from app.services.profile_service import ProfileService
+        from app.services.tracker_service import TrackerService
+        
+        loops = []
+        
+        def recording(original):
+            def wrapper(*args, **kwargs):
+                try:
+                    loops.append(asyncio.get_running_loop())
+                except RuntimeError:
+                    loops.append(None)
+                return original(*args, **kwargs)
+            return wrapper
+        
+        with patch.object(TrackerService, "get_all_trackers", recording(TrackerService.get_all_trackers)), \
+                patch.object(TrackerService, "get_price_history", recording(TrackerService.get_price_history)), \
+                patch.object(ProfileService, "get_all_profiles", recording(ProfileService.get_all_profiles)):
+            assert client.get("/").status_code == 200
+            assert client.get(f"/tracker/{sample_tracker.id}").status_code == 200
+            assert client.get("/admin/profiles").status_code == 200
+        
+        assert loops == [None, None, None]
@@ -17,6 +17,14 @@ class TestBaseService:
         assert service.db == db_session
         assert service.logger is not None
     
+    def test_logger_resolved_per_class(self, db_session):
+        """Test subclasses get their module's logger without a per-instance lookup."""
+        from app.services.tracker_service import TrackerService
+        
+        service = TrackerService(db_session)
+        assert service.logger.name == "app.app.services.tracker_service"
+        assert "logger" not in vars(service)
+    
     def test_commit_success(self, db_session):
         """Test successful commit."""
         service = BaseService(db_session)
@@ -16,53 +16,51 @@ class TestCSRFTokenManagerExtended:
         mock_request = MagicMock()
         mock_request.session = {}
         
-        # Generate token
-        token = manager.generate_token(mock_request)
-        
-        # Manually expire it
-        old_time = manager._tokens[token][1]
-        manager._tokens[token] = (manager._tokens[token][0], old_time - 4000)  # Expired
+        # Generate token over an hour ago
+        with patch("app.csrf.time.time", return_value=time.time() - 4000):
+            token = manager.generate_token(mock_request)
         
         # Should fail validation
         result = manager.validate_token(token, mock_request)
         assert result is False
     
-    def test_invalidate_token(self):
-        """Test token invalidation."""
-        manager = CSRFTokenManager()
+    def test_token_from_another_process_validates(self):
+        """Test a token issued by one worker validates in another with the same secret."""
         mock_request = MagicMock()
         mock_request.session = {}
         
-        token = manager.generate_token(mock_request)
-        assert token in manager._tokens
+        token = CSRFTokenManager().generate_token(mock_request)
         
-        manager.invalidate_token(token)
-        assert token not in manager._tokens
+        assert CSRFTokenManager().validate_token(token, mock_request) is True
+        assert CSRFTokenManager(secret="x" * 64).validate_token(token, mock_request) is False
     
-    def test_cleanup_expired_tokens(self):
-        """Test cleanup of expired tokens."""
+    def test_tampered_token_rejected(self):
+        """Test changing the issue time or signature invalidates a token."""
         manager = CSRFTokenManager()
         mock_request = MagicMock()
         mock_request.session = {}
         
-        # Generate multiple tokens
-        token1 = manager.generate_token(mock_request)
-        token2 = manager.generate_token(mock_request)
+        nonce, issued, signature = manager.generate_token(mock_request).split(".")
+        
+        assert manager.validate_token(f"{nonce}.{int(issued) + 1}.{signature}", mock_request) is False
+        assert manager.validate_token(f"{nonce}.{issued}.{signature[::-1]}", mock_request) is False
+        assert manager.validate_token(f"{nonce}.{issued}.\u00e9", mock_request) is False
+    
+    def test_concurrent_generate_and_validate(self):
+        """Test tokens issued from many threads all validate."""
+        from concurrent.futures import ThreadPoolExecutor
         
-        # Expire one
-        old_time = manager._tokens[token1][1]
-        manager._tokens[token1] = (manager._tokens[token1][0], old_time - 4000)
+        manager = CSRFTokenManager()
+        mock_request = MagicMock()
         
-        # Force cleanup by setting last_cleanup far back
-        manager._last_cleanup = time.time() - 400
+        def issue_and_check(_):
+            token = manager.generate_token(mock_request)
+            return manager.validate_token(token, mock_request)
         
-        # Generate another token to trigger cleanup
-        token3 = manager.generate_token(mock_request)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(issue_and_check, range(400)))
         
-        # Expired token should be removed
-        assert token1 not in manager._tokens
-        assert token2 in manager._tokens
-        assert token3 in manager._tokens
+        assert all(results)
     
     def test_validate_token_none(self):
         """Test validation with None token."""
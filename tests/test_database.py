@@ -2,7 +2,7 @@
 
 import pytest
 from unittest.mock import patch
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.pool import StaticPool
 from app.database import get_db, engine, SessionLocal, Base
 from app.models import Tracker
@@ -113,3 +113,69 @@ class TestDatabase:
                 except StopIteration:
                     pass
     
+
+    def test_default_pool_fits_postgres_connection_limit(self):
+        """Test the default per-worker pools of a 2-CPU gunicorn deployment stay under 100."""
+        from app.config import Settings
+        
+        defaults = Settings.model_fields
+        pool_capacity = defaults["db_pool_size"].default + defaults["db_max_overflow"].default
+        
+        # gunicorn.conf.py runs 2 x CPU + 1 workers; PostgreSQL allows 100 connections by default
+        workers = 2 * 2 + 1
+        assert workers * pool_capacity < 100
+    
+    def test_sqlite_pragmas_applied_on_connect(self, tmp_path):
+        """Test new SQLite connections get WAL mode and the tuned cache."""
+        from app.database import _set_sqlite_pragmas
+        
+        file_engine = create_engine(f"sqlite:///{tmp_path / 'pragmas.db'}")
+        event.listen(file_engine, "connect", _set_sqlite_pragmas)
+        
+        with file_engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA cache_size")).scalar() == -64000
+        file_engine.dispose()
+
+
+class TestQueryPlans:
+    """Test the hot listing queries are served by indexes."""
+    
+    @staticmethod
+    def _plan(db_session, query) -> str:
+        statement = query.statement.compile(
+            db_session.get_bind(), compile_kwargs={"literal_binds": True}
+        )
+        rows = db_session.execute(text(f"EXPLAIN QUERY PLAN {statement}")).fetchall()
+        return " | ".join(row[-1] for row in rows)
+    
+    def test_price_history_page_uses_composite_index(self, db_session):
+        """Test tracker_detail's history page is an index range scan with no sort."""
+        from datetime import datetime
+        from app.models import PriceHistory
+        
+        query = db_session.query(PriceHistory).filter(
+            PriceHistory.tracker_id == 1,
+            PriceHistory.checked_at < datetime(2024, 1, 1),
+        ).order_by(PriceHistory.checked_at.desc(), PriceHistory.id.desc()).limit(101)
+        
+        plan = self._plan(db_session, query)
+        assert "idx_price_history_tracker_checked_desc" in plan
+        assert "TEMP B-TREE" not in plan
+    
+    def test_listings_ordered_by_created_at_use_index(self, db_session):
+        """Test tracker and profile listings avoid a sort step."""
+        from app.models import NotificationProfile
+        
+        tracker_plan = self._plan(
+            db_session, db_session.query(Tracker).order_by(Tracker.created_at.desc()).limit(50)
+        )
+        profile_plan = self._plan(
+            db_session,
+            db_session.query(NotificationProfile).order_by(NotificationProfile.created_at.desc()),
+        )
+        
+        assert "ix_trackers_created_at" in tracker_plan
+        assert "ix_notification_profiles_created_at" in profile_plan
+        assert "TEMP B-TREE" not in tracker_plan + profile_plan
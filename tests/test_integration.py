@@ -12,7 +12,7 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.main import app
-from app.database import Base, get_db
+from app.database import Base, get_db, get_engine
 from app.models import Tracker, NotificationProfile, PriceHistory
 from app.services.tracker_service import TrackerService
 from app.services.profile_service import ProfileService
@@ -66,6 +66,7 @@ def client():
         return None
     
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_engine] = lambda: engine
     app.dependency_overrides[verify_csrf] = bypass_csrf
     
     # TestClient needs to use a host that's in allowed_hosts
@@ -149,6 +150,45 @@ class TestTrackerCreationFlow:
         assert db_tracker is not None
         assert db_tracker.name == "DB Test Tracker"
     
+    @patch("app.services.tracker_service.get_price")
+    def test_create_tracker_fetches_price_in_background(self, mock_get_price, client, db_session):
+        """Test the form post defers the initial price fetch to a background task."""
+        mock_get_price.return_value = (19.99, "USD", "Background Product")
+        
+        form_data = {
+            "url": "https://example.com/background",
+            "alert_method": "email",
+            "contact": "bg@example.com",
+            "csrf_token": "test_token",
+        }
+        response = client.post("/trackers", data=form_data, follow_redirects=False)
+        assert response.status_code == 303
+        
+        # TestClient runs background tasks before returning the response
+        tracker_id = int(response.headers["location"].rsplit("/", 1)[1])
+        db_session.expire_all()
+        tracker = db_session.get(Tracker, tracker_id)
+        assert tracker.last_price == 19.99
+        assert tracker.name == "Background Product"
+        assert tracker.last_refresh_at is not None
+        history = db_session.query(PriceHistory).filter_by(tracker_id=tracker_id).all()
+        assert [h.price for h in history] == [19.99]
+    
+    def test_fetch_initial_price_skips_priced_tracker(self, db_session):
+        """Test the deferred fetch leaves trackers that already have a price."""
+        tracker = Tracker(
+            url="https://example.com/priced",
+            alert_method="email",
+            contact="p@example.com",
+            last_price=5.0,
+        )
+        db_session.add(tracker)
+        db_session.commit()
+        
+        with patch("app.services.tracker_service.get_price") as mock_get_price:
+            assert TrackerService(db_session).fetch_initial_price(tracker.id) is None
+        mock_get_price.assert_not_called()
+    
     def test_create_tracker_validation_error(self, client):
         """Test tracker creation with invalid data."""
         form_data = {
@@ -333,6 +373,94 @@ class TestSchedulerPolling:
         # Should only poll active trackers (2 calls)
         assert mock_get_price.call_count == 2
     
+    @patch("app.services.scheduler_service.get_price")
+    def test_poll_stamps_refresh_time_for_unchanged_price(self, mock_get_price, db_session):
+        """Test a scrape with an unchanged price still records the refresh time."""
+        tracker = Tracker(
+            url="https://example.com/unchanged",
+            alert_method="email",
+            contact="same@example.com",
+            is_active=True,
+            last_price=50.00,
+        )
+        db_session.add(tracker)
+        db_session.commit()
+        
+        mock_get_price.return_value = (50.00, "USD", "Unchanged")
+        
+        SchedulerService(db_session).poll_all_trackers()
+        
+        db_session.expire_all()
+        assert db_session.get(Tracker, tracker.id).last_refresh_at is not None
+    
+    @patch("app.services.scheduler_service.notification_service.send_price_alerts")
+    @patch("app.services.scheduler_service.get_price")
+    def test_poll_batches_alerts(self, mock_get_price, mock_send_alerts, db_session):
+        """Test price alerts from one sweep are sent together."""
+        trackers = [
+            Tracker(
+                url=f"https://example.com/batch{i}",
+                alert_method="email",
+                contact=f"batch{i}@example.com",
+                is_active=True,
+                last_price=50.00,
+            )
+            for i in range(3)
+        ]
+        db_session.add_all(trackers)
+        db_session.commit()
+        
+        mock_get_price.return_value = (45.00, "USD", "Batched")
+        
+        SchedulerService(db_session).poll_all_trackers()
+        
+        mock_send_alerts.assert_called_once()
+        assert len(mock_send_alerts.call_args[0][0]) == 3
+    
+    @patch("app.services.scheduler_service.get_price")
+    def test_poll_sends_alerts_without_reloading_trackers(
+        self, mock_get_price, db_session, sample_profile
+    ):
+        """Test alerts read the committed trackers and profiles without new queries."""
+        from sqlalchemy import event
+        
+        db_session.add_all([
+            Tracker(
+                url=f"https://example.com/reload{i}",
+                alert_method="email",
+                contact=f"reload{i}@example.com",
+                is_active=True,
+                last_price=50.00,
+                profile_id=sample_profile.id,
+            )
+            for i in range(3)
+        ])
+        db_session.commit()
+        mock_get_price.return_value = (45.00, "USD", "Reloaded")
+        statements, fields = [], []
+        
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        def send(alerts):
+            engine = db_session.get_bind()
+            event.listen(engine, "before_cursor_execute", record)
+            try:
+                for tracker, _, _ in alerts:
+                    fields.append((tracker.contact, tracker.alert_method, tracker.profile.smtp_host))
+            finally:
+                event.remove(engine, "before_cursor_execute", record)
+        
+        with patch(
+            "app.services.scheduler_service.notification_service.send_price_alerts",
+            side_effect=send,
+        ) as mock_send:
+            SchedulerService(db_session).poll_all_trackers()
+        
+        mock_send.assert_called_once()
+        assert len(fields) == 3
+        assert statements == []
+    
     @patch("app.services.scheduler_service.get_price")
     def test_poll_continues_on_error(self, mock_get_price, db_session):
         """Test polling continues even if one tracker fails."""
@@ -363,6 +491,116 @@ class TestSchedulerPolling:
         
         # Both should have been attempted
         assert mock_get_price.call_count == 2
+    
+    @patch("app.services.scheduler_service.get_price")
+    def test_poll_skips_tracker_that_fails_to_record(self, mock_get_price, db_session):
+        """Test one tracker failing to record does not discard the rest of the sweep."""
+        bad = Tracker(
+            url="https://example.com/bad",
+            alert_method="email",
+            contact="bad@example.com",
+            is_active=True,
+        )
+        good = Tracker(
+            url="https://example.com/good",
+            alert_method="email",
+            contact="good@example.com",
+            is_active=True,
+        )
+        db_session.add_all([bad, good])
+        db_session.commit()
+        bad_id, good_id = bad.id, good.id
+        
+        mock_get_price.side_effect = [(10.00, "USD", "Bad"), (20.00, "USD", "Good")]
+        service = SchedulerService(db_session)
+        original = service._record_price
+        
+        def record(tracker, *args, **kwargs):
+            if tracker.id == bad_id:
+                kwargs["history_rows"].append({"tracker_id": bad_id, "price": 10.00, "delta": None})
+                raise ValueError("bad row")
+            return original(tracker, *args, **kwargs)
+        
+        with patch.object(service, "_record_price", side_effect=record):
+            service.poll_all_trackers()
+        
+        db_session.expire_all()
+        assert db_session.get(Tracker, good_id).last_price == 20.00
+        assert db_session.get(Tracker, bad_id).last_price is None
+        assert db_session.query(PriceHistory).filter_by(tracker_id=bad_id).count() == 0
+        assert db_session.query(PriceHistory).filter_by(tracker_id=good_id).count() == 1
+    
+    @patch("app.services.scheduler_service.get_price")
+    def test_poll_scrapes_concurrently(self, mock_get_price, db_session):
+        """Test pages are fetched in parallel off the scheduler thread."""
+        import threading
+        
+        db_session.add_all([
+            Tracker(
+                url=f"https://example.com/parallel{i}",
+                alert_method="email",
+                contact=f"parallel{i}@example.com",
+                is_active=True,
+            )
+            for i in range(3)
+        ])
+        db_session.commit()
+        
+        # Each scrape waits for the others; a serial sweep would time out here
+        barrier = threading.Barrier(3, timeout=5)
+        threads = set()
+        
+        def fake_get_price(url, selector=None):
+            threads.add(threading.get_ident())
+            barrier.wait()
+            return 10.0, "USD", "Parallel"
+        
+        mock_get_price.side_effect = fake_get_price
+        
+        with patch.object(db_session, "commit", wraps=db_session.commit) as mock_commit:
+            SchedulerService(db_session).poll_all_trackers()
+        
+        assert len(threads) == 3
+        assert threading.get_ident() not in threads
+        mock_commit.assert_called_once()
+        assert db_session.query(PriceHistory).count() == 3
+    
+    @patch("app.services.scheduler_service.notification_service.send_price_alerts")
+    @patch("app.services.scheduler_service.get_price")
+    def test_poll_inserts_history_in_one_batch(self, mock_get_price, mock_send_alerts, db_session):
+        """Test a sweep writes all history rows with a single executemany."""
+        from sqlalchemy import event
+        
+        db_session.add_all([
+            Tracker(
+                url=f"https://example.com/bulk{i}",
+                alert_method="email",
+                contact=f"bulk{i}@example.com",
+                is_active=True,
+                last_price=20.0,
+            )
+            for i in range(3)
+        ])
+        db_session.commit()
+        mock_get_price.return_value = (15.0, "USD", "Bulk")
+        
+        inserts = []
+        
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("INSERT INTO price_history"):
+                inserts.append(executemany)
+        
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            SchedulerService(db_session).poll_all_trackers()
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        
+        assert inserts == [True]
+        rows = db_session.query(PriceHistory).all()
+        assert len(rows) == 3
+        assert all(row.delta == -5.0 and row.checked_at is not None for row in rows)
 
 
 # =============================================================================
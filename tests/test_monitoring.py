@@ -265,6 +265,56 @@ class TestComprehensiveHealthCheck:
         assert result["overall_status"] == "unhealthy"
 
 
+class TestCachedHealthCheck:
+    """Tests for cached_health_check() method."""
+    
+    @patch.object(HealthChecker, "comprehensive_health_check")
+    def test_result_reused_within_ttl(self, mock_check):
+        """Test probes within the TTL share one round of checks."""
+        mock_check.return_value = {"overall_status": "healthy"}
+        checker = HealthChecker()
+        
+        first, second = checker.cached_health_check(), checker.cached_health_check()
+        
+        assert first == second
+        mock_check.assert_called_once()
+    
+    @patch.object(HealthChecker, "comprehensive_health_check")
+    def test_cached_result_not_shared_between_callers(self, mock_check):
+        """Test a caller modifying its result does not alter the cached one."""
+        mock_check.return_value = {"overall_status": "healthy"}
+        checker = HealthChecker()
+        
+        checker.cached_health_check()["overall_status"] = "unhealthy"
+        
+        assert checker.cached_health_check()["overall_status"] == "healthy"
+    
+    @patch.object(HealthChecker, "comprehensive_health_check")
+    def test_result_refreshed_after_ttl(self, mock_check):
+        """Test an expired result triggers a new check."""
+        from app.monitoring import HEALTH_CHECK_TTL
+        
+        mock_check.return_value = {"overall_status": "healthy"}
+        checker = HealthChecker()
+        
+        with patch("app.monitoring.time.monotonic", return_value=1000.0):
+            checker.cached_health_check()
+        with patch("app.monitoring.time.monotonic", return_value=1000.0 + HEALTH_CHECK_TTL):
+            checker.cached_health_check()
+        
+        assert mock_check.call_count == 2
+    
+    @patch("app.monitoring.psutil")
+    def test_cpu_reading_does_not_block(self, mock_psutil):
+        """Test the CPU reading does not sleep for a sampling interval."""
+        mock_psutil.cpu_percent.return_value = 10.0
+        mock_psutil.disk_usage.return_value = MagicMock(total=1, free=1, used=0)
+        
+        HealthChecker().check_system_resources()
+        
+        mock_psutil.cpu_percent.assert_called_once_with(interval=None)
+
+
 class TestGlobalHealthChecker:
     """Tests for global health_checker instance."""
     
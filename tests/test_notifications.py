@@ -6,7 +6,19 @@ No actual notifications are sent during testing.
 
 import pytest
 from unittest.mock import patch, MagicMock, PropertyMock
-from app.alerts import send_email, send_sms, _smtp_config, _twilio_config
+from app.alerts import (
+    SMTPConfig,
+    TwilioConfig,
+    send_email,
+    send_email_batch,
+    send_sms,
+    _smtp_config,
+    _twilio_config,
+    ssl_context,
+)
+from app.exceptions import NotificationError
+from app.alerts_pool import SMTPPool
+from app import alerts
 from app.services.notification_service import NotificationService, notification_service
 
 
@@ -67,9 +79,8 @@ class TestSmtpConfig:
         """Test SMTP config from environment when no profile."""
         config = _smtp_config(None)
         # Should return environment config
-        assert "smtp_host" in config
-        assert "smtp_port" in config
-        assert "email_from" in config
+        assert isinstance(config, SMTPConfig)
+        assert config is _smtp_config(None)
     
     @patch("app.alerts.encryption_service")
     def test_smtp_config_with_profile(self, mock_encryption, mock_profile):
@@ -78,13 +89,38 @@ class TestSmtpConfig:
         
         config = _smtp_config(mock_profile)
         
-        assert config["email_from"] == "custom@example.com"
-        assert config["smtp_host"] == "smtp.custom.com"
-        assert config["smtp_port"] == 465
-        assert config["smtp_user"] == "custom_user"
-        assert config["smtp_pass"] == "decrypted_password"
+        assert config.email_from == "custom@example.com"
+        assert config.smtp_host == "smtp.custom.com"
+        assert config.smtp_port == 465
+        assert config.smtp_user == "custom_user"
+        assert config.smtp_pass == "decrypted_password"
         mock_encryption.decrypt.assert_called_once_with("encrypted_pass")
     
+    def test_smtp_config_precomputes_header_and_port(self):
+        """Test the From header is formatted and the port coerced once."""
+        config = SMTPConfig(
+            email_from="alerts@example.com",
+            smtp_host="smtp.test.com",
+            smtp_port="2525",
+            smtp_user=None,
+            smtp_pass=None,
+        )
+        
+        assert config.smtp_port == 2525
+        assert config.from_header == "Pricewatch <alerts@example.com>"
+    
+    def test_smtp_config_from_settings(self):
+        """Test the default config can be rebuilt from a settings copy."""
+        from app.config import settings
+        
+        config = SMTPConfig.from_settings(
+            settings.model_copy(update={"smtp_host": "smtp.other.com", "smtp_port": 2525})
+        )
+        
+        assert config.smtp_host == "smtp.other.com"
+        assert config.smtp_port == 2525
+        assert config.email_from == settings.from_email
+    
     @patch("app.alerts.encryption_service")
     def test_smtp_config_decryption_failure(self, mock_encryption, mock_profile):
         """Test SMTP config handles decryption failure gracefully."""
@@ -92,7 +128,7 @@ class TestSmtpConfig:
         
         # Should not raise, returns None for password
         config = _smtp_config(mock_profile)
-        assert config["smtp_pass"] is None or config["smtp_pass"] == mock_profile.smtp_pass
+        assert config.smtp_pass is None or config.smtp_pass == mock_profile.smtp_pass
 
 
 # =============================================================================
@@ -106,9 +142,8 @@ class TestTwilioConfig:
         """Test Twilio config from environment when no profile."""
         config = _twilio_config(None)
         # Should return environment config
-        assert "twilio_account_sid" in config
-        assert "twilio_auth_token" in config
-        assert "twilio_from_number" in config
+        assert isinstance(config, TwilioConfig)
+        assert config is _twilio_config(None)
     
     @patch("app.alerts.encryption_service")
     def test_twilio_config_with_profile(self, mock_encryption, mock_profile):
@@ -117,9 +152,9 @@ class TestTwilioConfig:
         
         config = _twilio_config(mock_profile)
         
-        assert config["twilio_account_sid"] == "AC_custom_sid"
-        assert config["twilio_auth_token"] == "decrypted_token"
-        assert config["twilio_from_number"] == "+15551234567"
+        assert config.twilio_account_sid == "AC_custom_sid"
+        assert config.twilio_auth_token == "decrypted_token"
+        assert config.twilio_from_number == "+15551234567"
         mock_encryption.decrypt.assert_called_once_with("encrypted_token")
     
     @patch("app.alerts.encryption_service")
@@ -129,7 +164,7 @@ class TestTwilioConfig:
         
         # Should not raise
         config = _twilio_config(mock_profile)
-        assert "twilio_account_sid" in config
+        assert config.twilio_account_sid == "AC_custom_sid"
 
 
 # =============================================================================
@@ -144,23 +179,21 @@ class TestSendEmail:
     def test_send_email_success(self, mock_smtp_config, mock_smtp_class):
         """Test successful email sending."""
         # Configure mock SMTP config
-        mock_smtp_config.return_value = {
-            "smtp_host": "smtp.test.com",
-            "smtp_port": 587,
-            "smtp_user": "test_user",
-            "smtp_pass": "test_pass",
-            "email_from": "from@test.com"
-        }
+        mock_smtp_config.return_value = SMTPConfig(
+            smtp_host="smtp.test.com",
+            smtp_port=587,
+            smtp_user="test_user",
+            smtp_pass="test_pass",
+            email_from="from@test.com",
+        )
         
         # Configure mock SMTP
-        mock_smtp = MagicMock()
-        mock_smtp_class.return_value.__enter__ = MagicMock(return_value=mock_smtp)
-        mock_smtp_class.return_value.__exit__ = MagicMock(return_value=False)
+        mock_smtp = mock_smtp_class.return_value
         
         send_email("to@example.com", "Test Subject", "Test Body")
         
         mock_smtp_class.assert_called_once_with("smtp.test.com", 587)
-        mock_smtp.starttls.assert_called_once()
+        mock_smtp.starttls.assert_called_once_with(context=ssl_context)
         mock_smtp.login.assert_called_once_with("test_user", "test_pass")
         mock_smtp.send_message.assert_called_once()
     
@@ -182,13 +215,13 @@ class TestSendEmail:
     def test_send_email_raises_on_error(self, mock_smtp_config, mock_smtp_class):
         """Test email raises exception on SMTP error."""
         # Configure mock SMTP config
-        mock_smtp_config.return_value = {
-            "smtp_host": "smtp.test.com",
-            "smtp_port": 587,
-            "smtp_user": "test_user",
-            "smtp_pass": "test_pass",
-            "email_from": "from@test.com"
-        }
+        mock_smtp_config.return_value = SMTPConfig(
+            smtp_host="smtp.test.com",
+            smtp_port=587,
+            smtp_user="test_user",
+            smtp_pass="test_pass",
+            email_from="from@test.com",
+        )
         
         mock_smtp_class.side_effect = Exception("SMTP connection failed")
         
@@ -196,6 +229,71 @@ class TestSendEmail:
             send_email("to@example.com", "Test Subject", "Test Body")
     
     @patch("app.alerts.smtplib.SMTP")
+    @patch("app.alerts._smtp_config")
+    def test_send_email_reuses_connection(self, mock_smtp_config, mock_smtp_class):
+        """Test consecutive emails share one authenticated SMTP connection."""
+        mock_smtp_config.return_value = SMTPConfig(
+            smtp_host="smtp.test.com",
+            smtp_port=587,
+            smtp_user="test_user",
+            smtp_pass="test_pass",
+            email_from="from@test.com",
+        )
+        mock_smtp = mock_smtp_class.return_value
+        mock_smtp.noop.return_value = (250, b"OK")
+        
+        send_email("a@example.com", "Subject", "Body")
+        send_email("b@example.com", "Subject", "Body")
+        
+        mock_smtp_class.assert_called_once_with("smtp.test.com", 587)
+        mock_smtp.login.assert_called_once()
+        assert mock_smtp.send_message.call_count == 2
+    
+    @patch("app.alerts.smtplib.SMTP")
+    @patch("app.alerts._smtp_config")
+    def test_send_email_pools_per_password(self, mock_smtp_config, mock_smtp_class):
+        """Test configs differing only by password get their own pools and keep them."""
+        first_server, second_server = MagicMock(), MagicMock()
+        for server in (first_server, second_server):
+            server.noop.return_value = (250, b"OK")
+        mock_smtp_class.side_effect = [first_server, second_server]
+        config = dict(
+            smtp_host="smtp.test.com",
+            smtp_port=587,
+            smtp_user="test_user",
+            email_from="from@test.com",
+        )
+        
+        for password in ("first_pass", "second_pass", "first_pass"):
+            mock_smtp_config.return_value = SMTPConfig(smtp_pass=password, **config)
+            send_email("a@example.com", "Subject", "Body")
+        
+        second_server.login.assert_called_once_with("test_user", "second_pass")
+        assert first_server.send_message.call_count == 2
+        first_server.quit.assert_not_called()
+        assert len(alerts._smtp_pools) == 2
+    
+    @patch("app.alerts.smtplib.SMTP")
+    @patch("app.alerts._smtp_config")
+    def test_send_email_reconnects_dead_connection(self, mock_smtp_config, mock_smtp_class):
+        """Test a cached connection failing its NOOP check is replaced."""
+        mock_smtp_config.return_value = SMTPConfig(
+            smtp_host="smtp.test.com",
+            smtp_port=587,
+            smtp_user=None,
+            smtp_pass=None,
+            email_from="from@test.com",
+        )
+        mock_smtp = mock_smtp_class.return_value
+        mock_smtp.noop.side_effect = Exception("Connection unexpectedly closed")
+        
+        send_email("a@example.com", "Subject", "Body")
+        send_email("b@example.com", "Subject", "Body")
+        
+        assert mock_smtp_class.call_count == 2
+        mock_smtp.quit.assert_called_once()
+    
+    @patch("app.alerts.smtplib.SMTP_SSL")
     @patch("app.alerts.encryption_service")
     @patch("app.alerts.settings")
     def test_send_email_with_profile(self, mock_settings, mock_encryption, mock_smtp_class, mock_profile):
@@ -204,14 +302,106 @@ class TestSendEmail:
         mock_settings.smtp_host = None  # No default
         mock_encryption.decrypt.return_value = "decrypted_pass"
         
-        mock_smtp = MagicMock()
-        mock_smtp_class.return_value.__enter__ = MagicMock(return_value=mock_smtp)
-        mock_smtp_class.return_value.__exit__ = MagicMock(return_value=False)
+        mock_smtp = mock_smtp_class.return_value
         
         send_email("to@example.com", "Test Subject", "Test Body", profile=mock_profile)
         
-        # Should use profile's SMTP settings
-        mock_smtp_class.assert_called_once_with("smtp.custom.com", 465)
+        # Should use profile's SMTP settings, with implicit TLS on port 465
+        mock_smtp_class.assert_called_once_with("smtp.custom.com", 465, context=ssl_context)
+        mock_smtp_class.return_value.starttls.assert_not_called()
+
+
+class TestSendEmailBatch:
+    """Tests for send_email_batch() function."""
+    
+    SMTP_CONFIG = SMTPConfig(
+        smtp_host="smtp.test.com",
+        smtp_port=587,
+        smtp_user=None,
+        smtp_pass=None,
+        email_from="from@test.com",
+    )
+    
+    @patch("app.alerts.smtplib.SMTP")
+    @patch("app.alerts._smtp_config")
+    def test_batch_shares_connection(self, mock_smtp_config, mock_smtp_class):
+        """Test a batch is sent over a single connection."""
+        mock_smtp_config.return_value = self.SMTP_CONFIG
+        mock_smtp_class.return_value.noop.return_value = (250, b"OK")
+        messages = [(f"user{i}@example.com", "Subject", "Body") for i in range(5)]
+        
+        sent = send_email_batch(messages)
+        
+        assert sent == 5
+        mock_smtp_class.assert_called_once()
+        assert mock_smtp_class.return_value.send_message.call_count == 5
+    
+    @patch("app.alerts.smtplib.SMTP")
+    @patch("app.alerts._smtp_config")
+    def test_batch_aborts_on_mass_failure(self, mock_smtp_config, mock_smtp_class):
+        """Test a batch stops once failures reach max(10, n/3)."""
+        mock_smtp_config.return_value = self.SMTP_CONFIG
+        mock_smtp_class.side_effect = OSError("Connection timed out")
+        messages = [(f"user{i}@example.com", "Subject", "Body") for i in range(60)]
+        
+        with pytest.raises(NotificationError) as exc_info:
+            send_email_batch(messages)
+        
+        assert mock_smtp_class.call_count == 20
+        assert exc_info.value.details["failed"] == 20
+
+
+class TestSMTPPool:
+    """Tests for the SMTP connection pool."""
+    
+    def test_borrow_reuses_released_connection(self):
+        """Test a released connection is handed out again."""
+        server = MagicMock()
+        server.noop.return_value = (250, b"OK")
+        connect = MagicMock(return_value=server)
+        pool = SMTPPool(connect, size=2, max_messages=10)
+        
+        with pool.borrow() as first:
+            pass
+        with pool.borrow() as second:
+            pass
+        
+        assert first is second
+        connect.assert_called_once()
+    
+    def test_connection_recycled_after_max_messages(self):
+        """Test a connection is closed once it reaches the message cap."""
+        connect = MagicMock(side_effect=[MagicMock(), MagicMock()])
+        pool = SMTPPool(connect, size=2, max_messages=1)
+        
+        with pool.borrow() as first:
+            pass
+        with pool.borrow() as second:
+            pass
+        
+        assert first is not second
+        first.quit.assert_called_once()
+    
+    def test_release_after_close_closes_connection(self):
+        """Test a connection borrowed across close() is not re-queued."""
+        server = MagicMock()
+        pool = SMTPPool(MagicMock(return_value=server), size=1, max_messages=10)
+        
+        with pool.borrow():
+            pool.close()
+        
+        server.quit.assert_called_once()
+    
+    def test_failed_connection_is_discarded(self):
+        """Test a connection is not returned to the pool after an error."""
+        server = MagicMock()
+        pool = SMTPPool(MagicMock(return_value=server), size=1, max_messages=10)
+        
+        with pytest.raises(RuntimeError):
+            with pool.borrow():
+                raise RuntimeError("send failed")
+        
+        server.quit.assert_called_once()
 
 
 # =============================================================================
@@ -221,16 +411,16 @@ class TestSendEmail:
 class TestSendSms:
     """Tests for send_sms() function."""
     
-    @patch("app.alerts.Client")
+    @patch("twilio.rest.Client")
     @patch("app.alerts._twilio_config")
     def test_send_sms_success(self, mock_twilio_config, mock_client_class):
         """Test successful SMS sending."""
         # Configure mock Twilio config
-        mock_twilio_config.return_value = {
-            "twilio_account_sid": "AC_test_sid",
-            "twilio_auth_token": "test_token",
-            "twilio_from_number": "+15551112222"
-        }
+        mock_twilio_config.return_value = TwilioConfig(
+            twilio_account_sid="AC_test_sid",
+            twilio_auth_token="test_token",
+            twilio_from_number="+15551112222",
+        )
         
         mock_client = MagicMock()
         mock_client_class.return_value = mock_client
@@ -244,6 +434,22 @@ class TestSendSms:
             body="Test SMS Body"
         )
     
+    @patch("twilio.rest.Client")
+    @patch("app.alerts._twilio_config")
+    def test_send_sms_reuses_client(self, mock_twilio_config, mock_client_class):
+        """Test the Twilio client is created once per credential pair."""
+        mock_twilio_config.return_value = TwilioConfig(
+            twilio_account_sid="AC_test_sid",
+            twilio_auth_token="test_token",
+            twilio_from_number="+15551111111",
+        )
+        
+        send_sms("+15559876543", "First")
+        send_sms("+15559876543", "Second")
+        
+        mock_client_class.assert_called_once_with("AC_test_sid", "test_token")
+        assert mock_client_class.return_value.messages.create.call_count == 2
+    
     @patch("app.alerts.settings")
     def test_send_sms_skips_when_not_configured(self, mock_settings):
         """Test SMS is skipped when Twilio not configured."""
@@ -254,23 +460,23 @@ class TestSendSms:
         # Should not raise, just skip
         send_sms("+15559998888", "Test SMS Body")
     
-    @patch("app.alerts.Client")
+    @patch("twilio.rest.Client")
     @patch("app.alerts._twilio_config")
     def test_send_sms_raises_on_error(self, mock_twilio_config, mock_client_class):
         """Test SMS raises exception on Twilio error."""
         # Configure mock Twilio config
-        mock_twilio_config.return_value = {
-            "twilio_account_sid": "AC_test_sid",
-            "twilio_auth_token": "test_token",
-            "twilio_from_number": "+15551112222"
-        }
+        mock_twilio_config.return_value = TwilioConfig(
+            twilio_account_sid="AC_test_sid",
+            twilio_auth_token="test_token",
+            twilio_from_number="+15551112222",
+        )
         
         mock_client_class.side_effect = Exception("Twilio error")
         
         with pytest.raises(Exception):
             send_sms("+15559998888", "Test SMS Body")
     
-    @patch("app.alerts.Client")
+    @patch("twilio.rest.Client")
     @patch("app.alerts.encryption_service")
     @patch("app.alerts.settings")
     def test_send_sms_with_profile(self, mock_settings, mock_encryption, mock_client_class, mock_profile):
@@ -366,7 +572,7 @@ class TestNotificationService:
 class TestCredentialDecryption:
     """Tests for credential decryption in notification flow."""
     
-    @patch("app.alerts.smtplib.SMTP")
+    @patch("app.alerts.smtplib.SMTP_SSL")
     @patch("app.alerts.encryption_service")
     @patch("app.alerts.settings")
     def test_email_uses_decrypted_password(self, mock_settings, mock_encryption, mock_smtp_class, mock_profile):
@@ -375,9 +581,7 @@ class TestCredentialDecryption:
         mock_settings.from_email = "default@test.com"
         mock_encryption.decrypt.return_value = "the_real_password"
         
-        mock_smtp = MagicMock()
-        mock_smtp_class.return_value.__enter__ = MagicMock(return_value=mock_smtp)
-        mock_smtp_class.return_value.__exit__ = MagicMock(return_value=False)
+        mock_smtp = mock_smtp_class.return_value
         
         send_email("to@test.com", "Subject", "Body", profile=mock_profile)
         
@@ -386,7 +590,20 @@ class TestCredentialDecryption:
         # Verify decrypted password was used for login
         mock_smtp.login.assert_called_once_with("custom_user", "the_real_password")
     
-    @patch("app.alerts.Client")
+    @patch("app.alerts.encryption_service")
+    def test_decryption_cached_per_ciphertext(self, mock_encryption, mock_profile):
+        """Test repeated lookups decrypt once until the ciphertext changes."""
+        mock_encryption.decrypt.return_value = "the_real_password"
+        
+        _smtp_config(mock_profile)
+        _smtp_config(mock_profile)
+        assert mock_encryption.decrypt.call_count == 1
+        
+        mock_profile.smtp_pass = "rotated_encrypted_pass"
+        _smtp_config(mock_profile)
+        assert mock_encryption.decrypt.call_count == 2
+    
+    @patch("twilio.rest.Client")
     @patch("app.alerts.encryption_service")
     @patch("app.alerts.settings")
     def test_sms_uses_decrypted_token(self, mock_settings, mock_encryption, mock_client_class, mock_profile):
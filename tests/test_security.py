@@ -175,6 +175,20 @@ class TestRateLimiter:
         # This should be blocked
         assert limiter.is_allowed(identifier, 5, 60) is False
     
+    def test_rate_limiter_window_slides(self):
+        """Test requests older than the window stop counting toward the limit."""
+        from unittest.mock import patch
+        
+        limiter = RateLimiter()
+        with patch("app.security.time.time", return_value=1000.0):
+            assert limiter.is_allowed("user", 2, 60) is True
+        with patch("app.security.time.time", return_value=1030.0):
+            assert limiter.is_allowed("user", 2, 60) is True
+            assert limiter.is_allowed("user", 2, 60) is False
+        with patch("app.security.time.time", return_value=1060.0):
+            assert limiter.is_allowed("user", 2, 60) is True
+            assert list(limiter._requests["user"]) == [1030.0, 1060.0]
+    
     def test_rate_limiter_different_identifiers(self):
         """Test that rate limiter treats different identifiers separately."""
         limiter = RateLimiter()
@@ -480,8 +494,8 @@ class TestCSRFProtection:
         
         assert token is not None
         assert len(token) > 0
-        # Token is stored in manager's internal dictionary, not in session
-        assert token in manager._tokens
+        # Tokens are signed, not stored; the manager accepts its own token
+        assert manager.validate_token(token, mock_request) is True
     
     def test_csrf_token_validation(self):
         """Test CSRF token validation."""
@@ -539,53 +553,23 @@ class TestCSRFProtection:
         # Generate token
         token = manager.generate_token(mock_request)
         
-        # Manually expire it
-        secret, _ = manager._tokens[token]
-        manager._tokens[token] = (secret, time.time() - 4000)  # Expired
-        
-        # Should be invalid
-        is_valid = manager.validate_token(token, mock_request)
-        assert is_valid is False
-        # Token should be removed
-        assert token not in manager._tokens
+        # Should be invalid once the expiry has passed
+        with patch("app.csrf.time.time", return_value=time.time() + 4000):
+            assert manager.validate_token(token, mock_request) is False
+        assert manager.validate_token(token, mock_request) is True
     
-    def test_csrf_token_invalidate(self):
-        """Test token invalidation."""
+    def test_csrf_token_from_future_rejected(self):
+        """Test a token issued beyond the allowed clock skew is rejected."""
         from app.csrf import CSRFTokenManager
-        
-        manager = CSRFTokenManager()
-        mock_request = MagicMock()
-        
-        token = manager.generate_token(mock_request)
-        assert token in manager._tokens
-        
-        manager.invalidate_token(token)
-        assert token not in manager._tokens
-    
-    def test_csrf_cleanup_expired_tokens(self):
-        """Test cleanup of expired tokens."""
-        from app.csrf import CSRFTokenManager, CSRF_TOKEN_EXPIRY
         import time
         
         manager = CSRFTokenManager()
         mock_request = MagicMock()
         
-        # Generate tokens
-        token1 = manager.generate_token(mock_request)
-        token2 = manager.generate_token(mock_request)
-        
-        # Expire one token
-        secret, _ = manager._tokens[token1]
-        manager._tokens[token1] = (secret, time.time() - CSRF_TOKEN_EXPIRY - 1)
-        
-        # Force cleanup
-        manager._last_cleanup = time.time() - manager._cleanup_interval - 1
-        manager._cleanup_expired_tokens()
+        with patch("app.csrf.time.time", return_value=time.time() + 600):
+            token = manager.generate_token(mock_request)
         
-        # Expired token should be removed
-        assert token1 not in manager._tokens
-        # Valid token should remain
-        assert token2 in manager._tokens
+        assert manager.validate_token(token, mock_request) is False
     
     def test_is_csrf_exempt(self):
         """Test CSRF exempt path checking."""
@@ -26,6 +26,59 @@ class TestTrackerService:
             assert tracker.contact == sample_tracker_data["contact"]
             assert tracker.last_price == 99.99
     
+    def test_create_tracker_commits_once_with_history(self, db_session, sample_tracker_data):
+        """Test tracker and initial price history are committed together."""
+        from app.models import PriceHistory
+        
+        tracker_data = TrackerCreate(**sample_tracker_data)
+        service = TrackerService(db_session)
+        
+        with patch('app.services.tracker_service.get_price') as mock_get_price, \
+                patch.object(db_session, 'commit', wraps=db_session.commit) as mock_commit:
+            mock_get_price.return_value = (99.99, "USD", "Test Product")
+            tracker = service.create_tracker(tracker_data)
+        
+        mock_commit.assert_called_once()
+        history = db_session.query(PriceHistory).filter_by(tracker_id=tracker.id).all()
+        assert [h.price for h in history] == [99.99]
+    
+    def test_create_tracker_no_select_after_commit(self, db_session, sample_tracker_data):
+        """Test the new tracker's fields are readable without reloading the row."""
+        from sqlalchemy import event
+        
+        statements = []
+        
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        tracker_data = TrackerCreate(**sample_tracker_data)
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            tracker = TrackerService(db_session).create_tracker(tracker_data, fetch_price=False)
+            assert tracker.id is not None
+            assert tracker.url == sample_tracker_data["url"]
+            assert tracker.is_active is True
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        
+        assert not [s for s in statements if s.startswith("SELECT")]
+        assert db_session.get(type(tracker), tracker.id) is tracker
+    
+    def test_tracker_create_keeps_normalized_url_string(self):
+        """Test the validated URL is stored as its normalized string."""
+        import pydantic
+        
+        tracker_data = TrackerCreate(
+            url="https://Example.com",
+            alert_method="email",
+            contact="test@example.com",
+        )
+        
+        assert tracker_data.url == "https://example.com/"
+        with pytest.raises(pydantic.ValidationError):
+            TrackerCreate(url="ftp://example.com", alert_method="email", contact="test@example.com")
+    
     def test_create_tracker_invalid_url(self, db_session):
         """Test tracker creation with invalid URL."""
         from pydantic import ValidationError as PydanticValidationError
@@ -100,6 +153,22 @@ class TestTrackerService:
         assert updated.alert_method == "sms"
         assert updated.name == "Updated Tracker"
     
+    def test_update_tracker_sets_active_in_same_commit(self, db_session, sample_tracker):
+        """Test the active flag is saved with the other fields in one commit."""
+        service = TrackerService(db_session)
+        
+        updated_data = TrackerCreate(
+            url="https://example.com/updated",
+            alert_method="email",
+            contact="test@example.com",
+        )
+        
+        with patch.object(db_session, 'commit', wraps=db_session.commit) as mock_commit:
+            updated = service.update_tracker(sample_tracker.id, updated_data, is_active=False)
+        
+        mock_commit.assert_called_once()
+        assert updated.is_active is False
+    
     def test_update_tracker_with_profile(self, db_session, sample_tracker, sample_profile):
         """Test updating tracker with profile."""
         service = TrackerService(db_session)
@@ -137,6 +206,43 @@ class TestTrackerService:
         assert updated is not None
         assert updated.profile is None
     
+    def test_set_selector_single_update(self, db_session, sample_tracker):
+        """Test the selector is written by one UPDATE without loading the tracker."""
+        from sqlalchemy import event
+        from app.services.tracker_service import tracker_listing_version
+        
+        statements = []
+        
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        version = tracker_listing_version()
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            assert TrackerService(db_session).set_selector(sample_tracker.id, ".sale") is True
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        
+        assert len(statements) == 1
+        assert statements[0].startswith("UPDATE trackers SET selector=")
+        assert sample_tracker.selector == ".sale"
+        assert tracker_listing_version() == version + 1
+        assert TrackerService(db_session).set_selector(999, ".sale") is False
+    
+    def test_get_detail_stamp(self, db_session, sample_tracker, sample_profile):
+        """Test the detail stamp follows tracker and profile updates."""
+        service = TrackerService(db_session)
+        assert service.get_detail_stamp(999) is None
+        assert service.get_detail_stamp(sample_tracker.id) == (sample_tracker.updated_at, None)
+        
+        sample_tracker.profile_id = sample_profile.id
+        db_session.commit()
+        
+        assert service.get_detail_stamp(sample_tracker.id) == (
+            sample_tracker.updated_at, sample_profile.updated_at
+        )
+    
     def test_update_tracker_not_found(self, db_session):
         """Test updating non-existent tracker."""
         service = TrackerService(db_session)
@@ -201,11 +307,80 @@ class TestTrackerService:
         assert len(trackers2) == 2
         assert total2 == 5
         assert trackers[0].id != trackers2[0].id
+    
+    def test_get_price_history_cursor_keeps_timestamp_ties(self, db_session, sample_tracker):
+        """Test rows sharing a checked_at are not skipped across pages."""
+        from datetime import datetime
+        from app.models import PriceHistory
+        
+        checked_at = datetime(2024, 1, 1)
+        db_session.add_all([
+            PriceHistory(tracker_id=sample_tracker.id, price=10.0 + i, checked_at=checked_at)
+            for i in range(3)
+        ])
+        db_session.commit()
+        
+        service = TrackerService(db_session)
+        first, has_more = service.get_price_history(sample_tracker.id, limit=2)
+        assert has_more is True
+        
+        last = first[-1]
+        rest, has_more = service.get_price_history(
+            sample_tracker.id, before=last.checked_at, before_id=last.id, limit=2
+        )
+        
+        assert has_more is False
+        assert len(first) + len(rest) == 3
+        assert {h.id for h in first}.isdisjoint(h.id for h in rest)
+    
+    def test_get_price_overview_buckets_by_hour(self, db_session, sample_tracker):
+        """Test the overview aggregates price checks into hourly rows."""
+        from datetime import datetime
+        from app.models import PriceHistory
+        
+        db_session.add_all([
+            PriceHistory(tracker_id=sample_tracker.id, price=10.0, checked_at=datetime(2024, 1, 1, 9, 5)),
+            PriceHistory(tracker_id=sample_tracker.id, price=20.0, checked_at=datetime(2024, 1, 1, 9, 55)),
+            PriceHistory(tracker_id=sample_tracker.id, price=30.0, checked_at=datetime(2024, 1, 1, 10, 0)),
+            PriceHistory(tracker_id=sample_tracker.id, price=99.0, checked_at=datetime(2023, 12, 1)),
+        ])
+        db_session.commit()
+        
+        overview = TrackerService(db_session).get_price_overview(
+            sample_tracker.id, since=datetime(2024, 1, 1)
+        )
+        
+        assert overview == [
+            (datetime(2024, 1, 1, 9), 15.0, 10.0, 20.0),
+            (datetime(2024, 1, 1, 10), 30.0, 30.0, 30.0),
+        ]
 
 
 class TestProfileService:
     """Test ProfileService functionality."""
     
+    def test_profile_create_treats_blank_form_values_as_unset(self):
+        """Test raw form values validate without per-field `or None` handling."""
+        profile_data = ProfileCreate.model_validate({
+            "name": "Form Profile",
+            "email_from": "",
+            "smtp_port": 0,
+            "twilio_from_number": "",
+        })
+        tracker_data = TrackerCreate.model_validate({
+            "url": "https://example.com/product",
+            "alert_method": "email",
+            "contact": "test@example.com",
+            "selector": "",
+            "profile_id": 0,
+        })
+        
+        assert profile_data.email_from is None
+        assert profile_data.smtp_port is None
+        assert profile_data.twilio_from_number is None
+        assert tracker_data.selector is None
+        assert tracker_data.profile_id is None
+    
     def test_create_profile_success(self, db_session, sample_profile_data):
         """Test successful profile creation."""
         profile_data = ProfileCreate(**sample_profile_data)
@@ -248,6 +423,31 @@ class TestProfileService:
         profile = service.get_profile(sample_profile.id)
         assert profile is None
     
+    def test_get_profile_options_cached_until_profile_changes(self, db_session, sample_profile, sample_profile_data):
+        """Test dropdown options are served from cache and refreshed on writes."""
+        service = ProfileService(db_session)
+        
+        assert [o.name for o in service.get_profile_options()] == [sample_profile.name]
+        
+        with patch.object(db_session, "query", wraps=db_session.query) as mock_query:
+            service.get_profile_options()
+        mock_query.assert_not_called()
+        
+        service.create_profile(ProfileCreate(**{**sample_profile_data, "name": "Second Profile"}))
+        
+        assert {o.name for o in service.get_profile_options()} == {sample_profile.name, "Second Profile"}
+    
+    def test_get_profile_options_sees_writes_from_other_workers(self, db_session, sample_profile):
+        """Test a rename that skipped this process's invalidation is still picked up."""
+        service = ProfileService(db_session)
+        service.get_profile_options()
+        
+        # Another worker's write: the row changes, this process's cache is not told
+        sample_profile.name = "Renamed Elsewhere"
+        db_session.commit()
+        
+        assert [o.name for o in service.get_profile_options()] == ["Renamed Elsewhere"]
+    
     def test_get_all_profiles(self, db_session, sample_profile):
         """Test getting all profiles."""
         service = ProfileService(db_session)
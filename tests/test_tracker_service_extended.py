@@ -139,6 +139,28 @@ class TestTrackerServiceExtended:
         finally:
             settings.debug = original_debug
     
+    def test_get_tracker_reuses_identity_map(self, db_session, sample_tracker):
+        """Test repeated lookups in one session issue a single SELECT."""
+        from sqlalchemy import event
+        
+        service = TrackerService(db_session)
+        db_session.expunge_all()
+        statements = []
+        
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            first = service.get_tracker(sample_tracker.id)
+            second = service.get_tracker(sample_tracker.id)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        
+        assert first is second
+        assert len(statements) == 1
+    
     def test_get_all_trackers_with_pagination(self, db_session):
         """Test get_all_trackers pagination."""
         service = TrackerService(db_session)
@@ -163,6 +185,31 @@ class TestTrackerServiceExtended:
         assert len(trackers2) == 1
         assert total2 == 5
     
+    def test_get_all_trackers_raises_on_lazy_load_in_debug(self, db_session, sample_profile):
+        """Test debug mode turns accidental lazy loads in listings into errors."""
+        from sqlalchemy.exc import InvalidRequestError
+        
+        db_session.add(Tracker(
+            url="https://example.com/product",
+            alert_method="email",
+            contact="test@example.com",
+            profile_id=sample_profile.id,
+        ))
+        db_session.commit()
+        profile_name = sample_profile.name
+        db_session.expunge_all()
+        
+        service = TrackerService(db_session)
+        with patch.object(settings, "debug", True):
+            trackers, _ = service.get_all_trackers(listing_only=True)
+        
+        tracker = trackers[0]
+        assert tracker.profile.name == profile_name
+        with pytest.raises(InvalidRequestError):
+            tracker.contact
+        with pytest.raises(InvalidRequestError):
+            tracker.profile.trackers
+    
     def test_refresh_tracker_price_with_delta(self, db_session, sample_tracker):
         """Test refresh tracker price calculates delta."""
         sample_tracker.last_price = 100.0
@@ -184,6 +231,28 @@ class TestTrackerServiceExtended:
             
             assert history.delta == -10.0
     
+    def test_refresh_tracker_price_scrapes_outside_transaction(self, db_session, sample_tracker):
+        """Test no transaction is held open across the scrape."""
+        sample_tracker.last_price = 100.0
+        db_session.commit()
+        
+        service = TrackerService(db_session)
+        in_transaction = []
+        
+        def fake_get_price(url, selector=None):
+            in_transaction.append(db_session.in_transaction())
+            return 80.0, "USD", "Product"
+        
+        with patch('app.services.tracker_service.get_price', side_effect=fake_get_price), \
+                patch('app.services.tracker_service.notification_service'), \
+                patch.object(db_session, "commit", wraps=db_session.commit) as mock_commit:
+            service.refresh_tracker_price(sample_tracker.id)
+        
+        assert in_transaction == [False]
+        # One commit ends the read before the scrape, one saves the new price
+        assert mock_commit.call_count == 2
+        assert sample_tracker.last_price == 80.0
+    
     def test_refresh_tracker_price_no_change(self, db_session, sample_tracker):
         """Test refresh when price doesn't change."""
         sample_tracker.last_price = 99.99